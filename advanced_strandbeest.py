@@ -4,28 +4,76 @@ import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from scipy.optimize import least_squares
 import tempfile, os
+import time
 from io import BytesIO
+from kinematics import circle_intersections_vec, branch_sign, crank_motion
+from linkage_graph import LinkageGraph
+from rigidity import check_mechanism
+from collision import collision_check
 
 # Konstanten für den Solver
 FTOL = 1e-7
 XTOL = 1e-7
 GTOL = 1e-7
 MAX_NFEV = 1000
+# Ab dieser Anzahl freier Koordinaten wird die Jacobi-Matrix dünnbesetzt an least_squares übergeben
+SPARSE_THRESHOLD = 200
+
+# Standardgeometrie des Jansen-Beins (feste Punkte Y, Z; Kurbelpunkt X; freie Punkte W, V, T, U, S)
+JANSEN_FIXED_POINTS = {
+    "Y": (-3, 0),
+    "Z": (10.1, 0),
+}
+JANSEN_INIT_POSITIONS = {
+    "X": (15.6, 0.5),
+    "W": (3.3, 9),
+    "V": (-12.4, 5.7),
+    "T": (-8.3, -4.5),
+    "U": (1.1, -10.2),
+    "S": (-2.9, -23.7),
+}
+JANSEN_EDGES = [
+    ("Y", "V"),
+    ("V", "W"),
+    ("W", "X"),
+    ("X", "Z"),
+    ("Y", "W"),
+    ("T", "U"),
+    ("U", "S"),
+    ("S", "T"),
+    ("V", "T"),
+    ("Y", "U"),
+    ("U", "X"),
+]
+# Geschlossene Lösung: jeder freie Punkt ist Schnittpunkt zweier Kreise um bereits bekannte Punkte
+JANSEN_DYADS = [
+    ("W", "X", "Y"),
+    ("U", "X", "Y"),
+    ("V", "Y", "W"),
+    ("T", "V", "U"),
+    ("S", "T", "U"),
+]
 
 class MechanismSimulator:
     
     """
-    Logik eines starren Stabsystems, bei dem zwei Punkte fest (Y, Z) sind, 
-    X sich auf einem Kreis um Z bewegt und die übrigen Punkte (W, V, T, U, S) so angepasst werden,
-    dass alle Kanten (Stäbe) ihre Länge beibehalten.
+    Logik eines starren Stabsystems, bei dem die Punkte in fixed_points fest sind (beim Jansen-Bein Y, Z),
+    X sich auf einem Kreis um Z bewegt und die übrigen Punkte aus init_positions (beim Jansen-Bein
+    W, V, T, U, S) so angepasst werden, dass alle Kanten (Stäbe) ihre Länge beibehalten.
     """
     def __init__(self, fixed_points: dict, init_positions: dict, edges: list):
         self.fixed_points = fixed_points
         self.init_positions = init_positions
         self.edges = edges
-        self.free_labels = ["W", "V", "T", "U", "S"]
+        self.free_labels = [label for label in init_positions if label != "X" and label not in fixed_points]
         self.current_free_positions = {k: v.copy() for k, v in init_positions.items() if k in self.free_labels}
         self.rod_lengths = self._compute_rod_lengths()
+        # Topologie als dünnbesetzte Inzidenzmatrix: Reihenfolge feste Punkte, X, freie Punkte
+        self.graph = LinkageGraph(edges, joints=list(fixed_points) + ["X"] + self.free_labels)
+        self.rest_lengths = np.array([self.rod_lengths[edge] for edge in self.edges])
+        self._fixed_array = np.array([fixed_points[label] for label in fixed_points], dtype=float).reshape(-1, 2)
+        # Ab SPARSE_THRESHOLD freien Koordinaten bleibt die Jacobi-Matrix dünnbesetzt (least_squares mit lsmr)
+        self.use_sparse = 2 * len(self.free_labels) >= SPARSE_THRESHOLD
         # Kreisparameter: X bewegt sich um Z, der Kreisradius wird aus der Anfangsposition von X bestimmt.
         self.X0 = init_positions["X"]
         self.R = np.linalg.norm(np.array(self.X0) - np.array(self.fixed_points["Z"]))
@@ -40,6 +88,11 @@ class MechanismSimulator:
             rod_lengths[(p2, p1)] = length  # symmetrisch
         return rod_lengths
 
+    def precheck(self) -> dict:
+        """Prüft Grübler-Zahl und Rang der Steifigkeitsmatrix in der Ausgangslage (X angetrieben)."""
+        positions = {**self.fixed_points, **self.init_positions}
+        return check_mechanism(self.edges, positions, fixed=list(self.fixed_points), driven=["X"])
+
     def crank_position(self, theta_deg: float) -> np.ndarray:
         theta = math.radians(theta_deg)
         cx = self.fixed_points["Z"][0] + self.R * math.cos(theta)
@@ -56,25 +109,32 @@ class MechanismSimulator:
         return free_positions
 
     def constraint_equations(self, param_vector: np.ndarray, X_current: np.ndarray) -> np.ndarray:
-        free_pos = self.unpack_positions(param_vector)
-        all_pos = {**self.fixed_points, "X": X_current, **free_pos}
-        residuals = []
-        for (p1, p2) in self.edges:
-            target_length = self.rod_lengths[(p1, p2)]
-            current_length = np.linalg.norm(all_pos[p1] - all_pos[p2])
-            residuals.append(current_length - target_length)
-        return np.array(residuals)
+        positions = np.vstack([self._fixed_array, X_current, param_vector.reshape(-1, 2)])
+        return self.graph.residuals(positions, self.rest_lengths)
 
-    def update(self, frame_deg: float) -> dict:
+    def constraint_jacobian(self, param_vector: np.ndarray, X_current: np.ndarray):
+        """Analytische Jacobi-Matrix der Residuen nach den freien Koordinaten aus der Inzidenzmatrix."""
+        positions = np.vstack([self._fixed_array, X_current, param_vector.reshape(-1, 2)])
+        jac = self.graph.jacobian(positions, self.free_labels)
+        return jac if self.use_sparse else jac.toarray()
+
+    def solve_frame(self, frame_deg: float, method="trf", ftol=FTOL, xtol=XTOL, gtol=GTOL, max_nfev=MAX_NFEV):
+        """Löst einen Frame ausgehend von der aktuellen Lage und gibt (X, Lösung von least_squares) zurück."""
         X_current = self.crank_position(frame_deg)
         start_vec = self.pack_positions(self.current_free_positions)
         sol = least_squares(
             fun=self.constraint_equations,
             x0=start_vec,
             args=(X_current,),
-            ftol=FTOL, xtol=XTOL, gtol=GTOL,
-            max_nfev=MAX_NFEV
+            method=method,
+            jac=self.constraint_jacobian,
+            ftol=ftol, xtol=xtol, gtol=gtol,
+            max_nfev=max_nfev
         )
+        return X_current, sol
+
+    def update(self, frame_deg: float) -> dict:
+        X_current, sol = self.solve_frame(frame_deg)
         if not sol.success:
             print(f"Warnung: least_squares hat bei Winkel {frame_deg}° nicht konvergiert.")
         free_solution = self.unpack_positions(sol.x)
@@ -82,7 +142,248 @@ class MechanismSimulator:
         all_points = {**self.fixed_points, "X": X_current, **free_solution}
         return all_points
 
-def animate_strandbeest_full(points, show_path=False):
+    def analyze_cycle(self, angles, **solver_options) -> tuple:
+        """
+        Löst alle Winkel in einem Durchlauf (ausgehend von der Anfangslage) und sammelt je Frame
+        die Residuen aller Stäbe, die Anzahl der Funktionsauswertungen (nfev), die Endkosten,
+        den Status von least_squares sowie die Rechenzeit.
+
+        :param solver_options: method, ftol, xtol, gtol, max_nfev (Standard: Modulkonstanten)
+        :return: (analysis, solutions) mit dem strukturierten Array analysis (ein Eintrag je Winkel)
+                 und den gelösten freien Koordinaten solutions (Winkel, 2 * Anzahl freier Punkte)
+        """
+        angles = np.asarray(angles, dtype=float)
+        dtype = np.dtype([
+            ("theta", float), ("residuals", float, (len(self.edges),)), ("max_residual", float),
+            ("nfev", int), ("cost", float), ("status", int), ("success", bool), ("time", float),
+        ])
+        analysis = np.zeros(len(angles), dtype=dtype)
+        solutions = np.zeros((len(angles), 2 * len(self.free_labels)))
+        self.current_free_positions = {k: np.array(self.init_positions[k], dtype=float) for k in self.free_labels}
+        for i, theta in enumerate(angles):
+            start = time.perf_counter()
+            X_current, sol = self.solve_frame(theta, **solver_options)
+            elapsed = time.perf_counter() - start
+            self.current_free_positions = self.unpack_positions(sol.x)
+            residuals = self.constraint_equations(sol.x, X_current)
+            analysis[i] = (theta, residuals, np.abs(residuals).max(), sol.nfev, sol.cost, sol.status, sol.success, elapsed)
+            solutions[i] = sol.x
+        return analysis, solutions
+
+    def cycle_positions(self, angles, solutions) -> np.ndarray:
+        """Setzt feste Punkte, Kurbelpunkt X und gelöste freie Punkte zu einem Array (Winkel, Gelenke, 2) zusammen."""
+        angles = np.radians(np.asarray(angles, dtype=float))
+        Z = np.asarray(self.fixed_points["Z"], dtype=float)
+        X = Z + self.R * np.stack([np.cos(angles), np.sin(angles)], axis=-1)
+        fixed = np.broadcast_to(self._fixed_array, (len(angles),) + self._fixed_array.shape)
+        free = np.asarray(solutions, dtype=float).reshape(len(angles), -1, 2)
+        return np.concatenate([fixed, X[:, None], free], axis=1)
+
+    def motion_analysis(self, angles, omega=1.0, alpha=0.0, solutions=None) -> dict:
+        """
+        Geschwindigkeiten und Beschleunigungen aller Gelenke über den Zyklus bei Kurbeldrehzahl
+        omega (rad/s) und Kurbelwinkelbeschleunigung alpha. Mit den Lagen aus analyze_cycle werden
+        die abgeleiteten Stabbedingungen (Jacobi-Matrix der Inzidenzmatrix) für alle Winkel
+        gebündelt gelöst, ohne Differenzenquotienten.
+
+        :return: Dictionary mit theta, joints und den Arrays positions, velocities, accelerations (Winkel, Gelenke, 2)
+        """
+        angles = np.asarray(angles, dtype=float)
+        if solutions is None:
+            _, solutions = self.analyze_cycle(angles)
+        positions = self.cycle_positions(angles, solutions)
+        x_index = self.graph.index["X"]
+        v_X, a_X = crank_motion(self.fixed_points["Z"], positions[:, x_index], omega, alpha)
+        prescribed_v = np.zeros_like(positions)
+        prescribed_a = np.zeros_like(positions)
+        prescribed_v[:, x_index] = v_X
+        prescribed_a[:, x_index] = a_X
+        velocities = self.graph.solve_velocities(positions, prescribed_v, self.free_labels)
+        accelerations = self.graph.solve_accelerations(positions, velocities, prescribed_a, self.free_labels)
+        return {
+            "theta": angles,
+            "joints": list(self.graph.joints),
+            "positions": positions,
+            "velocities": velocities,
+            "accelerations": accelerations,
+        }
+
+    def collision_check(self, angles, clearance=0.0, solutions=None) -> dict:
+        """Prüft alle Stabpaare über die Winkel auf Schnitte und Mindestabstand (siehe collision.collision_check)."""
+        angles = np.asarray(angles, dtype=float)
+        if solutions is None:
+            _, solutions = self.analyze_cycle(angles)
+        positions = self.cycle_positions(angles, solutions)
+        return collision_check(positions, self.edges, self.graph.joints, angles, clearance)
+
+
+def edge_key(edge) -> str:
+    return "".join(edge)
+
+
+def jansen_link_lengths(design=None) -> dict:
+    """
+    Stablängen des Jansen-Beins als Dictionary {"YV": ..., "VW": ..., ...}.
+    Zusätzlich enthält es den Abstand der festen Punkte "YZ".
+    """
+    if design is None:
+        design = {**JANSEN_FIXED_POINTS, **JANSEN_INIT_POSITIONS}
+    pos = {label: np.array(p, dtype=float) for label, p in design.items()}
+    lengths = {edge_key(e): float(np.linalg.norm(pos[e[0]] - pos[e[1]])) for e in JANSEN_EDGES}
+    lengths["YZ"] = float(np.linalg.norm(pos["Z"] - pos["Y"]))
+    return lengths
+
+
+def dyad_length(lengths: dict, a: str, b: str):
+    return lengths[a + b] if a + b in lengths else lengths[b + a]
+
+
+def jansen_branches(design=None) -> dict:
+    """Bestimmt für jede Dyade, auf welcher Seite der freie Punkt in der Ausgangslage liegt."""
+    if design is None:
+        design = {**JANSEN_FIXED_POINTS, **JANSEN_INIT_POSITIONS}
+    return {p: float(branch_sign(design[c1], design[c2], design[p])) for p, c1, c2 in JANSEN_DYADS}
+
+
+JANSEN_BRANCHES = jansen_branches()
+
+
+def solve_jansen_closed_form(lengths: dict, theta_deg, branches=None, fixed_points=None):
+    """
+    Berechnet alle Gelenkpositionen des Jansen-Beins geschlossen (ohne least_squares)
+    für ein ganzes Array von Kurbelwinkeln.
+
+    Die Längen dürfen Arrays sein, die gegen theta_deg broadcastbar sind
+    (z. B. Form (Designs, 1) gegen (Winkel,)), so werden viele Designs auf einmal gelöst.
+    Der Punkt Y ist fest, Z liegt auf der Verbindung Y -> Z der Standardgeometrie im Abstand "YZ".
+
+    :return: (positions, valid) mit positions[label] der Form (..., 2) und der Maske valid (...)
+    """
+    if branches is None:
+        branches = JANSEN_BRANCHES
+    if fixed_points is None:
+        fixed_points = JANSEN_FIXED_POINTS
+    theta = np.radians(np.asarray(theta_deg, dtype=float))
+    Y = np.asarray(fixed_points["Y"], dtype=float)
+    Z_dir = np.asarray(fixed_points["Z"], dtype=float) - Y
+    Z_dir = Z_dir / np.linalg.norm(Z_dir)
+    d_yz = np.asarray(lengths["YZ"], dtype=float)
+    R = np.asarray(dyad_length(lengths, "X", "Z"), dtype=float)
+    shape = np.broadcast_shapes(theta.shape, d_yz.shape, R.shape)
+
+    positions = {
+        "Y": np.broadcast_to(Y, shape + (2,)),
+        "Z": Y + d_yz[..., None] * Z_dir,
+    }
+    positions["X"] = positions["Z"] + R[..., None] * np.stack([np.cos(theta), np.sin(theta)], axis=-1)
+    positions["Z"] = np.broadcast_to(positions["Z"], shape + (2,))
+    valid = np.ones(shape, dtype=bool)
+    for p, c1, c2 in JANSEN_DYADS:
+        positions[p], ok = circle_intersections_vec(
+            positions[c1], dyad_length(lengths, p, c1),
+            positions[c2], dyad_length(lengths, p, c2),
+            branches[p]
+        )
+        valid &= ok
+    return positions, valid
+
+
+def jansen_design_from_lengths(lengths: dict, theta0_deg=None, branches=None) -> dict:
+    """
+    Wandelt Stablängen in eine Ausgangsgeometrie (Punkte-Dictionary) um, wie sie
+    animate_strandbeest_full und MechanismSimulator erwarten.
+    """
+    if theta0_deg is None:
+        Z, X = np.array(JANSEN_FIXED_POINTS["Z"]), np.array(JANSEN_INIT_POSITIONS["X"])
+        theta0_deg = math.degrees(math.atan2(X[1] - Z[1], X[0] - Z[0]))
+    positions, valid = solve_jansen_closed_form(lengths, theta0_deg, branches)
+    if not valid:
+        return None
+    return {label: np.array(pos, dtype=float) for label, pos in positions.items()}
+
+
+def default_simulator(design=None) -> MechanismSimulator:
+    """MechanismSimulator mit der Standardgeometrie (oder einer übergebenen Geometrie)."""
+    if design is None:
+        design = {**JANSEN_FIXED_POINTS, **JANSEN_INIT_POSITIONS}
+    fixed_points = {label: np.array(design[label], dtype=float) for label in JANSEN_FIXED_POINTS}
+    init_positions = {label: np.array(design[label], dtype=float) for label in JANSEN_INIT_POSITIONS}
+    return MechanismSimulator(fixed_points, init_positions, list(JANSEN_EDGES))
+
+
+SOLVER_BACKENDS = {
+    "trf": {"method": "trf"},
+    "dogbox": {"method": "dogbox"},
+    "lm": {"method": "lm"},
+}
+
+
+def compare_solver_backends(angles=None, backends=None, design=None) -> list:
+    """
+    Vergleicht least_squares-Varianten über einen Zyklus hinsichtlich Genauigkeit
+    (Stabresiduen und Abstand zur geschlossenen Lösung) und Rechenzeit.
+    Die geschlossene Lösung wird als zusätzliches Verfahren mit aufgeführt.
+    """
+    if angles is None:
+        angles = np.arange(0, 360, 2)
+    if backends is None:
+        backends = SOLVER_BACKENDS
+    simulator = default_simulator(design)
+    lengths = jansen_link_lengths(design)
+
+    start = time.perf_counter()
+    reference, _ = solve_jansen_closed_form(lengths, angles)
+    closed_form_time = time.perf_counter() - start
+    reference_vec = np.concatenate([reference[label] for label in simulator.free_labels], axis=-1)
+
+    closed_form_residual = max(
+        np.abs(np.linalg.norm(reference[a] - reference[b], axis=-1) - simulator.rod_lengths[(a, b)]).max()
+        for a, b in simulator.edges
+    )
+    rows = [{"Verfahren": "geschlossen", "Zeit [s]": closed_form_time, "nfev (Mittel)": 0.0,
+             "max. Residuum": float(closed_form_residual), "max. Lagefehler": 0.0, "nicht konvergiert": 0}]
+    for name, options in backends.items():
+        analysis, solutions = simulator.analyze_cycle(angles, **options)
+        rows.append({
+            "Verfahren": name,
+            "Zeit [s]": float(analysis["time"].sum()),
+            "nfev (Mittel)": float(analysis["nfev"].mean()),
+            "max. Residuum": float(analysis["max_residual"].max()),
+            "max. Lagefehler": float(np.abs(solutions - reference_vec).max()),
+            "nicht konvergiert": int((~analysis["success"]).sum()),
+        })
+    return rows
+
+
+def plot_cycle_analysis(analysis: np.ndarray, edges=None):
+    """Stabresiduen, nfev und Endkosten von least_squares über den Kurbelwinkel."""
+    if edges is None:
+        edges = JANSEN_EDGES
+    fig, (ax_res, ax_nfev, ax_cost) = plt.subplots(3, 1, figsize=(10, 10), sharex=True)
+    theta = analysis["theta"]
+    for i, edge in enumerate(edges):
+        ax_res.plot(theta, analysis["residuals"][:, i], label=edge_key(edge))
+    ax_res.set_ylabel("Längenresiduum")
+    ax_res.legend(ncol=4, fontsize=8)
+    ax_res.grid(True)
+
+    ax_nfev.plot(theta, analysis["nfev"], "k-")
+    failed = ~analysis["success"]
+    ax_nfev.plot(theta[failed], analysis["nfev"][failed], "rx", label="nicht konvergiert")
+    ax_nfev.set_ylabel("nfev")
+    ax_nfev.grid(True)
+    if failed.any():
+        ax_nfev.legend()
+
+    ax_cost.semilogy(theta, np.maximum(analysis["cost"], 1e-30), "b-")
+    ax_cost.set_ylabel("Endkosten")
+    ax_cost.set_xlabel("Theta (Grad)")
+    ax_cost.grid(True)
+    fig.suptitle("Solver-Analyse Advanced-Strandbeest")
+    return fig
+
+
+def animate_strandbeest_full(points, show_path=False, design=None):
     trajectory=[]
     
     """
@@ -92,43 +393,17 @@ def animate_strandbeest_full(points, show_path=False):
     """
     # Definition der Punkte (Standardwerte oder aus points übernommene Werte)
     # Hier ein Beispiel:
-    Y = (-3, 0)
-    Z = (10.1, 0)
-    X0 = (15.6, 0.5)
-    W = (3.3, 9)
-    V = (-12.4, 5.7)
-    T = (-8.3, -4.5)
-    U = (1.1, -10.2)
-    S = (-2.9, -23.7)
-
-    fixed_points = {
-        "Y": np.array(Y, dtype=float),
-        "Z": np.array(Z, dtype=float)
-    }
-    init_positions = {
-        "X": np.array(X0, dtype=float),
-        "W": np.array(W, dtype=float),
-        "V": np.array(V, dtype=float),
-        "T": np.array(T, dtype=float),
-        "U": np.array(U, dtype=float),
-        "S": np.array(S, dtype=float)
-    }
-
-    edges = [
-        ("Y", "V"),
-        ("V", "W"),
-        ("W", "X"),
-        ("X", "Z"),
-        ("Y", "W"),
-        ("T", "U"),
-        ("U", "S"),
-        ("S", "T"),
-        ("V", "T"),
-        ("Y", "U"),
-        ("U", "X"),
-    ]
+    # Falls design gesetzt ist (z. B. aus der Optimierung), wird diese Geometrie verwendet.
+    if design is None:
+        design = {**JANSEN_FIXED_POINTS, **JANSEN_INIT_POSITIONS}
+    fixed_points = {label: np.array(design[label], dtype=float) for label in JANSEN_FIXED_POINTS}
+    init_positions = {label: np.array(design[label], dtype=float) for label in JANSEN_INIT_POSITIONS}
+    edges = list(JANSEN_EDGES)
     
     simulator = MechanismSimulator(fixed_points, init_positions, edges)
+    check = simulator.precheck()
+    if not check["ok"]:
+        raise ValueError("; ".join(check["messages"]))
 
     # Erstelle die Figur und Achsen
     fig, ax = plt.subplots(figsize=(6,6))
@@ -0,0 +1,146 @@
+import numpy as np
+
+CONTACT_TOL = 1e-9
+JOINT_MERGE_DECIMALS = 9
+
+COLLISION_DTYPE = np.dtype([
+    ("bar_a", int), ("bar_b", int), ("min_clearance", float), ("theta_min", float),
+    ("collides", bool), ("first_collision", float),
+])
+
+
+def _cross(u, v):
+    return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+
+def point_segment_distance(p, a, b) -> np.ndarray:
+    """Abstand der Punkte p von den Strecken a-b (alle Arrays (..., 2))."""
+    ab = b - a
+    length2 = (ab**2).sum(axis=-1)
+    t = np.clip(((p - a) * ab).sum(axis=-1) / np.where(length2 > 0, length2, 1.0), 0.0, 1.0)
+    return np.linalg.norm(p - (a + t[..., None] * ab), axis=-1)
+
+
+def segment_distance(p1, p2, q1, q2):
+    """
+    Kleinster Abstand der Strecken p1-p2 und q1-q2 und ob sie sich schneiden, vektorisiert über
+    beliebige Formen (..., 2). Echte Schnitte werden über die Orientierungen der Endpunkte erkannt,
+    sonst liegt der kleinste Abstand immer an einem Endpunkt.
+
+    :return: (Abstand, Schnitt) jeweils mit der Form (...)
+    """
+    d1 = _cross(q2 - q1, p1 - q1)
+    d2 = _cross(q2 - q1, p2 - q1)
+    d3 = _cross(p2 - p1, q1 - p1)
+    d4 = _cross(p2 - p1, q2 - p1)
+    intersects = (d1 * d2 < 0) & (d3 * d4 < 0)
+    distance = np.minimum.reduce([
+        point_segment_distance(p1, q1, q2), point_segment_distance(p2, q1, q2),
+        point_segment_distance(q1, p1, p2), point_segment_distance(q2, p1, p2),
+    ])
+    return np.where(intersects, 0.0, distance), intersects
+
+
+def joint_ids(positions: np.ndarray) -> np.ndarray:
+    """
+    Kennung je Gelenk für Lagen (Frames, Gelenke, 2): Gelenke mit identischer Bahn über den ganzen
+    Zyklus (z. B. gemeinsame Lagerpunkte mehrerer Beine) erhalten dieselbe Kennung.
+    """
+    trajectories = np.round(np.moveaxis(positions, 1, 0).reshape(positions.shape[1], -1), JOINT_MERGE_DECIMALS)
+    _, ids = np.unique(trajectories, axis=0, return_inverse=True)
+    return ids.ravel()
+
+
+def candidate_pairs(segments: np.ndarray, bar_joints: np.ndarray, clearance=0.0, planes=None):
+    """
+    Stabpaare, deren über den Zyklus überstrichene Begrenzungsrechtecke sich (um clearance erweitert)
+    überlappen, per Sweep-and-Prune entlang x. Paare mit gemeinsamem Gelenk berühren sich immer
+    und werden ausgelassen, ebenso Paare aus verschiedenen Ebenen.
+
+    :param segments: (Frames, Stäbe, 2, 2)
+    :param bar_joints: (Stäbe, 2) Gelenkkennungen der Stabenden
+    :param planes: (Stäbe,) Ebene je Stab (Standard: alle Stäbe in einer Ebene)
+    :return: Indizes (a, b) mit a < b
+    """
+    lower = segments.min(axis=(0, 2)) - clearance / 2     # (Stäbe, 2)
+    upper = segments.max(axis=(0, 2)) + clearance / 2
+    order = np.argsort(lower[:, 0], kind="stable")
+    x_min = lower[order, 0]
+    stop = np.searchsorted(x_min, upper[order, 0], side="right")
+    start = np.arange(len(order)) + 1
+    counts = np.maximum(stop - start, 0)
+    i = np.repeat(np.arange(len(order)), counts)
+    j = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(start, counts)
+    a, b = order[i], order[j]
+    overlap_y = (lower[a, 1] <= upper[b, 1]) & (lower[b, 1] <= upper[a, 1])
+    shared = (bar_joints[a, :, None] == bar_joints[b, None, :]).any(axis=(1, 2))
+    keep = overlap_y & ~shared
+    if planes is not None:
+        keep &= planes[a] == planes[b]
+    a, b = a[keep], b[keep]
+    return np.minimum(a, b), np.maximum(a, b)
+
+
+def collision_check(positions: np.ndarray, edges: list, joints: list, theta=None, clearance=0.0,
+                    planes=None) -> dict:
+    """
+    Schnitt- und Abstandsprüfung aller Stabpaare über den ganzen Zyklus.
+
+    Nur die nach candidate_pairs möglichen Paare werden für alle Frames gebündelt ausgewertet,
+    der Aufwand wächst damit mit der Zahl der benachbarten Stäbe statt mit Stäbe² · Frames.
+
+    :param positions: Lagen (Frames, Gelenke, 2) in der Reihenfolge joints
+    :param edges: Stäbe als Paare von Gelenknamen
+    :param theta: Kurbelwinkel je Frame in Grad (Standard: gleichmäßig über 360°)
+    :param clearance: Mindestabstand, ab dem ein Paar als kollidierend gilt (0: nur Berührung/Schnitt)
+    :param planes: Ebene je Stab; nur Stäbe derselben Ebene können sich berühren (Standard: eine Ebene)
+    :return: Dictionary mit pairs (strukturiertes Array COLLISION_DTYPE, nach Abstand sortiert),
+             den Stabnamen und der Anzahl geprüfter Paare
+    """
+    positions = np.asarray(positions, dtype=float)
+    n_frames = positions.shape[0]
+    if theta is None:
+        theta = 360.0 * np.arange(n_frames) / n_frames
+    theta = np.asarray(theta, dtype=float)
+    index = {label: i for i, label in enumerate(joints)}
+    start = np.array([index[a] for a, _ in edges])
+    end = np.array([index[b] for _, b in edges])
+    segments = np.stack([positions[:, start], positions[:, end]], axis=-2)   # (Frames, Stäbe, 2, 2)
+    ids = joint_ids(positions)
+    planes = np.zeros(len(edges), dtype=int) if planes is None else np.asarray(planes)
+    a, b = candidate_pairs(segments, np.column_stack([ids[start], ids[end]]), clearance, planes)
+
+    distance, _ = segment_distance(segments[:, a, 0], segments[:, a, 1], segments[:, b, 0], segments[:, b, 1])
+    hit = distance <= max(clearance, CONTACT_TOL)                              # (Frames, Paare)
+    pairs = np.zeros(len(a), dtype=COLLISION_DTYPE)
+    pairs["bar_a"], pairs["bar_b"] = a, b
+    if len(a):
+        pairs["min_clearance"] = distance.min(axis=0)
+        pairs["theta_min"] = theta[distance.argmin(axis=0)]
+        pairs["collides"] = hit.any(axis=0)
+        pairs["first_collision"] = np.where(pairs["collides"], theta[hit.argmax(axis=0)], np.nan)
+    pairs = pairs[np.argsort(pairs["min_clearance"], kind="stable")]
+    _, bars_per_plane = np.unique(planes, return_counts=True)
+    return {
+        "pairs": pairs,
+        "bars": [f"{p}-{q}" for p, q in edges],
+        "num_pairs": int((bars_per_plane * (bars_per_plane - 1) // 2).sum()),
+        "num_candidates": len(a),
+        "clearance": clearance,
+    }
+
+
+def collision_summary(result: dict, max_lines=5) -> list:
+    """Meldungen zu Kollisionen und den kleinsten Abständen für die Anzeige."""
+    pairs, bars = result["pairs"], result["bars"]
+    messages = [f"{result['num_candidates']} von {result['num_pairs']} Stabpaaren nach Begrenzungsrechtecken geprüft."]
+    collisions = pairs[pairs["collides"]]
+    if len(collisions) == 0:
+        messages.append("Keine Kollision über den Zyklus.")
+    for pair in collisions[:max_lines]:
+        messages.append(f"Warnung: Stäbe {bars[pair['bar_a']]} und {bars[pair['bar_b']]} kollidieren "
+                        f"erstmals bei {pair['first_collision']:.1f}°.")
+    for pair in pairs[~pairs["collides"]][:max_lines]:
+        messages.append(f"Abstand {bars[pair['bar_a']]} / {bars[pair['bar_b']]}: mindestens "
+                        f"{pair['min_clearance']:.3f} bei {pair['theta_min']:.1f}°.")
+    return messages
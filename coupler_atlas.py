@@ -0,0 +1,93 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from kinematics import crank_motion_range, crank_sweep, tracer_global
+from crank_rod import solve_crank_rod
+
+NUM_ANGLES = 360
+
+
+def coupler_curves(points, local, num_angles=NUM_ANGLES):
+    """
+    Koppelkurven aller Koppelpunkte local (Punkte, 2) über den zulässigen Kurbelbereich.
+    Die Lagen werden einmal mit solve_crank_rod gelöst, die Kurven entstehen danach durch eine
+    einzige Broadcast-Operation.
+
+    :return: (theta, Kurven (Punkte, Winkel, 2), valid (Winkel,))
+    """
+    theta, branch = crank_sweep(crank_motion_range(points), num_angles)
+    p1, p2, valid = solve_crank_rod(points, theta, branch=branch)
+    curves = np.moveaxis(tracer_global(p1[valid], p2[valid], local), -2, 0)
+    return theta[valid], curves, valid
+
+
+class CouplerCurveAtlas:
+    """
+    Koppelkurven eines Viergelenks für ein ganzes Gitter von Koppelpunkten, die starr mit der
+    Koppel p1-p2 verbunden sind (Form Gitter x Winkel x 2).
+
+    Das Gitter wird in Koppelkoordinaten angegeben (s entlang der Koppel, t senkrecht dazu,
+    in Vielfachen der Koppellänge). Eine Kurve kann über den Gitterindex oder über einen
+    Punkt in der Zeichnung (nächstgelegene Kurve) ausgewählt werden.
+    """
+    def __init__(self, points, grid=(15, 11), s_range=(-0.5, 1.5), t_range=(-1.0, 1.0), num_angles=NUM_ANGLES):
+        self.points = points
+        self.s = np.linspace(*s_range, grid[0])
+        self.t = np.linspace(*t_range, grid[1])
+        s, t = np.meshgrid(self.s, self.t, indexing="ij")
+        self.local = np.column_stack([s.ravel(), t.ravel()])
+        self.tracers = tracer_global(points["p1"], points["p2"], self.local)
+        self.theta, self.curves, self.valid = coupler_curves(points, self.local, num_angles)
+
+    def __len__(self):
+        return len(self.local)
+
+    def index(self, i_s, i_t) -> int:
+        """Laufender Index der Kurve zum Gitterpunkt (i_s, i_t)."""
+        return int(np.ravel_multi_index((i_s, i_t), (len(self.s), len(self.t))))
+
+    def nearest(self, xy) -> int:
+        """Kurve, die einem Punkt der Zeichnung (z. B. Mausposition) am nächsten kommt."""
+        distance = np.linalg.norm(self.curves - np.asarray(xy, dtype=float), axis=-1).min(axis=1)
+        return int(np.argmin(distance))
+
+    def points_with_tracer(self, i) -> dict:
+        """Gelenkpunkte mit dem gewählten Koppelpunkt als "tracer", z. B. für animate_crank_kinematics."""
+        return {**self.points, "tracer": self.tracers[i]}
+
+    def plot(self, selected=None):
+        """
+        Alle Koppelkurven (grau) mit der gewählten Kurve und dem Koppelpunkt in der Ausgangslage.
+        In interaktiven Matplotlib-Fenstern kann eine Kurve zusätzlich angeklickt werden.
+        """
+        p0, p1, p2, p3 = (np.asarray(self.points[k], dtype=float) for k in ("p0", "p1", "p2", "p3"))
+        fig, ax = plt.subplots(figsize=(9, 7))
+        for i, curve in enumerate(self.curves):
+            line, = ax.plot(curve[:, 0], curve[:, 1], color="gray", lw=0.5, alpha=0.4, picker=True, pickradius=4)
+            line.atlas_index = i
+        ax.plot(*self.tracers.T, ".", color="tab:blue", ms=3)
+        ax.plot(*np.array([p0, p1, p2, p3]).T, "k-o", lw=2, ms=5)
+        highlight, = ax.plot([], [], "r-", lw=2)
+        marker, = ax.plot([], [], "r*", ms=14, mec="k")
+        triangle, = ax.plot([], [], "r--", lw=1)
+
+        def select(i):
+            curve, tracer = self.curves[i], self.tracers[i]
+            highlight.set_data(curve[:, 0], curve[:, 1])
+            marker.set_data([tracer[0]], [tracer[1]])
+            triangle.set_data([p1[0], tracer[0], p2[0]], [p1[1], tracer[1], p2[1]])
+            s, t = self.local[i]
+            ax.set_title(f"Koppelkurve Nr. {i} (s = {s:.2f}, t = {t:.2f})")
+            fig.canvas.draw_idle()
+
+        def on_pick(event):
+            if hasattr(event.artist, "atlas_index"):
+                select(event.artist.atlas_index)
+
+        fig.canvas.mpl_connect("pick_event", on_pick)
+        if selected is not None:
+            select(selected)
+        else:
+            ax.set_title(f"{len(self)} Koppelkurven")
+        ax.set_aspect("equal", adjustable="datalim")
+        ax.grid(True)
+        return fig
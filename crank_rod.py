@@ -5,44 +5,44 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation, PillowWriter
 import streamlit as st
+from kinematics import (
+    circle_intersections_vec, branch_sign, crank_motion_range, crank_sweep, describe_motion_range, tracer_local, tracer_global
+)
+from four_bar import LENGTH_ERROR_DTYPE, decimate_minmax, check_loop_closure, transmission_analysis, four_bar_motion, check_four_bar
 
-def compute_crank_rod_length_errors(points, theta_range=np.linspace(0, 360, 180)):
-    
-    p0 = points["p0"]
-    p1_init = points["p1"]
-    p2_init = points["p2"]
-    p3 = points["p3"]
-    
-    L0 = np.linalg.norm(p1_init - p0)  
-    L1 = np.linalg.norm(p2_init - p1_init)  
-    L2 = np.linalg.norm(p2_init - p3)  
-    errors = {"L0": [], "L1": [], "L2": []}
-    theta_values = []
-    last_p2 = p2_init.copy()
-    for theta in theta_range:
-        alpha = np.radians(theta)
-        p1 = np.array([p0[0] + L0 * np.cos(alpha), p0[1] + L0 * np.sin(alpha)])
-        
-        p2 = circle_intersections(p1, L1, p3, L2, last_p2)
-        if p2 is None:
-            continue  
-        last_p2 = p2
-        
-        curr_L0 = np.linalg.norm(p1 - p0)
-        curr_L1 = np.linalg.norm(p2 - p1)
-        curr_L2 = np.linalg.norm(p2 - p3)
-        
-        errors["L0"].append(curr_L0 - L0)
-        errors["L1"].append(curr_L1 - L1)
-        errors["L2"].append(curr_L2 - L2)
-        theta_values.append(theta)
-    return theta_values, errors
-def plot_crank_rod_length_errors(points):
-    
-    theta_values, errors = compute_crank_rod_length_errors(points)
+def compute_crank_rod_length_errors(points, theta_range=None, num_angles=180):
+    """
+    Längenfehler aller vier Glieder (inkl. Gestell L3) über den Kurbelwinkel.
+
+    Alle Winkel werden auf einmal mit solve_crank_rod gelöst, daher sind auch sehr
+    feine Auflösungen (1e6 Winkel und mehr) möglich. Winkel ohne gültige Lage werden verworfen.
+
+    :return: strukturiertes Array mit den Feldern theta, L0, L1, L2, L3
+    """
+    if theta_range is None:
+        theta_range = np.linspace(0, 360, num_angles)
+    theta = np.asarray(theta_range, dtype=float)
+    nominal = crank_rod_lengths(points)
+    p0, p3 = np.asarray(points["p0"], dtype=float), np.asarray(points["p3"], dtype=float)
+    p1, p2, valid = solve_crank_rod(points, theta)
+    p1, p2 = p1[valid], p2[valid]
+
+    errors = np.empty(p1.shape[0], dtype=LENGTH_ERROR_DTYPE)
+    errors["theta"] = theta[valid]
+    errors["L0"] = np.hypot(*(p1 - p0).T) - nominal["L0"]
+    errors["L1"] = np.hypot(*(p2 - p1).T) - nominal["L1"]
+    errors["L2"] = np.hypot(*(p2 - p3).T) - nominal["L2"]
+    errors["L3"] = np.hypot(*(p3 - p0)) - nominal["L3"]
+    return errors
+
+
+def plot_crank_rod_length_errors(points, num_angles=180, errors=None):
+    
+    if errors is None:
+        errors = compute_crank_rod_length_errors(points, num_angles=num_angles)
     fig, ax = plt.subplots(figsize=(10, 6))
-    for link, error_vals in errors.items():
-        ax.plot(theta_values, error_vals, label=f'Fehler {link}')
+    for link in LENGTH_ERROR_DTYPE.names[1:]:
+        ax.plot(*decimate_minmax(errors["theta"], errors[link]), label=f'Fehler {link}')
     ax.set_xlabel("Theta (Grad)")
     ax.set_ylabel("Längenfehler")
     ax.set_title("Längenfehler der Glieder als Funktion von Theta (Kolben-Kurbel-Mechanismus)")
@@ -51,6 +51,63 @@ def plot_crank_rod_length_errors(points):
     return fig
   
 
+def compute_crank_rod_transmission(points, theta_range=None, num_angles=180):
+    """Übertragungswinkel und mechanischer Vorteil über den Kurbelwinkel (siehe four_bar.transmission_analysis)."""
+    if theta_range is None:
+        theta_range = np.linspace(0, 360, num_angles)
+    theta = np.asarray(theta_range, dtype=float)
+    p1, p2, valid = solve_crank_rod(points, theta)
+    return transmission_analysis(points, p1[valid], p2[valid], theta[valid])
+
+
+def compute_crank_rod_motion(points, theta_range=None, num_angles=180, omega=1.0, alpha=0.0):
+    """Geschwindigkeiten und Beschleunigungen über den Kurbelwinkel (siehe four_bar.four_bar_motion)."""
+    if theta_range is None:
+        theta_range = np.linspace(0, 360, num_angles)
+    theta = np.asarray(theta_range, dtype=float)
+    p1, p2, valid = solve_crank_rod(points, theta)
+    return four_bar_motion(points, p1[valid], p2[valid], theta[valid], omega, alpha)
+
+
+def crank_rod_lengths(points) -> dict:
+    """Stablängen L0 (Kurbel), L1 (Koppel), L2 (Schwinge) und L3 (Gestell) aus den Gelenkpunkten."""
+    p0, p1, p2, p3 = points["p0"], points["p1"], points["p2"], points["p3"]
+    return {
+        "L0": np.linalg.norm(p1 - p0),
+        "L1": np.linalg.norm(p2 - p1),
+        "L2": np.linalg.norm(p2 - p3),
+        "L3": np.linalg.norm(p3 - p0),
+    }
+
+
+def solve_crank_rod(points, theta_deg, lengths=None, branch=1.0):
+    """
+    Berechnet p1 und p2 geschlossen für ein ganzes Array von Kurbelwinkeln.
+
+    Der Zweig für p2 wird aus der Ausgangslage bestimmt (auf welcher Seite von p1 -> p3 p2 liegt),
+    das entspricht der stetigen Wahl in circle_intersections. Über lengths können abweichende
+    Stablängen übergeben werden (Arrays, die gegen theta_deg broadcasten), L3 verschiebt p3
+    entlang der Verbindung p0 -> p3. branch = -1 wählt den anderen Zweig (z. B. nach einer Totlage).
+
+    :return: (p1, p2, valid) mit p1, p2 der Form (..., 2) und der Maske valid (...)
+    """
+    nominal = crank_rod_lengths(points)
+    if lengths is None:
+        lengths = nominal
+    lengths = {**nominal, **lengths}
+    p0 = np.asarray(points["p0"], dtype=float)
+    ground_dir = (points["p3"] - p0) / nominal["L3"]
+    sign = branch_sign(points["p1"], points["p3"], points["p2"]) * np.asarray(branch, dtype=float)
+
+    alpha = np.radians(np.asarray(theta_deg, dtype=float))
+    L0 = np.asarray(lengths["L0"], dtype=float)[..., None]
+    L3 = np.asarray(lengths["L3"], dtype=float)[..., None]
+    p1 = p0 + L0 * np.stack(np.broadcast_arrays(np.cos(alpha), np.sin(alpha)), axis=-1)
+    p3 = p0 + L3 * ground_dir
+    p2, valid = circle_intersections_vec(p1, lengths["L1"], p3, lengths["L2"], sign)
+    return p1, p2, valid
+
+
 def circle_intersections(c1, r1, c2, r2, last_p2=None):
     """Berechnet die Schnittpunkte zweier Kreise und wählt den kontinuierlichsten Punkt."""
     (x1, y1), (x2, y2) = c1, c2
@@ -92,12 +149,18 @@ def validate_mechanism(points):
             st.write(f"Fehler: {key} ist Null. Punkte überlappen oder sind identisch!")
             return False
 
-    # Prüfen, ob die Mechanismus-Bedingungen erfüllt sind (Grashof-Kriterium)
-    lengths_sorted = sorted(distances.values())
-    if lengths_sorted[0] + lengths_sorted[1] > lengths_sorted[2] + lengths_sorted[3]:
-        st.write("Warnung: Grashof-Kriterium nicht erfüllt. Der Mechanismus könnte sich nicht vollständig bewegen.")
+    # Rang der Steifigkeitsmatrix: bei festgehaltener Kurbel muss p2 eindeutig bestimmt sein
+    # (in einer Totlage wird innerhalb des zulässigen Bereichs geprüft)
+    check, motion = check_four_bar(points)
+    for message in check["messages"]:
+        st.write(message)
+    if not check["ok"]:
+        return False
 
-    return True
+    # Grashof-Klasse und zulässiger Kurbelwinkelbereich (geschlossene Lösung)
+    for message in describe_motion_range(motion):
+        st.write(message)
+    return motion["current_interval"] is not None
 
 def animate_crank_kinematics(points, show_path=False, save_filename=None):
     
@@ -109,13 +172,23 @@ def animate_crank_kinematics(points, show_path=False, save_filename=None):
     p2_init = points["p2"]  
     p3 = points["p3"]  
     
-    L0 = np.linalg.norm(p1_init - p0)  
-    L1 = np.linalg.norm(p2_init - p1_init) 
-    L2 = np.linalg.norm(p2_init - p3) 
-    
     NUM_FRAMES = 120
     FPS = 20
     
+    # Nur den zulässigen Kurbelwinkelbereich überstreichen, alle Frames vorab berechnen
+    # und den ganzen Zyklus mit einem Matrixprodukt prüfen
+    theta, branch = crank_sweep(crank_motion_range(points), NUM_FRAMES)
+    p1_frames, p2_frames, valid = solve_crank_rod(points, theta, branch=branch)
+    if not valid.all():
+        st.write("Simulation gestoppt: Keine gültige Position für P2 gefunden.")
+    closure = check_loop_closure(points, p1_frames[valid], p2_frames[valid])
+    if not closure["ok"]:
+        st.warning(f"Warnung: Schleifenschluss verletzt (max. Längenabweichung {closure['max_violation']:.2e}).")
+    # Optionaler Koppelpunkt, starr mit der Koppel p1-p2 verbunden
+    tracer_frames = None
+    if "tracer" in points:
+        tracer_frames = tracer_global(p1_frames, p2_frames, tracer_local(points, points["tracer"])[None])[:, 0]
+    
     fig, ax = plt.subplots()
     ax.set_aspect("equal", adjustable="box")
     ax.set_xlim(-80, 120)
@@ -133,30 +206,26 @@ def animate_crank_kinematics(points, show_path=False, save_filename=None):
     if show_path:
         p1_path, = ax.plot([], [], "b--", lw=1)
         p2_path, = ax.plot([], [], "g--", lw=1)
+    coupler_artists = []
+    if tracer_frames is not None:
+        ln_tracer, = ax.plot([], [], "m*", ms=10)
+        coupler_plate, = ax.plot([], [], "m-", lw=1.5)
+        tracer_path, = ax.plot(tracer_frames[valid, 0], tracer_frames[valid, 1], "m:", lw=1)
+        coupler_artists = [ln_tracer, coupler_plate, tracer_path]
     
     trajectory, trajectory_p1 = [], []
-    last_p2 = p2_init.copy()
     
     def init():
-        artists = [ln_p0, ln_p1, ln_p2, ln_p3, bar_01, bar_12, bar_23]
+        artists = [ln_p0, ln_p1, ln_p2, ln_p3, bar_01, bar_12, bar_23] + coupler_artists
         if show_path:
             artists += [p1_path, p2_path]
         return artists
     
     def update(frame):
-        nonlocal last_p2
-        alpha = 2 * np.pi * frame / NUM_FRAMES
-        
-        px1 = p0[0] + L0 * np.cos(alpha)
-        py1 = p0[1] + L0 * np.sin(alpha)
-        p1 = np.array([px1, py1])
-        
-        p2 = circle_intersections(p1, L1, p3, L2, last_p2)
-        if p2 is None:
-            st.write("Simulation gestoppt: Keine gültige Position für P2 gefunden.")
+        if not valid[frame]:
             return []  # Keine Animation ausführen, falls das Modell fehlschlägt
-        
-        last_p2 = p2
+        p1 = p1_frames[frame]
+        p2 = p2_frames[frame]
         
         if show_path:
             trajectory.append(p1.tolist())
@@ -171,8 +240,12 @@ def animate_crank_kinematics(points, show_path=False, save_filename=None):
         bar_01.set_data([p0[0], p1[0]], [p0[1], p1[1]])
         bar_12.set_data([p1[0], p2[0]], [p1[1], p2[1]])
         bar_23.set_data([p2[0], p3[0]], [p2[1], p3[1]])
+        if tracer_frames is not None:
+            tracer = tracer_frames[frame]
+            ln_tracer.set_data([tracer[0]], [tracer[1]])
+            coupler_plate.set_data([p1[0], tracer[0], p2[0]], [p1[1], tracer[1], p2[1]])
         
-        artists = [ln_p0, ln_p1, ln_p2, ln_p3, bar_01, bar_12, bar_23]
+        artists = [ln_p0, ln_p1, ln_p2, ln_p3, bar_01, bar_12, bar_23] + coupler_artists
         if show_path:
             artists += [p1_path, p2_path]
         return artists
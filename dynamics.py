@@ -0,0 +1,239 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+from scipy.integrate import solve_ivp
+import matplotlib.pyplot as plt
+from advanced_strandbeest import default_simulator, MechanismSimulator
+from kinematics import crank_motion
+
+# Einheiten: Längen wie in der Geometrie (cm), Massen in kg, Zeit in s
+DENSITY = 0.01          # Masse je Längeneinheit der Stäbe (kg/cm)
+GRAVITY = (0.0, -981.0)  # cm/s^2
+BAUMGARTE = (10.0, 10.0)  # alpha, beta der Stabilisierung g'' + 2 alpha g' + beta^2 g = 0
+PROJECTION_INTERVAL = 0.05
+PROJECTION_TOL = 1e-10
+
+
+def dc_motor_curve(stall_torque=2e5, no_load_speed=4 * np.pi):
+    """
+    Lineare Drehmoment-Drehzahl-Kennlinie eines Gleichstrommotors:
+    M(w) = M_stall * (1 - w / w_leer). Gibt eine Funktion der Winkelgeschwindigkeit zurück.
+    """
+    def torque(omega):
+        return stall_torque * (1.0 - np.asarray(omega, dtype=float) / no_load_speed)
+    return torque
+
+
+class JansenDynamics:
+    """
+    Dynamische Simulation des Jansen-Beins mit massebehafteten Stäben und Motorkennlinie an der Kurbel.
+
+    Koordinaten sind die Lagen aller beweglichen Gelenke (Kurbelpunkt X und die freien Punkte).
+    Jeder Stab ist ein homogener Stab, dessen Masse konsistent auf die Enden verteilt wird
+    (m/6 * [[2, 1], [1, 2]] je Koordinatenrichtung), dadurch ist die Massenmatrix konstant und
+    dünnbesetzt und wird nur einmal zerlegt. Die Stabbedingungen aus der Inzidenzmatrix werden
+    auf Beschleunigungsebene mit Baumgarte-Stabilisierung gelöst (Indexreduktion); zusätzlich
+    werden Lagen und Geschwindigkeiten in festen Abständen auf die Bindungen projiziert.
+    """
+    def __init__(self, simulator: MechanismSimulator = None, density=DENSITY, gravity=GRAVITY,
+                 motor=None, foot_load=None, damping=0.0, baumgarte=BAUMGARTE):
+        if simulator is None:
+            simulator = default_simulator()
+        self.simulator = simulator
+        self.graph = simulator.graph
+        self.moving = ["X"] + list(simulator.free_labels)
+        self.column, self.n_moving = self.graph.free_columns(self.moving)
+        self.n = 2 * self.n_moving
+        self.rest_lengths = simulator.rest_lengths
+        self.bar_masses = density * self.rest_lengths
+        self.motor = motor if motor is not None else dc_motor_curve()
+        self.damping = damping
+        self.alpha, self.beta = baumgarte
+        self.Z = np.asarray(simulator.fixed_points["Z"], dtype=float)
+        self.x_col = self.column[self.graph.index["X"]]
+        self.s_col = self.column[self.graph.index["S"]]
+
+        self.mass_matrix = self._assemble_mass_matrix()
+        self._mass_lu = splu(self.mass_matrix.tocsc())
+        self.gravity_force = self.mass_matrix @ np.tile(np.asarray(gravity, dtype=float), self.n_moving)
+        if foot_load is not None:
+            self.gravity_force[2 * self.s_col:2 * self.s_col + 2] += foot_load
+        self._fixed = np.asarray(self.graph.positions_array(
+            {**simulator.fixed_points, **simulator.init_positions}), dtype=float)
+
+    def _assemble_mass_matrix(self) -> sp.csr_matrix:
+        """Konsistente Massenmatrix der beweglichen Gelenke, (2*beweglich x 2*beweglich) dünnbesetzt."""
+        w = self.bar_masses / 6.0
+        a, b = self.column[self.graph.start], self.column[self.graph.end]
+        rows, cols, vals = [], [], []
+        for i, j, value in ((a, a, 2 * w), (b, b, 2 * w), (a, b, w), (b, a, w)):
+            keep = (i >= 0) & (j >= 0)
+            rows.append(i[keep])
+            cols.append(j[keep])
+            vals.append(value[keep])
+        joint_mass = sp.coo_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                                   shape=(self.n_moving, self.n_moving))
+        return sp.kron(joint_mass, sp.identity(2), format="csr")
+
+    def positions(self, q) -> np.ndarray:
+        """Koordinatenvektor(en) (n,) bzw. (n, k) -> Gelenklagen (k, Gelenke, 2) einschließlich fester Punkte."""
+        q = np.asarray(q, dtype=float).reshape(self.n, -1).T.reshape(-1, self.n_moving, 2)
+        positions = np.broadcast_to(self._fixed, (len(q),) + self._fixed.shape).copy()
+        mask = self.column >= 0
+        positions[:, mask] = q[:, self.column[mask]]
+        return positions
+
+    def _to_joint(self, v):
+        """Geschwindigkeitsvektor(en) -> Gelenkgeschwindigkeiten (k, Gelenke, 2), feste Punkte ruhen."""
+        v = np.asarray(v, dtype=float).reshape(self.n, -1).T.reshape(-1, self.n_moving, 2)
+        joint = np.zeros((len(v), self.graph.num_joints, 2))
+        mask = self.column >= 0
+        joint[:, mask] = v[:, self.column[mask]]
+        return joint
+
+    def _constraints(self, q):
+        """Bindungen g = (|D|^2 - L^2) / 2, Koeffizientenmatrix G (k, Stäbe, n) und Stabvektoren D."""
+        positions = self.positions(q)
+        D, G, rows, _, _ = self.graph.rate_system(positions, self.moving)
+        g = 0.5 * ((D[:, rows]**2).sum(axis=-1) - self.rest_lengths[rows]**2)
+        return g, G, positions
+
+    def _mass_solve(self, rhs):
+        """Löst M x = rhs für beliebig viele rechte Seiten (n, ...) mit der einmal zerlegten Massenmatrix."""
+        shape = rhs.shape
+        return self._mass_lu.solve(rhs.reshape(self.n, -1)).reshape(shape)
+
+    def crank_angle(self, q):
+        X = np.asarray(q, dtype=float).reshape(self.n, -1)[2 * self.x_col:2 * self.x_col + 2]
+        return np.degrees(np.arctan2(X[1] - self.Z[1], X[0] - self.Z[0]))
+
+    def crank_speed(self, q, v):
+        q = np.asarray(q, dtype=float).reshape(self.n, -1)
+        v = np.asarray(v, dtype=float).reshape(self.n, -1)
+        r = q[2 * self.x_col:2 * self.x_col + 2] - self.Z[:, None]
+        vx = v[2 * self.x_col:2 * self.x_col + 2]
+        return (r[0] * vx[1] - r[1] * vx[0]) / (r**2).sum(axis=0)
+
+    def applied_forces(self, q, v) -> np.ndarray:
+        """Gewicht, Fußlast, Motormoment (als Kraft senkrecht zur Kurbel an X) und Dämpfung, Form (n, k)."""
+        q = np.asarray(q, dtype=float).reshape(self.n, -1)
+        v = np.asarray(v, dtype=float).reshape(self.n, -1)
+        f = np.repeat(self.gravity_force[:, None], q.shape[1], axis=1) - self.damping * v
+        r = q[2 * self.x_col:2 * self.x_col + 2] - self.Z[:, None]
+        torque = self.motor(self.crank_speed(q, v))
+        f[2 * self.x_col] += -torque * r[1] / (r**2).sum(axis=0)
+        f[2 * self.x_col + 1] += torque * r[0] / (r**2).sum(axis=0)
+        return f
+
+    def rhs(self, t, y):
+        """
+        Rechte Seite für solve_ivp, vektorisiert über Spalten von y (n_state, k).
+        Je Spalte wird das Sattelpunktproblem über das Schur-Komplement G M^-1 G^T gelöst.
+        """
+        y = np.asarray(y, dtype=float)
+        single = y.ndim == 1
+        y = y.reshape(2 * self.n, -1)
+        q, v = y[:self.n], y[self.n:]
+        g, G, _ = self._constraints(q)                                    # (k, E), (k, E, n)
+        Gv = np.einsum("ken,nk->ke", G, v)
+        dV = self.graph.bar_vectors(self._to_joint(v))
+        gamma = -(dV**2).sum(axis=-1) - 2 * self.alpha * Gv - self.beta**2 * g
+
+        f = self.applied_forces(q, v)                                      # (n, k)
+        Minv_f = self._mass_solve(f)
+        Minv_Gt = self._mass_solve(np.moveaxis(G, 0, -1).transpose(1, 0, 2).reshape(self.n, -1))
+        Minv_Gt = Minv_Gt.reshape(self.n, G.shape[1], -1).transpose(2, 0, 1)  # (k, n, E)
+        S = G @ Minv_Gt
+        lam = np.linalg.solve(S, (np.einsum("ken,nk->ke", G, Minv_f) - gamma)[..., None])[..., 0]
+        a = Minv_f - np.einsum("kne,ke->nk", Minv_Gt, lam)
+        dy = np.vstack([v, a])
+        return dy[:, 0] if single else dy
+
+    def project(self, y, iterations=5):
+        """
+        Projiziert einen Zustand auf die Bindungen: Lagen mit massengewichteten Gauß-Newton-Schritten
+        auf g = 0 (also auf constraint_equations = 0), danach die Geschwindigkeiten auf G v = 0.
+        """
+        q, v = y[:self.n].copy(), y[self.n:].copy()
+        for _ in range(iterations):
+            g, G, _ = self._constraints(q)
+            if np.abs(g).max() < PROJECTION_TOL:
+                break
+            Minv_Gt = self._mass_solve(G[0].T)
+            q -= Minv_Gt @ np.linalg.solve(G[0] @ Minv_Gt, g[0])
+        _, G, _ = self._constraints(q)
+        Minv_Gt = self._mass_solve(G[0].T)
+        v -= Minv_Gt @ np.linalg.solve(G[0] @ Minv_Gt, G[0] @ v)
+        return np.concatenate([q, v])
+
+    def initial_state(self, omega0=0.0) -> np.ndarray:
+        """Ausgangslage des Simulators mit der Kurbelgeschwindigkeit omega0 (konsistente Geschwindigkeiten)."""
+        positions = self._fixed[None]
+        v_X, _ = crank_motion(self.Z, positions[:, self.graph.index["X"]], omega0)
+        prescribed = np.zeros_like(positions)
+        prescribed[:, self.graph.index["X"]] = v_X
+        velocities = self.graph.solve_velocities(positions, prescribed, self.simulator.free_labels)
+        mask = self.column >= 0
+        order = np.argsort(self.column[mask])
+        q = positions[0, mask][order].ravel()
+        v = velocities[0, mask][order].ravel()
+        return np.concatenate([q, v])
+
+    def simulate(self, t_end=10.0, dt_out=0.01, omega0=0.0, method="RK45", rtol=1e-6, atol=1e-8,
+                 projection_interval=PROJECTION_INTERVAL) -> dict:
+        """
+        Integriert die Bewegungsgleichungen mit solve_ivp abschnittsweise; nach jedem Abschnitt
+        wird der Zustand auf die Bindungen projiziert.
+
+        :return: Dictionary mit t, theta (Grad, fortlaufend ohne Sprung bei 360°), omega, motor_torque, positions (Zeiten, Gelenke, 2)
+                 und der größten Stablängenabweichung je Zeitpunkt
+        """
+        t_out = np.arange(0.0, t_end + 0.5 * dt_out, dt_out)
+        y = self.initial_state(omega0)
+        states = [y]
+        t0 = 0.0
+        nfev = 0
+        while t0 < t_end - 1e-12:
+            t1 = min(t0 + projection_interval, t_end)
+            t_eval = t_out[(t_out > t0 + 1e-12) & (t_out <= t1 + 1e-12)]
+            sol = solve_ivp(self.rhs, (t0, t1), y, method=method, rtol=rtol, atol=atol,
+                            vectorized=True, dense_output=True)
+            if not sol.success:
+                raise RuntimeError(f"Integration bei t = {t0:.3f} s fehlgeschlagen: {sol.message}")
+            nfev += sol.nfev
+            y = self.project(sol.y[:, -1])
+            if len(t_eval):
+                outputs = sol.sol(np.minimum(t_eval, t1)).T
+                if abs(t_eval[-1] - t1) < 1e-12:
+                    outputs[-1] = y
+                states.extend(outputs)
+            t0 = t1
+
+        Y = np.array(states).T
+        q, v = Y[:self.n], Y[self.n:]
+        positions = self.positions(q)
+        omega = self.crank_speed(q, v)
+        return {
+            "t": t_out[:Y.shape[1]],
+            "theta": np.unwrap(self.crank_angle(q), period=360.0),
+            "omega": omega,
+            "motor_torque": self.motor(omega),
+            "positions": positions,
+            "max_length_error": np.abs(self.graph.residuals(positions, self.rest_lengths)).max(axis=-1),
+            "nfev": nfev,
+        }
+
+
+def plot_dynamics(result: dict):
+    """Kurbeldrehzahl, Motormoment und Bindungsfehler über der Zeit."""
+    fig, (ax_w, ax_m, ax_err) = plt.subplots(1, 3, figsize=(15, 4))
+    ax_w.plot(result["t"], result["omega"] * 60 / (2 * np.pi))
+    ax_w.set_ylabel("Kurbeldrehzahl (U/min)")
+    ax_m.plot(result["t"], result["motor_torque"])
+    ax_m.set_ylabel("Motormoment")
+    ax_err.semilogy(result["t"], np.maximum(result["max_length_error"], 1e-16))
+    ax_err.set_ylabel("größte Stablängenabweichung")
+    for ax in (ax_w, ax_m, ax_err):
+        ax.set_xlabel("t (s)")
+        ax.grid(True)
+    return fig
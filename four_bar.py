@@ -5,48 +5,211 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation, PillowWriter
 import streamlit as st
+from kinematics import (
+    circle_intersections_vec, branch_sign, crank_motion_range, crank_sweep, describe_motion_range,
+    crank_motion, dyad_velocity, dyad_acceleration
+)
+from linkage_graph import LinkageGraph
+from rigidity import check_mechanism
+
+LENGTH_ERROR_DTYPE = np.dtype([
+    ("theta", float), ("L0", float), ("L1", float), ("L2", float), ("L3", float)
+])
+MAX_PLOT_POINTS = 2000
+MOTION_DTYPE = np.dtype([
+    ("theta", float),
+    ("v_p1", float, (2,)), ("v_p2", float, (2,)),
+    ("a_p1", float, (2,)), ("a_p2", float, (2,)),
+    ("omega_coupler", float), ("omega_rocker", float),
+    ("alpha_coupler", float), ("alpha_rocker", float),
+])
+TRANSMISSION_DTYPE = np.dtype([
+    ("theta", float), ("transmission_angle", float), ("mechanical_advantage", float)
+])
+
+
+def compute_length_errors(points, theta_range=None, num_angles=180):
+    """
+    Längenfehler der vier Glieder über den Kurbelwinkel (vektorisiert, siehe
+    compute_crank_rod_length_errors). Wie bisher wird für p2 stets der erste
+    Schnittpunkt von circle_intersections verwendet.
 
-def compute_length_errors(points, theta_range=np.linspace(0, 360, 180)):
-
-    p0, p3 = points["p0"], points["p3"]
+    :return: strukturiertes Array mit den Feldern theta, L0, L1, L2, L3
+    """
+    if theta_range is None:
+        theta_range = np.linspace(0, 360, num_angles)
+    theta = np.asarray(theta_range, dtype=float)
+    p0, p3 = np.asarray(points["p0"], dtype=float), np.asarray(points["p3"], dtype=float)
     L0 = np.linalg.norm(points["p1"] - p0)   # p0->p1 
     L1 = np.linalg.norm(points["p2"] - points["p1"])  # p1->p2 
     L2 = np.linalg.norm(points["p2"] - p3)   # p2->p3 
     L3 = np.linalg.norm(p3 - p0)        # p3->p0 
-    errors = {"L0": [], "L1": [], "L2": [], "L3": []}
-    theta_values = []
-    for theta in theta_range:
-        alpha = np.radians(theta)
-        p1 = np.array([p0[0] + L0 * np.cos(alpha), p0[1] + L0 * np.sin(alpha)])
-        # Berechne p2 durch Kreis-Schnittpunkte:
-        hits = circle_intersections(p1, L1, p3, L2)
-        if not hits:
-            continue  
-        p2 = np.array(hits[0])  
-        # aktuelle Längen
-        curr_L0 = np.linalg.norm(p1 - p0)
-        curr_L1 = np.linalg.norm(p2 - p1)
-        curr_L2 = np.linalg.norm(p2 - p3)
-        curr_L3 = np.linalg.norm(p3 - p0)
-        
-        errors["L0"].append(curr_L0 - L0)
-        errors["L1"].append(curr_L1 - L1)
-        errors["L2"].append(curr_L2 - L2)
-        errors["L3"].append(curr_L3 - L3)
-        theta_values.append(theta)
-    return theta_values, errors
-def plot_length_errors(points):
+
+    alpha = np.radians(theta)
+    p1 = p0 + L0 * np.stack([np.cos(alpha), np.sin(alpha)], axis=-1)
+    p2, valid = circle_intersections_vec(p1, L1, p3, L2, 1.0)
+    p1, p2 = p1[valid], p2[valid]
+
+    errors = np.empty(p1.shape[0], dtype=LENGTH_ERROR_DTYPE)
+    errors["theta"] = theta[valid]
+    errors["L0"] = np.hypot(*(p1 - p0).T) - L0
+    errors["L1"] = np.hypot(*(p2 - p1).T) - L1
+    errors["L2"] = np.hypot(*(p2 - p3).T) - L2
+    errors["L3"] = np.hypot(*(p3 - p0)) - L3
+    return errors
+
+def decimate_minmax(x, y, max_points=MAX_PLOT_POINTS):
+    """
+    Reduziert eine Kurve für die Darstellung auf höchstens max_points Punkte,
+    wobei je Abschnitt Minimum und Maximum erhalten bleiben (keine Spitzen gehen verloren).
+    """
+    n = len(x)
+    if n <= max_points:
+        return x, y
+    # Abschnitte gleicher Breite, der Rest kommt in den letzten Abschnitt (aufgefüllt mit dem letzten Wert)
+    width = -(-n // (max_points // 2))
+    bins = -(-n // width)
+    pad = bins * width - n
+    xb = np.pad(np.asarray(x), (0, pad), mode="edge").reshape(bins, width)
+    yb = np.pad(np.asarray(y), (0, pad), mode="edge").reshape(bins, width)
+    i_min = yb.argmin(axis=1)
+    i_max = yb.argmax(axis=1)
+    first = np.minimum(i_min, i_max)
+    second = np.maximum(i_min, i_max)
+    rows = np.arange(bins)
+    x_out = np.stack([xb[rows, first], xb[rows, second]], axis=1).ravel()
+    y_out = np.stack([yb[rows, first], yb[rows, second]], axis=1).ravel()
+    return x_out, y_out
+
+def plot_length_errors(points, num_angles=180, errors=None):
     
-    theta_values, errors = compute_length_errors(points)
+    if errors is None:
+        errors = compute_length_errors(points, num_angles=num_angles)
     fig, ax = plt.subplots(figsize=(10, 6))
-    for link, error_vals in errors.items():
-        ax.plot(theta_values, error_vals, label=f'Fehler {link}')
+    for link in LENGTH_ERROR_DTYPE.names[1:]:
+        ax.plot(*decimate_minmax(errors["theta"], errors[link]), label=f'Fehler {link}')
     ax.set_xlabel("Theta (Grad)")
     ax.set_ylabel("Längenfehler")
     ax.legend()
     ax.grid()
     return fig
    
+def transmission_analysis(points, p1, p2, theta) -> np.ndarray:
+    """
+    Übertragungswinkel und mechanischer Vorteil für vorab berechnete Gelenklagen (N x 2).
+
+    Der Übertragungswinkel ist der Winkel zwischen Koppel und Schwinge bei p2 (0..180 Grad).
+    Der mechanische Vorteil ist das Momentenverhältnis Schwinge/Kurbel bei verlustfreier
+    Übertragung, also das Verhältnis der Winkelgeschwindigkeiten Kurbel/Schwinge. Es folgt aus
+    der Starrheit der Koppel: w_Schwinge / w_Kurbel = (r01 x r12) / (r32 x r12). In den Totlagen
+    der Kurbel wird er unendlich.
+
+    :return: strukturiertes Array mit den Feldern theta, transmission_angle, mechanical_advantage
+    """
+    p0, p3 = np.asarray(points["p0"], dtype=float), np.asarray(points["p3"], dtype=float)
+    crank = p1 - p0
+    coupler = p2 - p1
+    rocker = p2 - p3
+    cross_in = crank[:, 0] * coupler[:, 1] - crank[:, 1] * coupler[:, 0]
+    cross_out = rocker[:, 0] * coupler[:, 1] - rocker[:, 1] * coupler[:, 0]
+    cos_mu = (coupler * rocker).sum(axis=1) / (np.hypot(*coupler.T) * np.hypot(*rocker.T))
+
+    analysis = np.empty(len(theta), dtype=TRANSMISSION_DTYPE)
+    analysis["theta"] = theta
+    analysis["transmission_angle"] = np.degrees(np.arccos(np.clip(cos_mu, -1.0, 1.0)))
+    with np.errstate(divide="ignore"):
+        analysis["mechanical_advantage"] = np.abs(cross_out / cross_in)
+    return analysis
+
+def link_rates(r, dv, da):
+    """Winkelgeschwindigkeit und -beschleunigung eines starren Glieds aus Stabvektor r und Relativbewegung seiner Enden."""
+    r2 = (r**2).sum(axis=-1)
+    omega = (r[..., 0] * dv[..., 1] - r[..., 1] * dv[..., 0]) / r2
+    alpha = (r[..., 0] * da[..., 1] - r[..., 1] * da[..., 0]) / r2
+    return omega, alpha
+
+def four_bar_motion(points, p1, p2, theta, omega=1.0, alpha=0.0) -> np.ndarray:
+    """
+    Geschwindigkeiten und Beschleunigungen des Viergelenks für vorab berechnete Lagen (N x 2)
+    aus den abgeleiteten Schleifengleichungen (Dyade p2 an p1 und p3), vollständig vektorisiert.
+
+    :param omega: Winkelgeschwindigkeit der Kurbel in rad/s
+    :param alpha: Winkelbeschleunigung der Kurbel in rad/s^2
+    :return: strukturiertes Array (MOTION_DTYPE); in Totlagen stehen inf bzw. NaN
+    """
+    p0, p3 = np.asarray(points["p0"], dtype=float), np.asarray(points["p3"], dtype=float)
+    zero = np.zeros_like(p1)
+    v1, a1 = crank_motion(p0, p1, omega, alpha)
+    v2 = dyad_velocity(p2, p1, p3, v1, zero)
+    a2 = dyad_acceleration(p2, p1, p3, v2, v1, zero, a1, zero)
+
+    motion = np.empty(len(theta), dtype=MOTION_DTYPE)
+    motion["theta"] = theta
+    motion["v_p1"], motion["v_p2"] = v1, v2
+    motion["a_p1"], motion["a_p2"] = a1, a2
+    motion["omega_coupler"], motion["alpha_coupler"] = link_rates(p2 - p1, v2 - v1, a2 - a1)
+    motion["omega_rocker"], motion["alpha_rocker"] = link_rates(p2 - p3, v2, a2)
+    return motion
+
+def plot_motion_profiles(theta, velocity, acceleration, title="Geschwindigkeit und Beschleunigung"):
+    """
+    Geschwindigkeits- und Beschleunigungsverlauf über Theta. Vektoren (N x 2) werden
+    mit ihren Komponenten und dem Betrag dargestellt, Skalare (z. B. Kolben) direkt.
+    """
+    fig, axes = plt.subplots(1, 2, figsize=(12, 4))
+    for ax, values, label in zip(axes, (velocity, acceleration), ("Geschwindigkeit", "Beschleunigung")):
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            ax.plot(*decimate_minmax(theta, values), label=label)
+        else:
+            for i, axis_name in enumerate("xy"):
+                ax.plot(*decimate_minmax(theta, values[:, i]), lw=1, label=f"{label} {axis_name}")
+            ax.plot(*decimate_minmax(theta, np.hypot(*values.T)), "k-", lw=2, label="Betrag")
+        ax.set_xlabel("Theta (Grad)")
+        ax.set_ylabel(label)
+        ax.grid(True)
+        ax.legend()
+    fig.suptitle(title)
+    return fig
+
+def transmission_summary(analysis: np.ndarray) -> dict:
+    """Kleinste Übertragungsgüte (Abstand des Übertragungswinkels von 0° bzw. 180°) und kleinster mechanischer Vorteil mit Lage."""
+    mu = analysis["transmission_angle"]
+    quality = np.minimum(mu, 180.0 - mu)
+    i_mu = int(np.argmin(quality))
+    i_ma = int(np.argmin(analysis["mechanical_advantage"]))
+    return {
+        "min_transmission": float(quality[i_mu]),
+        "theta_min_transmission": float(analysis["theta"][i_mu]),
+        "transmission_range": (float(mu.min()), float(mu.max())),
+        "min_mechanical_advantage": float(analysis["mechanical_advantage"][i_ma]),
+        "theta_min_mechanical_advantage": float(analysis["theta"][i_ma]),
+    }
+
+def plot_transmission_analysis(analysis: np.ndarray, title="Kraftübertragung"):
+    """Übertragungswinkel und mechanischer Vorteil über Theta, Minima markiert."""
+    summary = transmission_summary(analysis)
+    theta = analysis["theta"]
+    fig, (ax_mu, ax_ma) = plt.subplots(1, 2, figsize=(12, 4))
+    ax_mu.plot(*decimate_minmax(theta, analysis["transmission_angle"]), label="Übertragungswinkel")
+    for limit in (40, 140):
+        ax_mu.axhline(limit, color="r", ls="--", lw=1)
+    ax_mu.axvline(summary["theta_min_transmission"], color="k", ls=":",
+                  label=f"ungünstigste Lage ({summary['min_transmission']:.1f}°)")
+    ax_mu.set_ylabel("Übertragungswinkel (Grad)")
+
+    ma = np.minimum(analysis["mechanical_advantage"], 1e3)
+    ax_ma.semilogy(*decimate_minmax(theta, ma), label="mechanischer Vorteil")
+    ax_ma.axvline(summary["theta_min_mechanical_advantage"], color="k", ls=":",
+                  label=f"Minimum ({summary['min_mechanical_advantage']:.2f})")
+    ax_ma.set_ylabel("Momentenverhältnis Schwinge/Kurbel")
+    for ax in (ax_mu, ax_ma):
+        ax.set_xlabel("Theta (Grad)")
+        ax.grid(True)
+        ax.legend()
+    fig.suptitle(title)
+    return fig
+
 def build_points():
     # Standard-Punkte mal als Beispiel 
     return {
@@ -56,28 +219,46 @@ def build_points():
         "p3": np.array([  5.0, -30.0])
     }
 
+FOUR_BAR_EDGES = [("p0", "p1"), ("p1", "p2"), ("p2", "p3"), ("p3", "p0")]
+
+def check_four_bar(points):
+    """
+    Rang- und Mobilitätsprüfung des Viergelenks (p0, p3 fest, p1 angetrieben) samt Bewegungsbereich.
+
+    In einer Totlage ist die Steifigkeitsmatrix singulär, obwohl sich der Mechanismus bewegen lässt.
+    Ist die eingegebene Lage singulär, aber laut crank_motion_range zulässig, wird die Prüfung
+    in der Mitte des Intervalls der Ausgangslage wiederholt.
+
+    :return: (check, motion) mit dem Ergebnis von check_mechanism und von crank_motion_range
+    """
+    check = check_mechanism(FOUR_BAR_EDGES, points, fixed=["p0", "p3"], driven=["p1"])
+    motion = crank_motion_range(points)
+    if check["ok"] or motion["current_interval"] is None:
+        return check, motion
+
+    theta = np.mean(motion["current_interval"])
+    lengths = motion["lengths"]
+    p0, p3 = np.asarray(points["p0"], dtype=float), np.asarray(points["p3"], dtype=float)
+    p1 = p0 + lengths["L0"] * np.array([np.cos(np.radians(theta)), np.sin(np.radians(theta))])
+    p2, _ = circle_intersections_vec(p1, lengths["L1"], p3, lengths["L2"], 1.0)
+    check_inside = check_mechanism(FOUR_BAR_EDGES, {**points, "p1": p1, "p2": p2}, fixed=["p0", "p3"], driven=["p1"])
+    if check_inside["ok"]:
+        check_inside["messages"] = [
+            f"Warnung: Die eingegebene Lage ist eine Totlage. Rang und Mobilität wurden bei Theta = {theta:.1f}° geprüft."
+        ] + check_inside["messages"]
+        return check_inside, motion
+    return check, motion
+
 def build_matrix_4bars():
     # 8x8-Matrix A für vier Stäbe (p0->p1, p1->p2, p2->p3, p3->p0).
-    
-    A = np.zeros((8, 8))
-    # Stab 1: p0 -> p1
-    A[0, 0] =  1.0; A[0, 2] = -1.0
-    A[1, 1] =  1.0; A[1, 3] = -1.0
-    # Stab 2: p1 -> p2
-    A[2, 2] =  1.0; A[2, 4] = -1.0
-    A[3, 3] =  1.0; A[3, 5] = -1.0
-    # Stab 3: p2 -> p3
-    A[4, 4] =  1.0; A[4, 6] = -1.0
-    A[5, 5] =  1.0; A[5, 7] = -1.0
-    # Stab 4: p3 -> p0
-    A[6, 6] =  1.0; A[6, 0] = -1.0
-    A[7, 7] =  1.0; A[7, 1] = -1.0
-    return A
+    # Entspricht der Koordinatenmatrix der allgemeinen Inzidenzmatrix (LinkageGraph).
+    return LinkageGraph(FOUR_BAR_EDGES).coordinate_matrix.toarray()
 
 def compute_bar_lengths(A, x):
     # A*x -> Differenzvektoren, daraus euklidische Längen der 4 Stäbe.
-    diffs = A @ x  # Vektor der Länge 8
-    diffs_2d = diffs.reshape(-1, 2)  # (4,2)
+    # x kann ein einzelner 8-Vektor oder eine 8xN-Matrix (ein Frame je Spalte) sein.
+    diffs = A @ x  # Vektor der Länge 8 bzw. Matrix 8xN
+    diffs_2d = diffs.reshape((-1, 2) + diffs.shape[1:])  # (4,2) bzw. (4,2,N)
     lengths = np.linalg.norm(diffs_2d, axis=1)
     return lengths
 
@@ -93,6 +274,36 @@ def run_4bar_calculation(points):
     lengths = compute_bar_lengths(A, x)
     return lengths
 
+def build_coordinate_matrix(p0, p1, p2, p3):
+    # Stapelt die Gelenkkoordinaten aller Frames zu einer 8xN-Matrix.
+    # Feste Punkte dürfen als einzelner Punkt (2,) übergeben werden.
+    frames = np.broadcast_arrays(*(np.atleast_2d(np.asarray(p, dtype=float)) for p in (p0, p1, p2, p3)))
+    return np.concatenate([f.T for f in frames], axis=0)
+
+def check_loop_closure(points, p1, p2, tol=1e-6):
+    """
+    Prüft einen ganzen vorberechneten Zyklus auf einmal: alle Frames werden in eine
+    8xN-Matrix X geschrieben und die Stablängen mit einem Produkt A @ X bestimmt.
+
+    :param p1, p2: Bahnen der bewegten Gelenke (N, 2)
+    :return: Dictionary mit den Stablängen (4, N), den Abweichungen von den Nennlängen,
+             der größten Abweichung und ob alle Abweichungen unter tol liegen
+    """
+    A = build_matrix_4bars()
+    nominal = run_4bar_calculation(points)
+    X = build_coordinate_matrix(points["p0"], p1, p2, points["p3"])
+    lengths = compute_bar_lengths(A, X)
+    violations = lengths - nominal[:, None]
+    finite = np.isfinite(violations).all(axis=0)
+    max_violation = float(np.abs(violations[:, finite]).max()) if finite.any() else 0.0
+    return {
+        "lengths": lengths,
+        "violations": violations,
+        "max_violation": max_violation,
+        "invalid_frames": int((~finite).sum()),
+        "ok": max_violation <= tol and finite.all(),
+    }
+
 
 def circle_intersections(c1, r1, c2, r2):
     """
@@ -153,14 +364,28 @@ def animate_4bar_kinematics(points, show_path=False):
         st.write("Fehler: Ein oder mehrere Stablängen sind null. Bitte geben Sie gültige Punkte ein.")
         return None, None, None
 
-    
-    lengths_sorted = sorted([L0, L1, L2, L3])
-    if lengths_sorted[0] + lengths_sorted[1] > lengths_sorted[2] + lengths_sorted[3]:
-        st.print("WARNUNG: Grashof-Kriterium nicht erfüllt. Evtl. keine vollständige Rotation möglich.")
+    # Grashof-Klasse und Totlagen geschlossen bestimmen, nur der zulässige Bereich wird animiert
+    check, motion = check_four_bar(points)
+    for message in check["messages"]:
+        st.write(message)
+    if not check["ok"]:
+        return None, None, None
 
+    
     NUM_FRAMES = 80
     FPS = 10
 
+    for message in describe_motion_range(motion):
+        st.write(message)
+    theta, branch = crank_sweep(motion, NUM_FRAMES)
+    if len(theta) == 0:
+        return None, None, None
+    alpha = np.radians(theta)
+    p1_frames = p0 + L0 * np.column_stack([np.cos(alpha), np.sin(alpha)])
+    # Zweig der eingegebenen Lage (Seite von p1 -> p3, auf der p2 liegt), wie in solve_crank_rod
+    sign = branch_sign(p1_init, p3, p2_init) * branch
+    p2_frames, _ = circle_intersections_vec(p1_frames, L1, p3, L2, sign)
+
     
     fig, ax = plt.subplots()
     #ax.set_title("Echte 4-Gelenk-Kinematik")
@@ -204,23 +429,8 @@ def animate_4bar_kinematics(points, show_path=False):
     circle_p1.center = (p0[0], p0[1])    
 
     def update(frame):
-        # Drehe p1 um p0
-        alpha = 2 * np.pi * frame / NUM_FRAMES  # 0..2pi
-        px1 = p0[0] + L0 * np.cos(alpha)
-        py1 = p0[1] + L0 * np.sin(alpha)
-        p1 = np.array([px1, py1])
-
-
-        # Finde p2 als Schnittpunkt:
-        #  - Kreis um p1, Radius = L1
-        #  - Kreis um p3, Radius = L2
-        hits = circle_intersections(p1, L1, p3, L2)
-        if not hits:
-            st.write("Fehler: Keine gültige Konfiguration gefunden. Überprüfen Sie die Eingabepunkte.")
-            return None
-        
-        p2 = np.array(hits[0])
-
+        p1 = p1_frames[frame]
+        p2 = p2_frames[frame]
 
         if show_path:
             trajectory.append([p2[0], p2[1]])  
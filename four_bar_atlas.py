@@ -0,0 +1,110 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.colors import ListedColormap, BoundaryNorm
+from kinematics import GRASHOF_CLASSES, grashof_class, crank_angle_limits, transmission_angle_limits
+
+ATLAS_DTYPE = np.dtype([
+    ("grashof", np.int8),
+    ("rotatable", np.bool_),
+    ("min_transmission", np.float32),
+])
+RATIO_NAMES = ["L0/L3", "L1/L3", "L2/L3"]
+CLASS_COLORS = ["tab:green", "tab:blue", "tab:orange", "tab:purple", "tab:gray", "tab:red"]
+
+
+def evaluate_ratios(r0, r1, r2) -> np.ndarray:
+    """
+    Bewertet beliebig viele Viergelenke mit auf das Gestell normierten Längen
+    (Kurbel r0, Koppel r1, Schwinge r2, Gestell 1) vollständig vektorisiert.
+
+    Die Güte der Kraftübertragung ist die kleinste Abweichung des Übertragungswinkels
+    von 0° bzw. 180° über den Zyklus (90° ist ideal, 0° bedeutet Totlage).
+    """
+    r0, r1, r2 = np.broadcast_arrays(*(np.asarray(r, dtype=float) for r in (r0, r1, r2)))
+    result = np.empty(r0.shape, dtype=ATLAS_DTYPE)
+    result["grashof"] = grashof_class(r0, r1, r2, 1.0)
+    psi_min, psi_max, feasible = crank_angle_limits(r0, r1, r2, 1.0)
+    result["rotatable"] = feasible & (psi_min <= 0.0) & (psi_max >= np.pi)
+    mu_min, mu_max = transmission_angle_limits(r0, r1, r2, 1.0)
+    result["min_transmission"] = np.where(feasible, np.minimum(mu_min, 180.0 - mu_max), np.nan)
+    return result
+
+
+class FourBarAtlas:
+    """
+    Atlas des Entwurfsraums eines Viergelenks über ein dichtes Gitter der Längenverhältnisse
+    L0/L3, L1/L3 und L2/L3 (bei resolution=128 etwa zwei Millionen Punkte).
+
+    Das Gitter wird einmal berechnet und kann anschließend für beliebige Entwürfe abgefragt
+    oder als Schnittbild bei festem L2/L3 dargestellt werden.
+    """
+    def __init__(self, resolution=128, ratio_range=(0.1, 3.0)):
+        self.axes = [np.linspace(*ratio_range, resolution) for _ in RATIO_NAMES]
+        r0, r1, r2 = np.meshgrid(*self.axes, indexing="ij")
+        self.data = evaluate_ratios(r0, r1, r2)
+
+    @staticmethod
+    def ratios(points) -> np.ndarray:
+        """Normierte Längenverhältnisse eines Entwurfs aus den Gelenkpunkten p0 bis p3."""
+        p0, p1, p2, p3 = (np.asarray(points[k], dtype=float) for k in ("p0", "p1", "p2", "p3"))
+        L3 = np.linalg.norm(p3 - p0)
+        return np.array([np.linalg.norm(p1 - p0), np.linalg.norm(p2 - p1), np.linalg.norm(p2 - p3)]) / L3
+
+    def index(self, ratios) -> tuple:
+        """Index der nächstgelegenen Gitterzelle (Werte außerhalb werden auf den Rand gesetzt)."""
+        ratios = np.asarray(ratios, dtype=float)
+        idx = []
+        for axis, r in zip(self.axes, np.moveaxis(ratios, -1, 0)):
+            step = axis[1] - axis[0]
+            idx.append(np.clip(np.rint((r - axis[0]) / step).astype(int), 0, len(axis) - 1))
+        return tuple(idx)
+
+    def query(self, ratios) -> np.ndarray:
+        """Liest die Atlaswerte der nächstgelegenen Gitterpunkte für ein oder viele Verhältnisse (..., 3)."""
+        return self.data[self.index(ratios)]
+
+    def query_points(self, points) -> dict:
+        """Ordnet einen Entwurf aus der App ein: Gitterwerte und exakte Werte des Entwurfs."""
+        ratios = self.ratios(points)
+        exact = evaluate_ratios(*ratios)
+        inside = all(axis[0] <= r <= axis[-1] for axis, r in zip(self.axes, ratios))
+        return {
+            "ratios": dict(zip(RATIO_NAMES, ratios.tolist())),
+            "grashof_class": GRASHOF_CLASSES[int(exact["grashof"])],
+            "rotatable": bool(exact["rotatable"]),
+            "min_transmission": float(exact["min_transmission"]),
+            "inside_atlas": inside,
+            "atlas_cell": self.query(ratios),
+        }
+
+    def plot_slice(self, r2, marker=None):
+        """
+        Schnittbilder des Atlas bei festem L2/L3: Grashof-Klasse (links) und kleinster
+        Übertragungswinkel (rechts). marker = (L0/L3, L1/L3) markiert einen Entwurf.
+        """
+        k = self.index(np.array([self.axes[0][0], self.axes[1][0], r2]))[2]
+        plane = self.data[:, :, k]
+        extent = [self.axes[0][0], self.axes[0][-1], self.axes[1][0], self.axes[1][-1]]
+        fig, (ax_class, ax_mu) = plt.subplots(1, 2, figsize=(13, 5))
+
+        cmap = ListedColormap(CLASS_COLORS)
+        norm = BoundaryNorm(np.arange(len(GRASHOF_CLASSES) + 1) - 0.5, cmap.N)
+        image = ax_class.imshow(plane["grashof"].T, origin="lower", extent=extent, aspect="auto",
+                                cmap=cmap, norm=norm, interpolation="nearest")
+        bar = fig.colorbar(image, ax=ax_class, ticks=range(len(GRASHOF_CLASSES)))
+        bar.ax.set_yticklabels(GRASHOF_CLASSES, fontsize=7)
+        ax_class.set_title(f"Grashof-Klasse (L2/L3 = {self.axes[2][k]:.2f})")
+
+        image = ax_mu.imshow(plane["min_transmission"].T, origin="lower", extent=extent, aspect="auto",
+                             cmap="viridis", vmin=0, vmax=90)
+        ax_mu.contour(self.axes[0], self.axes[1], plane["min_transmission"].T, levels=[40], colors="white")
+        fig.colorbar(image, ax=ax_mu, label="kleinster Übertragungswinkel (Grad)")
+        ax_mu.set_title("Übertragungsgüte (weiß: 40°)")
+
+        for ax in (ax_class, ax_mu):
+            ax.set_xlabel(RATIO_NAMES[0])
+            ax.set_ylabel(RATIO_NAMES[1])
+            if marker is not None:
+                ax.plot(*marker, "r*", ms=15, mec="k", label="eigener Entwurf")
+                ax.legend(loc="upper right")
+        return fig
@@ -0,0 +1,177 @@
+import os
+import tempfile
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.animation as animation
+from matplotlib.collections import LineCollection
+from advanced_strandbeest import JANSEN_EDGES
+from walker import JOINT_ORDER, NUM_FRAMES, LEG_COLORS, leg_cycle, leg_layout, walker_frames, walker_segments
+
+CONTACT_TOL = 0.5      # Höhe über dem Boden, bis zu der ein Fuß als aufgesetzt gilt
+CONTACT_ITERATIONS = 3
+TERRAIN_KINDS = ("eben", "Stufen", "wellig")
+
+
+def make_terrain(kind="eben", length=200.0, resolution=2.0, amplitude=2.0, seed=None):
+    """
+    Geländeprofil als Höhenarray (x, Höhe) mit stückweise linearer Interpolation.
+    "eben" liefert None (Boden auf Höhe 0).
+    """
+    if kind == "eben":
+        return None
+    x = np.arange(-50.0, length + resolution, resolution)
+    if kind == "Stufen":
+        rng = np.random.default_rng(seed)
+        steps = np.cumsum(rng.uniform(-amplitude, amplitude, len(x) // 10 + 1))
+        height = np.repeat(steps, 10)[:len(x)]
+    elif kind == "wellig":
+        height = amplitude * np.sin(2 * np.pi * x / 40.0)
+    else:
+        raise ValueError(f"Unbekanntes Gelände: {kind}")
+    return x, height - height[np.searchsorted(x, 0.0)]
+
+
+def terrain_height(x, terrain=None) -> np.ndarray:
+    """Bodenhöhe an den Stellen x; außerhalb des Profils wird der Randwert fortgesetzt."""
+    if terrain is None:
+        return np.zeros(np.shape(x))
+    terrain_x, terrain_z = terrain
+    return np.interp(x, terrain_x, terrain_z)
+
+
+def gait_analysis(feet: np.ndarray, terrain=None, num_cycles=1, crank_speed=1.0, contact_tol=CONTACT_TOL,
+                  iterations=CONTACT_ITERATIONS) -> dict:
+    """
+    Bodenkontakt und Körperbewegung eines mehrbeinigen Läufers, vektorisiert über alle Beine und Frames.
+
+    Die Fußbahnen sind relativ zur Hüfte gegeben. Der Körper wird in jedem Frame so abgesenkt,
+    dass der tiefste Fuß den Boden berührt; Füße innerhalb von contact_tol gelten als aufgesetzt.
+    Aufgesetzte Füße sollen relativ zum Boden stehen bleiben, deshalb verschiebt sich der Körper
+    je Schritt um das Negative ihrer mittleren Relativbewegung (kleinste Quadrate). Was ein
+    aufgesetzter Fuß dabei trotzdem über den Boden wandert, ist Schlupf. Auf unebenem Gelände hängt
+    der Kontakt von der Körperlage ab, die Zuordnung wird deshalb einige Male wiederholt.
+
+    :param feet: Fußpunkte (Beine, Frames, 2) über einen Kurbelumlauf
+    :param terrain: (x, Höhe) aus make_terrain oder None für ebenen Boden
+    :param crank_speed: Kurbeldrehzahl in Umdrehungen pro Sekunde
+    :return: Dictionary mit Körperbahn, Kontaktmatrix, Schrittweite je Umdrehung, Geschwindigkeit und Schlupf
+             (das Vorzeichen von Schrittweite und Geschwindigkeit gibt die Laufrichtung in x an)
+    """
+    feet = np.asarray(feet, dtype=float)
+    n_frames = feet.shape[1]
+    # Umläufe aneinanderhängen und mit dem ersten Frame des nächsten Umlaufs schließen
+    frame_index = np.arange(n_frames * num_cycles + 1) % n_frames
+    rel = feet[:, frame_index]                                          # (Beine, T, 2)
+    d_rel = np.diff(rel[..., 0], axis=1)                                 # (Beine, T-1)
+    theta = 360.0 * np.arange(len(frame_index)) / n_frames
+
+    body_x = np.zeros(len(frame_index))
+    for _ in range(iterations if terrain is not None else 1):
+        ground = terrain_height(body_x + rel[..., 0], terrain)
+        body_y = (ground - rel[..., 1]).max(axis=0)
+        height = body_y + rel[..., 1] - ground
+        contact = height < contact_tol
+        # Kontakt über einen ganzen Schritt; ohne solchen Fuß trägt der jeweils tiefste
+        stance = contact[:, :-1] & contact[:, 1:]
+        lowest = np.argmin(height[:, :-1] + height[:, 1:], axis=0)
+        stance[lowest, np.arange(stance.shape[1])] |= ~stance.any(axis=0)
+        body_dx = -(d_rel * stance).sum(axis=0) / stance.sum(axis=0)
+        body_x = np.concatenate([[0.0], np.cumsum(body_dx)])
+
+    slip = np.abs(body_dx + d_rel) * stance                              # Fußweg über den Boden je Schritt
+    stride = (body_x[-1] - body_x[0]) / num_cycles
+    return {
+        "theta": theta,
+        "body": np.column_stack([body_x, body_y]),
+        "contact": contact,
+        "contact_count": contact.sum(axis=0),
+        "duty_factor": contact[:, :-1].mean(axis=1),
+        "stride": float(stride),
+        "speed": float(stride * crank_speed),
+        "slip": slip,
+        "total_slip": slip.sum(axis=1) / num_cycles,
+        "max_slip": float(slip.max()) if slip.size else 0.0,
+        "slip_ratio": float(slip.sum() / max(abs(body_x[-1] - body_x[0]), 1e-12)),
+    }
+
+
+def gait_summary(result: dict) -> str:
+    """Kurzbeschreibung der Gangauswertung für die Anzeige."""
+    return (f"Schrittweite je Kurbelumdrehung: {result['stride']:.2f}, Geschwindigkeit: {result['speed']:.2f} "
+            f"pro Sekunde, mindestens {int(result['contact_count'].min())} Fuß/Füße am Boden, "
+            f"Schlupf: {100 * result['slip_ratio']:.1f} % des zurückgelegten Wegs "
+            f"(größter Einzelschritt {result['max_slip']:.3f}).")
+
+
+def walker_gait(n_legs=4, spacing=8.0, mirror=True, terrain=None, num_cycles=2, crank_speed=1.0,
+                num_frames=NUM_FRAMES, design=None):
+    """
+    Beine wie in animate_walker aus einem Zyklus erzeugen (alle Kurbeln auf einer gemeinsamen Welle)
+    und den Gang der Fußpunkte S auswerten.
+
+    :return: (Beinlagen (Beine, Frames, Gelenke, 2) relativ zur Hüfte, Ergebnis von gait_analysis)
+    """
+    cycle = leg_cycle(num_frames, design)
+    frames = walker_frames(cycle, leg_layout(n_legs, spacing, mirror))
+    result = gait_analysis(frames[:, :, JOINT_ORDER.index("S")], terrain, num_cycles, crank_speed)
+    return frames, result
+
+
+def animate_gait(n_legs=4, spacing=8.0, mirror=True, terrain=None, num_cycles=2, crank_speed=1.0,
+                 num_frames=NUM_FRAMES, design=None):
+    """
+    Animation eines laufenden Strandbeests, das mit der Körperbahn aus gait_analysis
+    über den Boden bzw. das Gelände verschoben wird. Aufgesetzte Füße sind rot markiert.
+
+    :return: (GIF-Bytes, Bahn der Hüfte)
+    """
+    frames, result = walker_gait(n_legs, spacing, mirror, terrain, num_cycles, crank_speed, num_frames, design)
+    foot = JOINT_ORDER.index("S")
+
+    # Beine über alle Umläufe wiederholen und mit dem Körper verschieben
+    total = num_frames * num_cycles
+    world = frames[:, np.arange(total) % num_frames] + result["body"][None, :total, None, :]
+    segments = walker_segments(world)
+    colors = np.repeat([LEG_COLORS[i % len(LEG_COLORS)] for i in range(n_legs)], len(JANSEN_EDGES))
+    feet = world[:, :, foot]
+    contact = result["contact"][:, :total]
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    all_points = world.reshape(-1, 2)
+    margin = 5.0
+    x_min, x_max = all_points[:, 0].min() - margin, all_points[:, 0].max() + margin
+    ground_x = np.linspace(x_min, x_max, 400)
+    ground_y = terrain_height(ground_x, terrain)
+    ax.fill_between(ground_x, ground_y, ground_y.min() - margin, color="burlywood", alpha=0.5)
+    ax.plot(ground_x, ground_y, color="saddlebrown", lw=1.5)
+    ax.set_xlim(x_min, x_max)
+    ax.set_ylim(ground_y.min() - margin, all_points[:, 1].max() + margin)
+    ax.set_aspect("equal", adjustable="box")
+    ax.set_title(f"Strandbeest mit {n_legs} Beinen, v = {result['speed']:.2f} pro Sekunde")
+    ax.grid(True)
+
+    bars = LineCollection(segments[0], colors=colors, linewidths=2)
+    ax.add_collection(bars)
+    ax.plot(result["body"][:total, 0], result["body"][:total, 1], "k:", lw=0.8)
+    stance_markers, = ax.plot([], [], "ro", ms=5)
+    swing_markers, = ax.plot([], [], "go", ms=4)
+
+    def update(frame):
+        bars.set_segments(segments[frame])
+        on_ground = contact[:, frame]
+        stance_markers.set_data(feet[on_ground, frame, 0], feet[on_ground, frame, 1])
+        swing_markers.set_data(feet[~on_ground, frame, 0], feet[~on_ground, frame, 1])
+        return bars, stance_markers, swing_markers
+
+    ani = animation.FuncAnimation(fig, update, frames=total, blit=True, interval=50)
+    with tempfile.NamedTemporaryFile(suffix=".gif", delete=False) as tmpfile:
+        tmp_filename = tmpfile.name
+    try:
+        ani.save(tmp_filename, writer="pillow", fps=20, dpi=80)
+        with open(tmp_filename, "rb") as f:
+            buf = f.read()
+    finally:
+        os.remove(tmp_filename)
+    plt.close(fig)
+    trajectory = [tuple(p) for p in result["body"][:total]]
+    return buf, trajectory
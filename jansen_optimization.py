@@ -0,0 +1,204 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.optimize import differential_evolution
+from advanced_strandbeest import (
+    JANSEN_EDGES, edge_key, jansen_link_lengths, jansen_design_from_lengths, solve_jansen_closed_form,
+    default_simulator
+)
+
+# Reihenfolge der Designparameter: alle Stablängen und der Abstand der festen Punkte Y-Z
+DESIGN_KEYS = [edge_key(e) for e in JANSEN_EDGES] + ["YZ"]
+
+# Bodenkontakt: der Fuß S gilt als am Boden, solange er weniger als dieser Anteil der
+# Schritthöhe über seinem tiefsten Punkt liegt.
+CONTACT_BAND = 0.05
+NUM_ANGLES = 120
+INVALID_PENALTY = 1e3
+RESIDUAL_TOL = 1e-6     # größte zulässige Stablängenabweichung einer Simulatorlösung
+
+DEFAULT_WEIGHTS = {
+    "stride": 1.0,       # Schrittlänge (maximieren)
+    "flatness": 20.0,    # Streuung der Höhe während des Bodenkontakts (minimieren)
+    "step_height": 2.0,  # Unterschreitung der Ziel-Schritthöhe (minimieren)
+    "duty": 20.0,        # Abweichung des Bodenkontakt-Anteils vom Zielwert (minimieren)
+}
+DEFAULT_TARGETS = {
+    "step_height": 6.0,
+    "duty": 0.5,
+}
+
+
+def lengths_to_vector(lengths: dict) -> np.ndarray:
+    return np.array([lengths[k] for k in DESIGN_KEYS], dtype=float)
+
+
+def vector_to_lengths(x) -> dict:
+    """
+    Wandelt einen Parametervektor (P,) oder eine Population (P, S) in ein Längen-Dictionary um.
+    Bei einer Population haben die Einträge die Form (S, 1), damit sie gegen die Winkel broadcasten.
+    """
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 1:
+        return {k: x[i] for i, k in enumerate(DESIGN_KEYS)}
+    return {k: x[i][:, None] for i, k in enumerate(DESIGN_KEYS)}
+
+
+def foot_path_metrics(S, contact_band=CONTACT_BAND) -> dict:
+    """
+    Kennwerte der Fußbahn S mit der Form (..., Winkel, 2) über einen vollen Kurbelumlauf.
+
+    - stride: horizontale Länge des Bodenkontakt-Abschnitts
+    - flatness: Standardabweichung der Höhe während des Bodenkontakts
+    - step_height: Differenz zwischen höchstem und tiefstem Punkt
+    - duty: Anteil der Bodenkontaktzeit an der Zykluszeit
+    """
+    x, y = S[..., 0], S[..., 1]
+    y_min = y.min(axis=-1, keepdims=True)
+    step_height = y.max(axis=-1, keepdims=True) - y_min
+    contact = y <= y_min + contact_band * step_height
+    x_contact = np.where(contact, x, np.nan)
+    y_contact = np.where(contact, y, np.nan)
+    return {
+        "stride": np.nanmax(x_contact, axis=-1) - np.nanmin(x_contact, axis=-1),
+        "flatness": np.nanstd(y_contact, axis=-1),
+        "step_height": step_height[..., 0],
+        "duty": contact.mean(axis=-1),
+        "contact": contact,
+    }
+
+
+def design_score(metrics: dict, weights=None, targets=None):
+    """Gewichtete Zielfunktion (kleiner ist besser)."""
+    w = {**DEFAULT_WEIGHTS, **(weights or {})}
+    t = {**DEFAULT_TARGETS, **(targets or {})}
+    return (
+        - w["stride"] * metrics["stride"]
+        + w["flatness"] * metrics["flatness"]
+        + w["step_height"] * np.maximum(t["step_height"] - metrics["step_height"], 0.0)
+        + w["duty"] * np.abs(metrics["duty"] - t["duty"])
+    )
+
+
+class JansenObjective:
+    """
+    Zielfunktion für die Optimierung. Bewertet einen Parametervektor oder eine ganze
+    Population auf einmal mit der geschlossenen Lösung des Jansen-Beins.
+    Designs, die sich nicht vollständig drehen lassen, erhalten eine Strafe.
+    """
+    def __init__(self, num_angles=NUM_ANGLES, weights=None, targets=None, contact_band=CONTACT_BAND):
+        self.theta = np.linspace(0, 360, num_angles, endpoint=False)
+        self.weights = weights
+        self.targets = targets
+        self.contact_band = contact_band
+
+    def foot_path(self, x):
+        """Fußbahn S (..., Winkel, 2) und Gültigkeitsmaske (..., Winkel) eines Vektors oder einer Population."""
+        positions, valid = solve_jansen_closed_form(vector_to_lengths(x), self.theta)
+        return positions["S"], valid
+
+    def evaluate(self, x):
+        """Gibt (Bewertung, Kennwerte, Fußbahn S, Gültigkeitsmaske) zurück."""
+        S, valid = self.foot_path(x)
+        all_valid = valid.all(axis=-1)
+        S_safe = np.where(valid[..., None], S, 0.0)
+        with np.errstate(invalid="ignore"):
+            metrics = foot_path_metrics(S_safe, self.contact_band)
+            score = design_score(metrics, self.weights, self.targets)
+        penalty = INVALID_PENALTY * (1.0 + (~valid).mean(axis=-1))
+        score = np.where(all_valid, score, penalty)
+        return score, metrics, S, valid
+
+    def __call__(self, x):
+        return self.evaluate(x)[0]
+
+
+class SimulatorObjective(JansenObjective):
+    """
+    Bewertung wie JansenObjective, die Fußbahn wird aber je Design mit dem MechanismSimulator
+    (least_squares für jeden Winkel) bestimmt. Um Größenordnungen langsamer als die geschlossene
+    Lösung, daher als teure exakte Bewertung hinter surrogate.ScreenedObjective gedacht.
+    """
+    def foot_path(self, x):
+        x = np.asarray(x, dtype=float)
+        X = x.T if x.ndim > 1 else x[None]
+        S = np.zeros((len(X), len(self.theta), 2))
+        valid = np.zeros((len(X), len(self.theta)), dtype=bool)
+        for i, xi in enumerate(X):
+            design = jansen_design_from_lengths(vector_to_lengths(xi), self.theta[0])
+            if design is None:
+                continue
+            simulator = default_simulator(design)
+            analysis, solutions = simulator.analyze_cycle(self.theta)
+            S[i] = solutions.reshape(len(self.theta), -1, 2)[:, simulator.free_labels.index("S")]
+            valid[i] = analysis["success"] & (analysis["max_residual"] <= RESIDUAL_TOL)
+        return (S, valid) if x.ndim > 1 else (S[0], valid[0])
+
+
+def optimize_jansen(rel_bounds=0.15, maxiter=100, popsize=20, workers=1, seed=None, top_k=5,
+                    num_angles=NUM_ANGLES, weights=None, targets=None, objective=None) -> list:
+    """
+    Sucht mit differential_evolution nach Stablängen, deren Fußbahn die Zielfunktion minimiert.
+    Die Suchgrenzen liegen relativ (rel_bounds) um die Standardgeometrie.
+
+    :param workers: Anzahl der Prozesse für die parallele Bewertung (-1 = alle Kerne). Standard ist 1:
+                    die ganze Population wird dann vektorisiert in einem Aufruf bewertet, für die
+                    geschlossene Lösung ist das viel schneller als ein Prozesspool. Mehrere Prozesse
+                    lohnen sich nur bei teuren Zielfunktionen.
+    :param objective: eigene Zielfunktion (z. B. surrogate.ScreenedObjective), sonst JansenObjective
+    :return: Liste der besten Designs (sortiert nach der exakten Bewertung) mit Längen, Kennwerten,
+             Geometrie und Bahnkurve von S
+    """
+    x0 = lengths_to_vector(jansen_link_lengths())
+    bounds = list(zip(x0 * (1 - rel_bounds), x0 * (1 + rel_bounds)))
+    if objective is None:
+        objective = JansenObjective(num_angles, weights, targets)
+
+    result = differential_evolution(
+        objective, bounds,
+        maxiter=maxiter, popsize=popsize, seed=seed, x0=x0,
+        workers=workers, updating="deferred",
+        vectorized=workers == 1, polish=False
+    )
+
+    # Die Energien eines ScreenedObjective sind teils nur Vorhersagen: die besten 2 * top_k
+    # Kandidaten werden exakt bewertet und erst danach sortiert
+    order = np.argsort(result.population_energies)
+    candidates = result.population[order]
+    designs = []
+    for x in candidates:
+        if len(designs) >= 2 * top_k:
+            break
+        if any(np.allclose(x, d["vector"]) for d in designs):
+            continue
+        designs.append(design_result(x, objective))
+    return sorted(designs, key=lambda d: d["score"])[:top_k]
+
+
+def design_result(x, objective: JansenObjective) -> dict:
+    """Fasst ein Design mit Kennwerten, Ausgangsgeometrie und Bahnkurve von S zusammen."""
+    score, metrics, S, valid = objective.evaluate(x)
+    lengths = vector_to_lengths(x)
+    return {
+        "vector": np.asarray(x, dtype=float),
+        "lengths": {k: float(v) for k, v in lengths.items()},
+        "score": float(score),
+        "valid": bool(valid.all()),
+        "metrics": {k: float(v) for k, v in metrics.items() if k != "contact"},
+        "design": jansen_design_from_lengths(lengths),
+        "trajectory": S.tolist(),
+    }
+
+
+def plot_foot_paths(designs: list, reference=True):
+    """Zeichnet die Fußbahnen der besten Designs (und optional der Standardgeometrie)."""
+    fig, ax = plt.subplots(figsize=(8, 5))
+    if reference:
+        ref = design_result(lengths_to_vector(jansen_link_lengths()), JansenObjective())
+        ax.plot(*zip(*ref["trajectory"]), "k--", lw=1, label="Standard")
+    for i, d in enumerate(designs):
+        ax.plot(*zip(*d["trajectory"]), lw=2 if i == 0 else 1, label=f"Design {i + 1} ({d['score']:.2f})")
+    ax.set_aspect("equal", adjustable="datalim")
+    ax.set_title("Bahnkurven des Fußpunkts S")
+    ax.grid(True)
+    ax.legend()
+    return fig
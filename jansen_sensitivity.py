@@ -0,0 +1,178 @@
+import time
+import numpy as np
+from scipy.optimize import minimize
+from advanced_strandbeest import JANSEN_DYADS, JANSEN_FIXED_POINTS, dyad_length, solve_jansen_closed_form
+from jansen_optimization import (
+    JansenObjective, design_result, DESIGN_KEYS, CONTACT_BAND, DEFAULT_WEIGHTS, DEFAULT_TARGETS, NUM_ANGLES, INVALID_PENALTY,
+    lengths_to_vector, vector_to_lengths, foot_path_metrics, jansen_link_lengths
+)
+from kinematics import circle_intersection_derivative
+
+
+def _length_index(a: str, b: str) -> int:
+    return DESIGN_KEYS.index(a + b) if a + b in DESIGN_KEYS else DESIGN_KEYS.index(b + a)
+
+
+def jansen_sensitivities(x, theta_deg):
+    """
+    Exakte Ableitungen aller Gelenkbahnen nach den Designparametern (DESIGN_KEYS).
+
+    Die geschlossene Lösung wird Dyade für Dyade implizit differenziert, d. h. für jeden
+    Winkel wird nur ein 2x2-System je Gelenk gelöst (alle Winkel auf einmal).
+
+    :param x: Parametervektor in der Reihenfolge DESIGN_KEYS
+    :return: (positions, derivatives, valid) mit derivatives[label] der Form (Winkel, 2, P)
+    """
+    lengths = vector_to_lengths(x)
+    theta = np.radians(np.asarray(theta_deg, dtype=float))
+    positions, valid = solve_jansen_closed_form(lengths, theta_deg)
+    n, P = theta.shape[0], len(DESIGN_KEYS)
+
+    Y = np.asarray(JANSEN_FIXED_POINTS["Y"], dtype=float)
+    Z_dir = np.asarray(JANSEN_FIXED_POINTS["Z"], dtype=float) - Y
+    Z_dir = Z_dir / np.linalg.norm(Z_dir)
+
+    derivatives = {"Y": np.zeros((n, 2, P)), "Z": np.zeros((n, 2, P))}
+    derivatives["Z"][:, :, DESIGN_KEYS.index("YZ")] = Z_dir
+    derivatives["X"] = derivatives["Z"].copy()
+    derivatives["X"][:, :, _length_index("X", "Z")] = np.stack([np.cos(theta), np.sin(theta)], axis=-1)
+
+    for p, c1, c2 in JANSEN_DYADS:
+        dr1 = np.zeros((n, P))
+        dr2 = np.zeros((n, P))
+        dr1[:, _length_index(p, c1)] = 1.0
+        dr2[:, _length_index(p, c2)] = 1.0
+        derivatives[p] = circle_intersection_derivative(
+            positions[p], positions[c1], dyad_length(lengths, p, c1),
+            positions[c2], dyad_length(lengths, p, c2),
+            derivatives[c1], dr1, derivatives[c2], dr2
+        )
+    return positions, derivatives, valid
+
+
+def score_and_gradient(x, theta_deg=None, weights=None, targets=None, contact_band=CONTACT_BAND):
+    """
+    Bewertung aus jansen_optimization.design_score samt Gradient nach den Designparametern.
+
+    Die Kontaktmenge sowie die Extremstellen (min/max) werden für die Ableitung festgehalten,
+    der Gradient gilt damit fast überall. Der Bodenkontakt-Anteil ist stückweise konstant
+    und trägt nicht zum Gradienten bei.
+    """
+    if theta_deg is None:
+        theta_deg = np.linspace(0, 360, NUM_ANGLES, endpoint=False)
+    w = {**DEFAULT_WEIGHTS, **(weights or {})}
+    t = {**DEFAULT_TARGETS, **(targets or {})}
+    positions, derivatives, valid = jansen_sensitivities(x, theta_deg)
+    if not valid.all():
+        return INVALID_PENALTY, np.zeros(len(DESIGN_KEYS))
+
+    S, dS = positions["S"], derivatives["S"]
+    m = foot_path_metrics(S, contact_band)
+    y = S[:, 1]
+    contact = m["contact"]
+    idx = np.nonzero(contact)[0]
+
+    i_xmax = idx[np.argmax(S[idx, 0])]
+    i_xmin = idx[np.argmin(S[idx, 0])]
+    d_stride = dS[i_xmax, 0] - dS[i_xmin, 0]
+
+    y_c = y[idx]
+    if m["flatness"] > 0:
+        d_flat = ((y_c - y_c.mean())[:, None] * dS[idx, 1]).sum(axis=0) / (len(idx) * m["flatness"])
+    else:
+        d_flat = np.zeros(len(DESIGN_KEYS))
+
+    d_height = dS[np.argmax(y), 1] - dS[np.argmin(y), 1]
+    height_active = t["step_height"] > m["step_height"]
+
+    score = (- w["stride"] * m["stride"] + w["flatness"] * m["flatness"]
+             + w["step_height"] * max(t["step_height"] - m["step_height"], 0.0)
+             + w["duty"] * abs(m["duty"] - t["duty"]))
+    grad = (- w["stride"] * d_stride + w["flatness"] * d_flat
+            - w["step_height"] * height_active * d_height)
+    return float(score), grad
+
+
+def path_fit_and_gradient(x, target, theta_deg=None):
+    """
+    Quadratischer Abstand der Fußbahn S zu einer Zielbahn (Winkel x 2) samt Gradient.
+    Glatt in den Designparametern und daher gut für Gradientenverfahren geeignet.
+    """
+    target = np.asarray(target, dtype=float)
+    if theta_deg is None:
+        theta_deg = np.linspace(0, 360, len(target), endpoint=False)
+    positions, derivatives, valid = jansen_sensitivities(x, theta_deg)
+    if not valid.all():
+        return INVALID_PENALTY, np.zeros(len(DESIGN_KEYS))
+    diff = positions["S"] - target
+    value = float(np.sum(diff**2) / len(target))
+    grad = 2 * np.einsum("ni,nip->p", diff, derivatives["S"]) / len(target)
+    return value, grad
+
+
+def refine_design(x0, target=None, rel_bounds=0.15, maxiter=50, **score_kwargs):
+    """
+    Verfeinert ein Design (z. B. aus optimize_jansen) mit scipy.optimize.minimize und
+    analytischem Gradienten (jac=True). Ohne target wird die Bewertung aus
+    jansen_optimization minimiert, mit target der Abstand der Fußbahn zur Zielbahn.
+    """
+    x0 = np.asarray(x0, dtype=float)
+    ref = lengths_to_vector(jansen_link_lengths())
+    bounds = list(zip(ref * (1 - rel_bounds), ref * (1 + rel_bounds)))
+    if target is None:
+        fun = lambda x: score_and_gradient(x, **score_kwargs)
+    else:
+        fun = lambda x: path_fit_and_gradient(x, target)
+    return minimize(fun, x0, jac=True, method="L-BFGS-B", bounds=bounds, options={"maxiter": maxiter})
+
+
+def refine_designs(designs: list, rel_bounds=0.15, maxiter=50) -> list:
+    """
+    Verfeinert die Ergebnisse von optimize_jansen und sortiert sie neu nach der Bewertung.
+    rel_bounds sollte dem Suchbereich der Optimierung entsprechen.
+    """
+    objective = JansenObjective()
+    refined = [design_result(refine_design(d["vector"], rel_bounds=rel_bounds, maxiter=maxiter).x, objective)
+               for d in designs]
+    return sorted(refined, key=lambda d: d["score"])
+
+
+def benchmark_sensitivities(x=None, num_angles=NUM_ANGLES, eps=1e-6) -> dict:
+    """
+    Vergleicht die analytischen Ableitungen mit zentralen finiten Differenzen
+    und misst die Rechenzeit beider Varianten.
+    """
+    if x is None:
+        x = lengths_to_vector(jansen_link_lengths())
+    theta_deg = np.linspace(0, 360, num_angles, endpoint=False)
+
+    start = time.perf_counter()
+    _, derivatives, _ = jansen_sensitivities(x, theta_deg)
+    t_analytic = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fd = {label: np.zeros_like(d) for label, d in derivatives.items()}
+    for k in range(len(x)):
+        step = np.zeros_like(x)
+        step[k] = eps * max(1.0, abs(x[k]))
+        plus, _ = solve_jansen_closed_form(vector_to_lengths(x + step), theta_deg)
+        minus, _ = solve_jansen_closed_form(vector_to_lengths(x - step), theta_deg)
+        for label in fd:
+            fd[label][:, :, k] = (plus[label] - minus[label]) / (2 * step[k])
+    t_fd = time.perf_counter() - start
+
+    max_error = max(np.abs(derivatives[label] - fd[label]).max() for label in fd)
+    scale = max(np.abs(fd[label]).max() for label in fd)
+    return {
+        "max_abs_error": float(max_error),
+        "max_rel_error": float(max_error / scale),
+        "time_analytic": t_analytic,
+        "time_finite_differences": t_fd,
+    }
+
+
+if __name__ == "__main__":
+    result = benchmark_sensitivities()
+    print("Vergleich analytische Ableitungen / finite Differenzen:")
+    for key, value in result.items():
+        print(f"  {key}: {value:.3e}")
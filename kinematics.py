@@ -0,0 +1,289 @@
+import numpy as np
+
+
+def circle_intersections_vec(c1, r1, c2, r2, sign=1.0):
+    """
+    Vektorisierte Variante von circle_intersections für beliebig viele Kreispaare.
+
+    c1, c2 haben die Form (..., 2), r1, r2 und sign sind auf (...) broadcastbar.
+    sign = +1 wählt den Schnittpunkt links der Verbindung c1 -> c2
+    (entspricht dem ersten Punkt von circle_intersections), sign = -1 den rechten.
+
+    Gibt die Schnittpunkte (..., 2) und eine Maske (...) der gültigen Lösungen zurück.
+    Bei ungültigen Einträgen stehen NaN in den Punkten.
+    """
+    c1 = np.asarray(c1, dtype=float)
+    c2 = np.asarray(c2, dtype=float)
+    r1 = np.asarray(r1, dtype=float)
+    r2 = np.asarray(r2, dtype=float)
+    dx = c2[..., 0] - c1[..., 0]
+    dy = c2[..., 1] - c1[..., 1]
+    d = np.hypot(dx, dy)
+
+    valid = (d <= r1 + r2) & (d >= np.abs(r1 - r2)) & (d > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = (r1**2 - r2**2 + d**2) / (2 * d)
+        h = np.sqrt(np.where(valid, np.maximum(r1**2 - a**2, 0.0), np.nan))
+        xm = c1[..., 0] + a * dx / d
+        ym = c1[..., 1] + a * dy / d
+        s = sign * h / d
+    points = np.stack([xm - dy * s, ym + dx * s], axis=-1)
+    return points, valid
+
+
+def branch_sign(c1, c2, p):
+    """Gibt +1 zurück, wenn p links der Verbindung c1 -> c2 liegt, sonst -1."""
+    c1, c2, p = (np.asarray(v, dtype=float) for v in (c1, c2, p))
+    cross = (c2[..., 0] - c1[..., 0]) * (p[..., 1] - c1[..., 1]) - (c2[..., 1] - c1[..., 1]) * (p[..., 0] - c1[..., 0])
+    return np.where(cross >= 0, 1.0, -1.0)
+
+
+def circle_intersection_derivative(p, c1, r1, c2, r2, dc1, dr1, dc2, dr2):
+    """
+    Ableitung eines Dyaden-Schnittpunkts p nach beliebig vielen Parametern
+    (implizite Differentiation von |p - c1|^2 = r1^2 und |p - c2|^2 = r2^2).
+
+    p, c1, c2 haben die Form (..., 2), r1, r2 die Form (...).
+    dc1, dc2 haben die Form (..., 2, P), dr1, dr2 die Form (..., P).
+    Gibt dp mit der Form (..., 2, P) zurück.
+    """
+    a1 = p - c1
+    a2 = p - c2
+    A = np.stack([a1, a2], axis=-2)
+    rhs = np.stack([
+        np.einsum("...i,...ip->...p", a1, dc1) + np.asarray(r1)[..., None] * dr1,
+        np.einsum("...i,...ip->...p", a2, dc2) + np.asarray(r2)[..., None] * dr2,
+    ], axis=-2)
+    return np.linalg.solve(A, rhs)
+
+
+GRASHOF_CLASSES = [
+    "Kurbelschwinge",
+    "Doppelkurbel",
+    "Doppelschwinge (Grashof)",
+    "Schwingkurbel",
+    "Durchschlaggetriebe (Grashof-Grenzfall)",
+    "Doppelschwinge (Nicht-Grashof)",
+]
+DEAD_POINT_EPS = 1e-7  # Abstand zu den Totlagen in Grad
+
+
+def grashof_class(L0, L1, L2, L3, rtol=1e-9):
+    """
+    Vektorisierte Grashof-Klassifikation eines Viergelenks mit Kurbel L0, Koppel L1,
+    Schwinge L2 und Gestell L3 (beliebige broadcastbare Arrays).
+
+    Gibt Indizes in GRASHOF_CLASSES zurück: bei s + l < p + q entscheidet das kürzeste Glied
+    über die Klasse, bei Gleichheit liegt ein Durchschlaggetriebe vor, sonst eine Doppelschwinge.
+    """
+    links = np.stack(np.broadcast_arrays(*(np.asarray(L, dtype=float) for L in (L0, L1, L2, L3))), axis=-1)
+    ordered = np.sort(links, axis=-1)
+    margin = (ordered[..., 1] + ordered[..., 2]) - (ordered[..., 0] + ordered[..., 3])
+    shortest = np.argmin(links, axis=-1)
+    # kürzestes Glied Kurbel, Koppel, Schwinge, Gestell -> Klasse
+    grashof = np.array([0, 2, 3, 1])[shortest]
+    change_point = np.abs(margin) <= rtol * ordered[..., 3]
+    return np.where(change_point, 4, np.where(margin > 0, grashof, 5))
+
+
+def crank_angle_limits(L0, L1, L2, L3):
+    """
+    Geschlossene Lösung für den Bereich des Kurbelwinkels psi (relativ zur Gestellrichtung p0 -> p3),
+    in dem das Viergelenk montierbar ist: |psi| muss in [psi_min, psi_max] liegen.
+
+    Der Abstand p1-p3 muss zwischen |L1 - L2| und L1 + L2 liegen, daraus folgt mit dem Kosinussatz
+    eine Schranke für cos(psi). Bei psi_min bzw. psi_max liegen Koppel und Schwinge gestreckt
+    bzw. gefaltet (Totlagen). Arrays werden elementweise ausgewertet.
+
+    :return: (psi_min, psi_max, feasible) in Bogenmaß
+    """
+    L0, L1, L2, L3 = (np.asarray(L, dtype=float) for L in (L0, L1, L2, L3))
+    base = L0**2 + L3**2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        upper = (base - (L1 - L2)**2) / (2 * L0 * L3)  # cos(psi) <= upper
+        lower = (base - (L1 + L2)**2) / (2 * L0 * L3)  # cos(psi) >= lower
+    psi_min = np.arccos(np.clip(upper, -1.0, 1.0))
+    psi_max = np.arccos(np.clip(lower, -1.0, 1.0))
+    feasible = (upper >= -1.0) & (lower <= 1.0) & (psi_min <= psi_max)
+    return psi_min, psi_max, feasible
+
+
+def transmission_angle_limits(L0, L1, L2, L3):
+    """
+    Kleinster und größter Übertragungswinkel (Winkel zwischen Koppel und Schwinge, in Grad)
+    über den gesamten zulässigen Bewegungsbereich, geschlossen und elementweise.
+
+    Der Übertragungswinkel wächst monoton mit dem Abstand s = |p1 - p3|, daher genügen
+    die Extremwerte von s (Kurbel gestreckt bzw. überdeckt oder Totlage).
+    """
+    L0, L1, L2, L3 = (np.asarray(L, dtype=float) for L in (L0, L1, L2, L3))
+    s_min = np.maximum(np.abs(L0 - L3), np.abs(L1 - L2))
+    s_max = np.minimum(L0 + L3, L1 + L2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cos_min = (L1**2 + L2**2 - s_min**2) / (2 * L1 * L2)
+        cos_max = (L1**2 + L2**2 - s_max**2) / (2 * L1 * L2)
+    mu_min = np.degrees(np.arccos(np.clip(cos_min, -1.0, 1.0)))
+    mu_max = np.degrees(np.arccos(np.clip(cos_max, -1.0, 1.0)))
+    return mu_min, mu_max
+
+
+def crank_motion_range(points) -> dict:
+    """
+    Bewegungsbereich der Kurbel p0 -> p1 eines Viergelenks (p0, p3 fest) aus den Gelenkpunkten.
+
+    :return: Dictionary mit der Grashof-Klasse, ob die Kurbel umlaufen kann, den zulässigen
+             Winkelintervallen und Totlagen (in Grad, bezogen auf die x-Achse) sowie dem Intervall,
+             in dem die Ausgangslage liegt
+    """
+    p0, p1, p2, p3 = (np.asarray(points[k], dtype=float) for k in ("p0", "p1", "p2", "p3"))
+    L0, L1, L2, L3 = (np.hypot(*(b - a)) for a, b in ((p0, p1), (p1, p2), (p3, p2), (p0, p3)))
+    phi = float(np.degrees(np.arctan2(*(p3 - p0)[::-1])))
+    theta_init = float(np.degrees(np.arctan2(*(p1 - p0)[::-1])))
+    psi_min, psi_max, feasible = crank_angle_limits(L0, L1, L2, L3)
+    psi_min, psi_max, feasible = float(np.degrees(psi_min)), float(np.degrees(psi_max)), bool(feasible)
+    full_rotation = feasible and psi_min <= DEAD_POINT_EPS and psi_max >= 180.0 - DEAD_POINT_EPS
+
+    intervals, dead_points = [], []
+    if feasible and not full_rotation:
+        if psi_min <= DEAD_POINT_EPS:
+            intervals = [(-psi_max, psi_max)]
+            dead_points = [-psi_max, psi_max]
+        elif psi_max >= 180.0 - DEAD_POINT_EPS:
+            intervals = [(psi_min, 360.0 - psi_min)]
+            dead_points = [psi_min, 360.0 - psi_min]
+        else:
+            intervals = [(psi_min, psi_max), (-psi_max, -psi_min)]
+            dead_points = [psi_min, psi_max, -psi_max, -psi_min]
+    intervals = [(phi + a, phi + b) for a, b in intervals]
+    dead_points = [phi + a for a in dead_points]
+
+    # Intervall der Ausgangslage (Winkel modulo 360 in das Intervall verschieben)
+    current = None
+    for a, b in intervals:
+        shift = a + np.mod(theta_init - a, 360.0)
+        if shift <= b + DEAD_POINT_EPS:
+            current = (a, b)
+            break
+
+    return {
+        "lengths": {"L0": L0, "L1": L1, "L2": L2, "L3": L3},
+        "grashof_class": GRASHOF_CLASSES[int(grashof_class(L0, L1, L2, L3))],
+        "feasible": feasible,
+        "full_rotation": full_rotation,
+        "intervals": intervals,
+        "dead_points": dead_points,
+        "current_interval": (0.0, 360.0) if full_rotation else current,
+        "theta_init": theta_init,
+    }
+
+
+def describe_motion_range(motion: dict) -> list:
+    """Meldungen zum Bewegungsbereich für die Ausgabe in der App."""
+    messages = [f"Grashof-Klasse: {motion['grashof_class']}."]
+    if not motion["feasible"]:
+        messages.append("Fehler: Für keinen Kurbelwinkel existiert eine gültige Lage. Überprüfen Sie die Punkte!")
+    elif not motion["full_rotation"]:
+        ranges = ", ".join(f"{a:.1f}° bis {b:.1f}°" for a, b in motion["intervals"])
+        dead = ", ".join(f"{a:.1f}°" for a in motion["dead_points"])
+        messages.append(f"Warnung: Die Kurbel kann nicht vollständig umlaufen. Zulässige Kurbelwinkel: {ranges}; "
+                        f"Totlagen bei {dead}. Die Animation schwingt zwischen den Totlagen.")
+    return messages
+
+
+def crank_sweep(motion: dict, num_frames: int):
+    """
+    Kurbelwinkel für eine Animation, die nur den zulässigen Bereich überstreicht.
+
+    Bei umlauffähiger Kurbel ein voller Umlauf, sonst schwingt die Kurbel im Intervall der
+    Ausgangslage hin und zurück. Beim Rückweg wechselt der Zweig des Koppelpunkts
+    (Durchschlag durch die Totlage), daher wird ein Vorzeichen je Frame mitgegeben.
+
+    :return: (theta, branch) mit branch = +1 auf dem Hinweg und -1 auf dem Rückweg
+    """
+    if motion["full_rotation"]:
+        theta = 360.0 * np.arange(num_frames) / num_frames
+        return theta, np.ones(num_frames)
+    if motion["current_interval"] is None:
+        return np.empty(0), np.empty(0)
+    a, b = motion["current_interval"]
+    a, b = a + DEAD_POINT_EPS, b - DEAD_POINT_EPS
+    half = num_frames // 2
+    forward = np.linspace(a, b, half)
+    backward = np.linspace(b, a, num_frames - half)
+    theta = np.concatenate([forward, backward])
+    branch = np.concatenate([np.ones(half), -np.ones(num_frames - half)])
+    return theta, branch
+
+
+def crank_motion(center, crank_point, omega, alpha=0.0):
+    """
+    Geschwindigkeit und Beschleunigung eines Kurbelpunkts bei Drehung um center
+    mit Winkelgeschwindigkeit omega und Winkelbeschleunigung alpha (rad/s, rad/s^2).
+    """
+    r = np.asarray(crank_point, dtype=float) - np.asarray(center, dtype=float)
+    omega = np.asarray(omega, dtype=float)[..., None]
+    alpha = np.asarray(alpha, dtype=float)[..., None]
+    perp = np.stack([-r[..., 1], r[..., 0]], axis=-1)
+    return omega * perp, alpha * perp - omega**2 * r
+
+
+def _solve_rows(a1, a2, b1, b2):
+    """Löst [a1; a2] x = [b1; b2] elementweise mit der Cramerschen Regel (NaN/inf in Totlagen statt Abbruch)."""
+    det = a1[..., 0] * a2[..., 1] - a1[..., 1] * a2[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = (b1 * a2[..., 1] - b2 * a1[..., 1]) / det
+        y = (a1[..., 0] * b2 - a2[..., 0] * b1) / det
+    return np.stack([x, y], axis=-1)
+
+
+def dyad_velocity(p, c1, c2, v1, v2):
+    """
+    Geschwindigkeit eines Dyadenpunkts p aus den Geschwindigkeiten der Kreismittelpunkte
+    (Zeitableitung von |p - c1|^2 = r1^2 und |p - c2|^2 = r2^2). Alle Arrays haben die Form (..., 2).
+    """
+    a1, a2 = p - c1, p - c2
+    return _solve_rows(a1, a2, (a1 * v1).sum(axis=-1), (a2 * v2).sum(axis=-1))
+
+
+def dyad_acceleration(p, c1, c2, v, v1, v2, acc1, acc2):
+    """Beschleunigung eines Dyadenpunkts (zweite Zeitableitung der Dyadengleichungen, v = Geschwindigkeit von p)."""
+    a1, a2 = p - c1, p - c2
+    return _solve_rows(
+        a1, a2,
+        (a1 * acc1).sum(axis=-1) - ((v - v1)**2).sum(axis=-1),
+        (a2 * acc2).sum(axis=-1) - ((v - v2)**2).sum(axis=-1),
+    )
+
+
+def coupler_frame(p1, p2):
+    """Mitbewegtes Koordinatensystem der Koppel: Ursprung p1, u entlang p1 -> p2, v senkrecht dazu (..., 2)."""
+    d = np.asarray(p2, dtype=float) - np.asarray(p1, dtype=float)
+    u = d / np.linalg.norm(d, axis=-1, keepdims=True)
+    v = np.stack([-u[..., 1], u[..., 0]], axis=-1)
+    return u, v
+
+
+def tracer_local(points, tracer) -> np.ndarray:
+    """
+    Lage eines Koppelpunkts in Koppelkoordinaten (s, t) aus der Ausgangslage:
+    s entlang p1 -> p2, t senkrecht dazu, beide in Vielfachen der Koppellänge (p1 = (0, 0), p2 = (1, 0)).
+    """
+    p1, p2 = np.asarray(points["p1"], dtype=float), np.asarray(points["p2"], dtype=float)
+    u, v = coupler_frame(p1, p2)
+    d = (np.asarray(tracer, dtype=float) - p1) / np.linalg.norm(p2 - p1)
+    return np.stack([d @ u, d @ v], axis=-1)
+
+
+def tracer_global(p1, p2, local) -> np.ndarray:
+    """
+    Koppelpunkte (..., Punkte, 2) für Koppellagen p1, p2 (..., 2) und Koppelkoordinaten local (Punkte, 2),
+    alle Punkte und Lagen in einer Array-Operation.
+    """
+    p1, p2 = np.asarray(p1, dtype=float), np.asarray(p2, dtype=float)
+    u, v = coupler_frame(p1, p2)
+    length = np.linalg.norm(p2 - p1, axis=-1, keepdims=True)
+    local = np.asarray(local, dtype=float)
+    # (..., 1, 2) + s * (..., 1, 2) + t * (..., 1, 2) -> (..., Punkte, 2)
+    return (p1[..., None, :]
+            + local[:, :1] * (length * u)[..., None, :]
+            + local[:, 1:] * (length * v)[..., None, :])
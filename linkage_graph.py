@@ -0,0 +1,201 @@
+import numpy as np
+import scipy.sparse as sp
+
+
+class LinkageGraph:
+    """
+    Dünnbesetzte Inzidenzmatrix eines beliebigen Stabsystems.
+
+    Aus einer Kantenliste [(start, ende), ...] wird die Inzidenzmatrix B (Stäbe x Gelenke)
+    mit +1 beim Start- und -1 beim Endgelenk aufgebaut. Die Koordinatenmatrix
+    A = B ⊗ I2 (2*Stäbe x 2*Gelenke) liefert mit A @ x alle Stabvektoren auf einmal
+    (gleiche Anordnung wie build_matrix_4bars). Speicherbedarf und Aufwand wachsen
+    nur linear mit der Anzahl der Stäbe, auch bei Mechanismen mit hunderten Gelenken.
+    """
+    def __init__(self, edges: list, joints: list = None):
+        self.edges = [tuple(e) for e in edges]
+        if joints is None:
+            joints = dict.fromkeys(label for edge in self.edges for label in edge)
+        self.joints = list(joints)
+        self.index = {label: i for i, label in enumerate(self.joints)}
+
+        self.start = np.array([self.index[a] for a, _ in self.edges], dtype=int)
+        self.end = np.array([self.index[b] for _, b in self.edges], dtype=int)
+        E, J = len(self.edges), len(self.joints)
+        rows = np.repeat(np.arange(E), 2)
+        cols = np.column_stack([self.start, self.end]).ravel()
+        vals = np.tile([1.0, -1.0], E)
+        self.incidence = sp.csr_matrix((vals, (rows, cols)), shape=(E, J))
+        self.coordinate_matrix = sp.kron(self.incidence, sp.identity(2), format="csr")
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.edges)
+
+    @property
+    def num_joints(self) -> int:
+        return len(self.joints)
+
+    def positions_array(self, positions: dict) -> np.ndarray:
+        """Wandelt ein Dictionary {Gelenk: (x, y) oder (..., 2)} in ein Array (..., Gelenke, 2) um."""
+        return np.stack([np.asarray(positions[label], dtype=float) for label in self.joints], axis=-2)
+
+    def bar_vectors(self, positions) -> np.ndarray:
+        """
+        Stabvektoren (Start - Ende) für eine Lage (Gelenke, 2) oder viele Lagen (..., Gelenke, 2).
+        Für viele Frames wird nur ein dünnbesetztes Matrixprodukt ausgeführt.
+        """
+        if isinstance(positions, dict):
+            positions = self.positions_array(positions)
+        positions = np.asarray(positions, dtype=float)
+        batch = positions.shape[:-2]
+        flat = np.moveaxis(positions.reshape((-1,) + positions.shape[-2:]), 0, 1)  # (Gelenke, N, 2)
+        vectors = self.incidence @ flat.reshape(self.num_joints, -1)               # (Stäbe, N*2)
+        vectors = np.moveaxis(vectors.reshape(self.num_edges, -1, 2), 1, 0)
+        return vectors.reshape(batch + (self.num_edges, 2))
+
+    def bar_lengths(self, positions) -> np.ndarray:
+        return np.linalg.norm(self.bar_vectors(positions), axis=-1)
+
+    def residuals(self, positions, rest_lengths) -> np.ndarray:
+        """Abweichung der aktuellen Stablängen von den Solllängen (..., Stäbe)."""
+        return self.bar_lengths(positions) - np.asarray(rest_lengths, dtype=float)
+
+    def free_columns(self, free_joints):
+        """
+        Spalte jedes Gelenks unter den freien Gelenken (-1 für nicht freie) und die Anzahl freier Gelenke,
+        z. B. um Koordinatenvektoren freier Gelenke auf die Gelenkreihenfolge abzubilden.
+        """
+        if free_joints is None:
+            free_joints = self.joints
+        free_index = {label: i for i, label in enumerate(free_joints)}
+        column = np.array([free_index.get(label, -1) for label in self.joints])
+        return column, len(free_joints)
+
+    def _jacobian_entries(self, free_joints, units=None):
+        column, F = self.free_columns(free_joints)
+        edge_ids = np.arange(self.num_edges)
+        rows, cols, vals = [], [], []
+        for joints, sign in ((self.start, 1.0), (self.end, -1.0)):
+            free = column[joints] >= 0
+            c = column[joints[free]]
+            rows.append(np.repeat(edge_ids[free], 2))
+            cols.append(np.column_stack([2 * c, 2 * c + 1]).ravel())
+            if units is not None:
+                vals.append(sign * units[free].ravel())
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        vals = np.concatenate(vals) if units is not None else np.ones(len(rows), dtype=bool)
+        return sp.csr_matrix((vals, (rows, cols)), shape=(self.num_edges, 2 * F))
+
+    def jacobian_sparsity(self, free_joints=None) -> sp.csr_matrix:
+        """Besetzungsmuster der Jacobi-Matrix der Residuen nach den freien Koordinaten (Stäbe x 2*frei)."""
+        return self._jacobian_entries(free_joints)
+
+    def jacobian(self, positions, free_joints=None) -> sp.csr_matrix:
+        """
+        Jacobi-Matrix der Längenresiduen nach den Koordinaten der freien Gelenke
+        (Einheitsvektor des Stabs beim Start-, negativ beim Endgelenk).
+        """
+        return self._jacobian_entries(free_joints, self.unit_vectors(positions))
+
+    def rate_system(self, positions, free_joints):
+        """
+        Gebündelte Koeffizientenmatrix der zeitlich abgeleiteten Stabbedingungen
+        d/dt |p_start - p_end|^2 = 0 nach den freien Geschwindigkeiten (..., Stäbe, 2*frei).
+        Stäbe ohne freies Gelenk (z. B. Kurbel am Gestell) werden weggelassen.
+
+        :return: (Stabvektoren D (..., Stäbe, 2), Koeffizientenmatrix, Maske der verwendeten Stäbe,
+                 Spalten aus free_columns, Anzahl freier Gelenke)
+        """
+        column, F = self.free_columns(free_joints)
+        D = self.bar_vectors(positions)
+        M = np.zeros(D.shape[:-2] + (self.num_edges, F, 2))
+        edge_ids = np.arange(self.num_edges)
+        for joints, sign in ((self.start, 1.0), (self.end, -1.0)):
+            free = column[joints] >= 0
+            M[..., edge_ids[free], column[joints[free]], :] += sign * D[..., free, :]
+        rows = (column[self.start] >= 0) | (column[self.end] >= 0)
+        return D, M.reshape(M.shape[:-2] + (2 * F,))[..., rows, :], rows, column, F
+
+    @staticmethod
+    def _batched_solve(M, rhs):
+        """Löst quadratische Systeme direkt, überbestimmte (redundante Stäbe) über die Normalgleichungen."""
+        if M.shape[-2] != M.shape[-1]:
+            Mt = np.swapaxes(M, -1, -2)
+            M, rhs = Mt @ M, (Mt @ rhs[..., None])[..., 0]
+        return np.linalg.solve(M, rhs[..., None])[..., 0]
+
+    def solve_velocities(self, positions, velocities, free_joints) -> np.ndarray:
+        """
+        Geschwindigkeiten der freien Gelenke aus den vorgegebenen (festen, angetriebenen) Geschwindigkeiten.
+        Für alle Lagen (..., Gelenke, 2) wird ein gebündeltes lineares System gelöst.
+
+        :param velocities: (..., Gelenke, 2), Einträge freier Gelenke werden ignoriert
+        :return: vollständige Geschwindigkeiten (..., Gelenke, 2)
+        """
+        D, M, rows, column, F = self.rate_system(positions, free_joints)
+        known = np.where((column >= 0)[:, None], 0.0, np.asarray(velocities, dtype=float))
+        dv = self.bar_vectors(known)
+        rhs = -(D * dv).sum(axis=-1)[..., rows]
+        free = self._batched_solve(M, rhs).reshape(rhs.shape[:-1] + (F, 2))
+        return self._fill_free(known, free, column)
+
+    def solve_accelerations(self, positions, velocities, accelerations, free_joints) -> np.ndarray:
+        """
+        Beschleunigungen der freien Gelenke aus der zweiten Zeitableitung der Stabbedingungen
+        (D . dA + |dV|^2 = 0). velocities muss vollständig sein (z. B. aus solve_velocities).
+        """
+        D, M, rows, column, F = self.rate_system(positions, free_joints)
+        known = np.where((column >= 0)[:, None], 0.0, np.asarray(accelerations, dtype=float))
+        da = self.bar_vectors(known)
+        dv = self.bar_vectors(velocities)
+        rhs = -((D * da).sum(axis=-1) + (dv**2).sum(axis=-1))[..., rows]
+        free = self._batched_solve(M, rhs).reshape(rhs.shape[:-1] + (F, 2))
+        return self._fill_free(known, free, column)
+
+    def equilibrium_forces(self, positions, loads, free_joints) -> np.ndarray:
+        """
+        Stabkräfte (Zug positiv) im statischen Gleichgewicht unter äußeren Lasten an den freien Gelenken.
+        Gleichgewicht je freiem Gelenk: Summe der Stabkräfte + Last = 0, d. h. R^T q = f mit der
+        transponierten Koeffizientenmatrix R der Stabbedingungen und Kraftdichten q = Kraft / Länge.
+        Alle Lagen werden gebündelt gelöst; statisch unbestimmte Systeme liefern die Lösung kleinster Norm.
+
+        :param loads: (..., Gelenke, 2), Lasten an nicht freien Gelenken werden vom Gestell bzw. Antrieb aufgenommen
+        :return: Stabkräfte (..., Stäbe), null für Stäbe ohne freies Gelenk
+        """
+        D, M, rows, column, F = self.rate_system(positions, free_joints)
+        f = np.asarray(loads, dtype=float)[..., column >= 0, :]
+        order = np.argsort(column[column >= 0])
+        f = f[..., order, :].reshape(f.shape[:-2] + (2 * F,))
+        Mt = np.swapaxes(M, -1, -2)
+        if M.shape[-2] == M.shape[-1]:
+            q = np.linalg.solve(Mt, f[..., None])[..., 0]
+        else:
+            q = (M @ np.linalg.solve(Mt @ M, f[..., None]))[..., 0]
+        forces = np.zeros(D.shape[:-1])
+        forces[..., rows] = q * np.linalg.norm(D[..., rows, :], axis=-1)
+        return forces
+
+    @staticmethod
+    def _fill_free(known, free, column):
+        result = np.array(known, dtype=float)
+        mask = column >= 0
+        result[..., mask, :] = free[..., column[mask], :]
+        return result
+
+    def unit_vectors(self, positions) -> np.ndarray:
+        """Einheitsvektoren aller Stäbe (..., Stäbe, 2), z. B. für gebündelte Jacobi-Matrizen."""
+        vectors = self.bar_vectors(positions)
+        return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+    def bill_of_materials(self, positions) -> dict:
+        """Stückliste: Anzahl der Gelenke und Stäbe sowie die Länge jedes Stabs."""
+        lengths = self.bar_lengths(positions)
+        return {
+            "Anzahl der Gelenke": self.num_joints,
+            "Anzahl der Stangen": self.num_edges,
+            "Laengen der Stangen": {
+                f"Stange {i + 1} ({a} -> {b})": float(length)
+                for i, ((a, b), length) in enumerate(zip(self.edges, lengths))
+            },
+        }
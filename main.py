@@ -6,10 +6,27 @@ import io
 import matplotlib.pyplot as plt
 from crank_rod import animate_crank_kinematics
 from strandbeest import animate_strandbeest
-from advanced_strandbeest import animate_strandbeest_full
+from advanced_strandbeest import animate_strandbeest_full, default_simulator, compare_solver_backends, plot_cycle_analysis
 from slider_crank import animate_slider_crank
-from crank_rod import compute_crank_rod_length_errors, plot_crank_rod_length_errors
+from crank_rod import compute_crank_rod_length_errors, plot_crank_rod_length_errors, compute_crank_rod_transmission, compute_crank_rod_motion
+from slider_crank import slider_crank_motion
 from datenblatt import save_mechanism_data
+from four_bar import check_loop_closure, plot_transmission_analysis, transmission_summary, plot_motion_profiles
+from jansen_optimization import optimize_jansen, plot_foot_paths, SimulatorObjective
+from jansen_sensitivity import refine_designs
+from surrogate import active_learning, ScreenedObjective
+from tolerance_analysis import crank_rod_tolerance, jansen_tolerance, plot_tolerance_analysis
+from four_bar_atlas import FourBarAtlas
+from coupler_atlas import CouplerCurveAtlas
+from path_library import PathLibrary, build_library, LIBRARY_FILE
+from path_synthesis import synthesize_four_bar
+from trajectory_fourier import fit_trajectories, save_fourier_trajectories, load_fourier_trajectories
+from statics import crank_torque, torque_summary, plot_crank_torque
+from dynamics import JansenDynamics, dc_motor_curve, plot_dynamics
+from walker import animate_walker, walker_collisions
+from collision import collision_summary
+from gait import animate_gait, walker_gait, gait_summary, make_terrain, TERRAIN_KINDS
+from files.calculation_strandbeest import calculate_strandbeest
 
 
 def save_gif(gif_buffer, filename_gif):
@@ -47,9 +64,35 @@ def save_trajectory(trajectory, trajectory_p1, filename):
     except Exception as e:
         st.error(f"Fehler beim Speichern der Bahnkurve: {e}")
 
-def load_trajectory(filename):
-    """Lädt eine gespeicherte Bahnkurve aus einer CSV-Datei."""
+def save_trajectory_fourier(trajectory, trajectory_p1, filename):
+    """Speichert die Bahnkurven nur als Fourier-Koeffizienten (JSON) mit Fehlerschranke."""
+    fitted = fit_trajectories({"p1": trajectory or [], "p2": trajectory_p1 or []})
+    if not fitted:
+        st.error("Fehler: Die Bahnkurve enthält keine Daten.")
+        return
+    try:
+        save_fourier_trajectories(fitted, filename)
+        bounds = ", ".join(f"{name}: {series.num_harmonics} Harmonische, Fehler < {series.error_bound:.1e}"
+                           for name, series in fitted.items())
+        st.success(f"Fourier-Bahnkurve gespeichert als {filename} ({bounds})")
+    except Exception as e:
+        st.error(f"Fehler beim Speichern der Fourier-Bahnkurve: {e}")
+
+def load_trajectory(filename, num_points=360):
+    """Lädt eine gespeicherte Bahnkurve aus einer CSV-Datei oder einer Fourier-Datei (.json)."""
     trajectory, trajectory_p1 = [], []
+    if filename.endswith(".json"):
+        try:
+            fitted = load_fourier_trajectories(filename)
+            # gleiche Zuordnung wie beim Lesen der CSV-Dateien
+            trajectory = fitted["p2"].resample(num_points).tolist() if "p2" in fitted else []
+            trajectory_p1 = fitted["p1"].resample(num_points).tolist() if "p1" in fitted else []
+            if not trajectory:
+                trajectory, trajectory_p1 = trajectory_p1, []
+            return trajectory, trajectory_p1
+        except Exception as e:
+            st.error(f"Fehler beim Laden der Bahnkurve: {e}")
+            return None, None
     try:
         with open(filename, newline="") as csvfile:
             reader = csv.reader(csvfile)
@@ -65,13 +108,84 @@ def load_trajectory(filename):
         st.error(f"Fehler beim Laden der Bahnkurve: {e}")
         return None, None        
 
+@st.cache_resource
+def load_four_bar_atlas():
+    """Der Atlas wird nur einmal pro Sitzung berechnet."""
+    return FourBarAtlas()
+
+def show_atlas_position(points):
+    """Zeigt, wo der eingegebene Entwurf im Grashof-Atlas liegt."""
+    atlas = load_four_bar_atlas()
+    info = atlas.query_points(points)
+    ratios = info["ratios"]
+    st.write(f"Grashof-Klasse: {info['grashof_class']}, Kurbel umlauffähig: {'ja' if info['rotatable'] else 'nein'}, "
+             f"kleinster Übertragungswinkel: {info['min_transmission']:.1f}°")
+    if not info["inside_atlas"]:
+        st.warning("Die Längenverhältnisse liegen außerhalb des Atlas, die Markierung liegt am Rand.")
+    st.pyplot(atlas.plot_slice(ratios["L2/L3"], marker=(ratios["L0/L3"], ratios["L1/L3"])))
+
+@st.cache_resource
+def load_coupler_atlas(p0, p1, p2, p3):
+    """Koppelkurven-Atlas je Entwurf nur einmal berechnen (Punkte als Tupel, damit sie hashbar sind)."""
+    return CouplerCurveAtlas({"p0": np.array(p0), "p1": np.array(p1), "p2": np.array(p2), "p3": np.array(p3)})
+
+def show_coupler_atlas(points):
+    """Auswahl eines Koppelpunkts aus dem Atlas; gibt die Punkte mit dem gewählten Koppelpunkt zurück."""
+    atlas = load_coupler_atlas(*(tuple(points[k]) for k in ("p0", "p1", "p2", "p3")))
+    if len(atlas.theta) == 0:
+        st.error("Fehler: Für diesen Entwurf gibt es keine gültige Lage.")
+        return points
+    i_s = st.select_slider("Koppelpunkt entlang der Koppel (s)", options=range(len(atlas.s)),
+                           value=len(atlas.s) // 2, format_func=lambda i: f"{atlas.s[i]:.2f}")
+    i_t = st.select_slider("Koppelpunkt senkrecht zur Koppel (t)", options=range(len(atlas.t)),
+                           value=len(atlas.t) // 2, format_func=lambda i: f"{atlas.t[i]:.2f}")
+    selected = atlas.index(i_s, i_t)
+    fig = atlas.plot(selected)
+    st.pyplot(fig)
+    plt.close(fig)
+    if st.checkbox("Gewählten Koppelpunkt in der Animation mitführen"):
+        return atlas.points_with_tracer(selected)
+    return points
+
+@st.cache_data
+def load_gait_summary(n_legs, spacing, mirror, terrain_kind, num_cycles):
+    """Gangauswertung je Einstellung nur einmal berechnen (Gelände über seinen Namen, damit hashbar)."""
+    _, gait = walker_gait(n_legs, spacing, mirror, make_terrain(terrain_kind, seed=0), num_cycles)
+    return gait_summary(gait)
+
+@st.cache_resource
+def load_path_library():
+    """Lädt die Bahnkurven-Bibliothek, beim ersten Aufruf wird sie offline aufgebaut und gespeichert."""
+    if os.path.exists(LIBRARY_FILE):
+        return PathLibrary.load(LIBRARY_FILE)
+    return build_library(LIBRARY_FILE)
+
+def show_path_matches(trajectory, k=5):
+    """Sucht die ähnlichsten Viergelenke zu einer Bahnkurve und zeichnet deren angepasste Koppelkurven."""
+    matches = load_path_library().query(trajectory, k)
+    st.table([{"Rang": i + 1, "Abstand": m["distance"], "Passfehler": m["fit_error"], **m["params"]}
+              for i, m in enumerate(matches)])
+    fig, ax = plt.subplots()
+    ax.plot(*zip(*trajectory), "k-", lw=2, label="Bahnkurve")
+    for i, m in enumerate(matches):
+        ax.plot(m["curve"][:, 0], m["curve"][:, 1], "--", lw=1, label=f"Entwurf {i + 1}")
+    best = matches[0]["points"]
+    ax.plot(*np.array([best["p0"], best["p1"], best["p2"], best["p3"]]).T, "r-o", lw=1.5, label="bester Entwurf")
+    ax.set_aspect("equal", adjustable="datalim")
+    ax.grid(True)
+    ax.legend()
+    st.pyplot(fig)
+    plt.close(fig)
+    return matches
+
 def main():
     st.title("Ebene Mechanismen")
 
     choice = st.radio(
         "Welches Modell wollen Sie wählen?",
         ["Ebener Mechanismus", "Schubkurbel-Mechanismus", 
-         "Strandbeest", "Advanced-Strandbeest", "Gespeicherte Bahnkurven anzeigen", "Gespeicherte Animationen anzeigen","Längenfehler-Analyse"]
+         "Strandbeest", "Advanced-Strandbeest", "N-Bein Strandbeest", "Gespeicherte Bahnkurven anzeigen", "Gespeicherte Animationen anzeigen","Längenfehler-Analyse",
+         "Jansen-Optimierung"]
     )
 
     if choice in ("Ebener Mechanismus", "Schubkurbel-Mechanismus"):
@@ -94,6 +208,8 @@ def main():
                 "p2": np.array([p2_x, p2_y]),
                 "p3": np.array([p3_x, p3_y])
             }
+            if choice == "Ebener Mechanismus" and st.checkbox("Lage im Grashof-Atlas anzeigen"):
+                show_atlas_position(points)
         else:
             points = {
                 "p0": np.array([0.0, 0.0]),
@@ -105,6 +221,9 @@ def main():
         show_path = False
         points = None  
         
+    if choice == "Ebener Mechanismus" and st.checkbox("Koppelkurven-Atlas anzeigen"):
+        points = show_coupler_atlas(points)
+
     animation_func = None
     if choice == "Ebener Mechanismus":
         animation_func = lambda: animate_crank_kinematics(points, show_path)
@@ -112,19 +231,50 @@ def main():
         animation_func = lambda: animate_slider_crank(show_path)    
     elif choice == "Strandbeest":
         animation_func = lambda: animate_strandbeest(np.array([0.0, 0.0]))
+        if st.checkbox("Fußbahnen des vollständigen Beins anzeigen"):
+            leg = calculate_strandbeest(np.linspace(0, 2 * np.pi, 360)).positions(["H", "H2", "HH", "HH2"])
+            fig, ax = plt.subplots(figsize=(8, 4))
+            for joint in leg.dtype.names:
+                ax.plot(leg[joint][:, 0], leg[joint][:, 1], label=joint)
+            ax.set_aspect("equal", adjustable="datalim")
+            ax.grid(True)
+            ax.legend()
+            st.pyplot(fig)
+            plt.close(fig)
     elif choice == "Advanced-Strandbeest":
         animation_func = lambda: animate_strandbeest_full(np.array([0.0, 0.0]))
+        if st.checkbox("Kollisionsprüfung der Stäbe"):
+            for message in collision_summary(default_simulator().collision_check(np.linspace(0, 360, 73))):
+                st.write(message)
+    elif choice == "N-Bein Strandbeest":
+        n_legs = st.slider("Anzahl der Beine", 1, 12, 4)
+        spacing = st.slider("Abstand der Beinpaare", 0.0, 40.0, 8.0)
+        mirror = st.checkbox("Beinpaare spiegeln", value=True)
+        walker_path = st.checkbox("Mit Bahnkurve der Füße")
+        animation_func = lambda: animate_walker(n_legs, spacing, mirror, walker_path)
+        if st.checkbox("Kollisionsprüfung der Beine"):
+            clearance = st.number_input("Mindestabstand der Stäbe", min_value=0.0, value=0.0, step=0.1)
+            for message in collision_summary(walker_collisions(n_legs, spacing, mirror, clearance)):
+                st.write(message)
+        if st.checkbox("Über den Boden laufen lassen"):
+            terrain_kind = st.selectbox("Gelände", TERRAIN_KINDS)
+            num_cycles = st.slider("Kurbelumdrehungen", 1, 5, 2)
+            terrain = make_terrain(terrain_kind, seed=0)
+            st.write(load_gait_summary(n_legs, spacing, mirror, terrain_kind, num_cycles))
+            animation_func = lambda: animate_gait(n_legs, spacing, mirror, terrain, num_cycles)
         
     
-    if choice not in ["Gespeicherte Bahnkurven anzeigen", "Gespeicherte Animationen anzeigen", "Längenfehler-Analyse"]:
+    if choice not in ["Gespeicherte Bahnkurven anzeigen", "Gespeicherte Animationen anzeigen", "Längenfehler-Analyse",
+                      "Jansen-Optimierung"]:
         
      filename_gif = st.text_input("Gib den Dateinamen für die GIF-Animation ein (mit .gif):", "animation.gif")   
-     if choice not in ["Strandbeest", "Advanced-Strandbeest"]:  
+     if choice not in ["Strandbeest", "Advanced-Strandbeest", "N-Bein Strandbeest"]:  
       filename_traj = st.text_input("Gib den Dateinamen für die Bahnkurve ein (mit .csv):", "bahnkurve.csv")
                                     
      save_gif_checkbox = st.checkbox("GIF speichern")
-     save_traj_checkbox = st.checkbox("Bahnkurve speichern") if choice not in ["Strandbeest", "Advanced-Strandbeest"] else False
-     save_data_checkbox = st.checkbox("Stückliste speichern") if choice not in ["Strandbeest", "Advanced-Strandbeest"] else False
+     save_traj_checkbox = st.checkbox("Bahnkurve speichern") if choice not in ["Strandbeest", "Advanced-Strandbeest", "N-Bein Strandbeest"] else False
+     save_fourier_checkbox = st.checkbox("Zusätzlich als Fourier-Reihe speichern (kompakt)") if save_traj_checkbox else False
+     save_data_checkbox = st.checkbox("Stückliste speichern") if choice not in ["Strandbeest", "Advanced-Strandbeest", "N-Bein Strandbeest"] else False
      
     if animation_func and st.button("Simulation starten"):  
             
@@ -141,7 +291,13 @@ def main():
               save_gif(gif_buffer, filename_gif)
 
             if save_traj_checkbox and show_path and (trajectory or trajectory_p1):
+              if choice == "Ebener Mechanismus":
+                  closure = check_loop_closure(points, np.array(trajectory), np.array(trajectory_p1))
+                  if not closure["ok"]:
+                      st.warning(f"Warnung: Bahnkurve verletzt den Schleifenschluss (max. Abweichung {closure['max_violation']:.2e}).")
               save_trajectory(trajectory, trajectory_p1, filename_traj)
+              if save_fourier_checkbox:
+                  save_trajectory_fourier(trajectory, trajectory_p1, os.path.splitext(filename_traj)[0] + "_fourier.json")
             
             if save_data_checkbox:
                 save_mechanism_data(points, filename="mechanism_data.json")  
@@ -160,7 +316,7 @@ def main():
             st.warning("Keine gespeicherten Animationen gefunden.")
 
     elif choice == "Gespeicherte Bahnkurven anzeigen":
-        files = [f for f in os.listdir() if f.endswith(".csv")]
+        files = [f for f in os.listdir() if f.endswith(".csv") or f.endswith("_fourier.json")]
         if files:
             selected_file = st.selectbox("Wähle eine gespeicherte Bahnkurve", files)
             if st.button("Bahnkurve anzeigen"):
@@ -176,6 +332,38 @@ def main():
                     st.pyplot(fig)
                 else:
                     st.error("Die Datei enthält ungültige Daten.")
+            if st.checkbox("Passende Viergelenke aus der Bibliothek suchen"):
+                trajectory, trajectory_p1 = load_trajectory(selected_file)
+                target = trajectory or trajectory_p1
+                if target and len(target) >= 3:
+                    show_path_matches(target)
+                else:
+                    st.error("Die Datei enthält ungültige Daten.")
+            if st.checkbox("Viergelenk für diese Bahnkurve synthetisieren"):
+                n_starts = st.slider("Anzahl der Starts", 8, 256, 64)
+                closed = st.checkbox("Geschlossene Zielkurve", value=True)
+                if st.button("Synthese starten"):
+                    trajectory, trajectory_p1 = load_trajectory(selected_file)
+                    target = trajectory or trajectory_p1
+                    if not target or len(target) < 3:
+                        st.error("Die Datei enthält ungültige Daten.")
+                    else:
+                        # Treffer der Bibliothek (falls vorhanden) als zusätzliche Starts
+                        initial = [m["points"] for m in load_path_library().query(target, 5)] if os.path.exists(LIBRARY_FILE) else []
+                        designs = synthesize_four_bar(target, n_starts=n_starts, closed=closed, initial_points=initial)
+                        best = designs[0]
+                        if best["rms_target_to_curve"] is None:
+                            st.warning("Die Kurbel des besten Entwurfs läuft nicht voll um.")
+                        else:
+                            st.write(f"Bester Entwurf: RMS-Abstand Zielpunkte zur Kurve {best['rms_target_to_curve']:.3f}"
+                                     + (f", Kurve zu den Zielpunkten {best['rms_curve_to_target']:.3f}" if closed else ""))
+                        st.table([{"Entwurf": i + 1, "RMS Ziel → Kurve": d["rms_target_to_curve"],
+                                   "RMS Kurve → Ziel": d["rms_curve_to_target"],
+                                   **{k: f"({p[0]:.2f}, {p[1]:.2f})" for k, p in d["points"].items()}}
+                                  for i, d in enumerate(designs)])
+                        result = animate_crank_kinematics(best["points"], True)
+                        if result[0] is not None:
+                            st.image(result[0], caption="Synthetisiertes Viergelenk")
         else:
             st.warning("Keine gespeicherten Bahnkurven gefunden.") 
                         
@@ -188,9 +376,112 @@ def main():
             "p2": np.array([40.0, 30.0]),
             "p3": np.array([50.0, 0.0])
         }
+        num_angles = st.select_slider("Auflösung (Anzahl Winkel)", options=[180, 1000, 10000, 100000, 1000000], value=180)
         if st.button("Fehler plotten"):
-            fig = plot_crank_rod_length_errors(points)
+            errors = compute_crank_rod_length_errors(points, num_angles=num_angles)
+            fig = plot_crank_rod_length_errors(points, errors=errors)
             st.pyplot(fig)        
+            st.write({link: float(np.abs(errors[link]).max()) for link in errors.dtype.names[1:]})
+            transmission = compute_crank_rod_transmission(points, num_angles=num_angles)
+            st.pyplot(plot_transmission_analysis(transmission))
+            summary = transmission_summary(transmission)
+            st.write(f"Kleinster Übertragungswinkel (Abstand zu 0°/180°): {summary['min_transmission']:.1f}° "
+                     f"bei Theta = {summary['theta_min_transmission']:.1f}°, kleinster mechanischer Vorteil: "
+                     f"{summary['min_mechanical_advantage']:.2f} bei Theta = {summary['theta_min_mechanical_advantage']:.1f}°")
+
+        st.subheader("Geschwindigkeit und Beschleunigung")
+        motion_model = st.radio("Mechanismus für die Geschwindigkeitsanalyse", ["Ebener Mechanismus", "Schubkurbel-Mechanismus", "Advanced-Strandbeest"])
+        rpm = st.number_input("Kurbeldrehzahl (U/min)", value=60.0, min_value=0.0, step=10.0)
+        if st.button("Geschwindigkeiten berechnen"):
+            omega = rpm * 2 * np.pi / 60
+            if motion_model == "Ebener Mechanismus":
+                motion = compute_crank_rod_motion(points, num_angles=num_angles, omega=omega)
+                fig = plot_motion_profiles(motion["theta"], motion["v_p2"], motion["a_p2"], title="Koppelpunkt p2")
+            elif motion_model == "Schubkurbel-Mechanismus":
+                motion = slider_crank_motion(np.linspace(0, 360, num_angles), omega)
+                fig = plot_motion_profiles(motion["theta"], motion["v"], motion["a"], title="Kolben")
+            else:
+                motion = default_simulator().motion_analysis(np.arange(0, 360, 2.0), omega)
+                s_index = motion["joints"].index("S")
+                fig = plot_motion_profiles(motion["theta"], motion["velocities"][:, s_index],
+                                           motion["accelerations"][:, s_index], title="Fußpunkt S")
+            st.pyplot(fig)
+
+        st.subheader("Solver-Analyse Advanced-Strandbeest")
+        step = st.slider("Winkelschritt (Grad)", 1, 10, 2)
+        if st.button("Residuen analysieren"):
+            angles = np.arange(0, 360, step)
+            analysis, _ = default_simulator().analyze_cycle(angles)
+            st.pyplot(plot_cycle_analysis(analysis))
+            st.table(compare_solver_backends(angles))
+
+        st.subheader("Antriebsmoment Advanced-Strandbeest")
+        load = st.number_input("Senkrechte Last am Fußpunkt S (N)", value=100.0, min_value=0.0, step=10.0)
+        if st.button("Antriebsmoment berechnen"):
+            simulator = default_simulator()
+            result, forces = crank_torque(load=load, simulator=simulator)
+            st.pyplot(plot_crank_torque(result, forces, simulator.edges))
+            summary = torque_summary(result)
+            st.write(f"Spitzenmoment: {summary['peak_torque']:.1f} bei Theta = {summary['theta_peak']:.1f}°, "
+                     f"RMS: {summary['rms_torque']:.1f}, größte Stabkraft: {summary['max_bar_force']:.1f}")
+
+        st.subheader("Dynamik Advanced-Strandbeest")
+        stall_torque = st.number_input("Anhaltemoment des Motors", value=2e5, min_value=0.0, step=1e4, format="%.0f")
+        no_load_rpm = st.number_input("Leerlaufdrehzahl (U/min)", value=120.0, min_value=1.0, step=10.0)
+        duration = st.slider("Simulationsdauer (s)", 1, 20, 10)
+        if st.button("Dynamik simulieren"):
+            motor = dc_motor_curve(stall_torque, no_load_rpm * 2 * np.pi / 60)
+            try:
+                result = JansenDynamics(motor=motor).simulate(float(duration))
+                st.pyplot(plot_dynamics(result))
+                st.write(f"Enddrehzahl: {result['omega'][-1] * 60 / (2 * np.pi):.1f} U/min, "
+                         f"größte Stablängenabweichung: {result['max_length_error'].max():.2e}")
+            except RuntimeError as e:
+                st.error(f"Fehler bei der Simulation: {e}")
+
+        st.subheader("Toleranzanalyse (Monte-Carlo)")
+        tol_model = st.radio("Mechanismus", ["Ebener Mechanismus", "Advanced-Strandbeest"])
+        tolerance = st.number_input("Fertigungstoleranz ± je Stab", value=0.5 if tol_model == "Ebener Mechanismus" else 0.1,
+                                    min_value=0.0, step=0.05)
+        n_samples = st.slider("Anzahl Stichproben", 100, 10000, 2000, step=100)
+        distribution = st.radio("Verteilung", ["normal", "uniform"], format_func=lambda d:
+                                "Normalverteilt (Toleranz = 3 Sigma)" if d == "normal" else "Gleichverteilt")
+        if st.button("Toleranzanalyse starten"):
+            if tol_model == "Ebener Mechanismus":
+                result = crank_rod_tolerance(points, tolerance, n_samples, distribution=distribution)
+                st.pyplot(plot_tolerance_analysis(result, title="Koppelbahn p2"))
+            else:
+                result = jansen_tolerance(tolerance, n_samples, distribution=distribution)
+                st.pyplot(plot_tolerance_analysis(result, title="Fußbahn S"))
+            st.write(f"Maximale Abweichung: {result['worst_case']:.3f} bei Theta = {result['worst_theta']:.1f}°")
+
+    if choice == "Jansen-Optimierung":
+        maxiter = st.slider("Anzahl Generationen", 10, 300, 50)
+        popsize = st.slider("Populationsgröße (je Parameter)", 5, 40, 15)
+        rel_bounds = st.slider("Suchbereich um die Standardlängen (%)", 5, 40, 15) / 100
+        use_surrogate = st.checkbox("Mit MechanismSimulator bewerten, Ersatzmodell zur Vorauswahl (langsam)")
+        refine = st.checkbox("Beste Designs mit Gradientenverfahren verfeinern")
+        if st.button("Optimierung starten"):
+            if use_surrogate:
+                # Trainiert wird mit der geschlossenen Lösung, exakt bewertet mit dem Simulator
+                objective = ScreenedObjective(active_learning(rel_bounds=rel_bounds), SimulatorObjective(num_angles=60))
+                designs = optimize_jansen(rel_bounds=rel_bounds, maxiter=maxiter, popsize=popsize,
+                                          workers=1, objective=objective)
+                st.write(f"Exakt gelöste Designs: {objective.exact_evaluations}")
+            else:
+                designs = optimize_jansen(rel_bounds=rel_bounds, maxiter=maxiter, popsize=popsize)
+            if refine:
+                designs = refine_designs(designs, rel_bounds=rel_bounds)
+            st.pyplot(plot_foot_paths(designs))
+            st.table([{"Design": i + 1, "Bewertung": d["score"], **d["metrics"]} for i, d in enumerate(designs)])
+            st.session_state["jansen_designs"] = designs
+
+        designs = st.session_state.get("jansen_designs")
+        if designs:
+            selected = st.selectbox("Design animieren", range(1, len(designs) + 1))
+            if st.button("Design animieren"):
+                gif_buffer, _ = animate_strandbeest_full(None, design=designs[selected - 1]["design"])
+                st.image(gif_buffer, caption=f"Design {selected}")
                                   
 
 if __name__ == "__main__":
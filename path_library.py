@@ -0,0 +1,200 @@
+import numpy as np
+from sklearn.neighbors import NearestNeighbors
+from kinematics import circle_intersections_vec, coupler_frame
+from four_bar_atlas import evaluate_ratios
+
+LIBRARY_FILE = "path_library.npz"
+NUM_HARMONICS = 8       # Harmonische je Drehrichtung im Deskriptor
+NUM_SAMPLES = 128       # Stützstellen nach Bogenlängen-Umparametrisierung
+NUM_ANGLES = 128        # Kurbelwinkel je Entwurf beim Aufbau
+CHUNK_SIZE = 20000
+PARAM_NAMES = ["r0", "r1", "r2", "s", "t", "branch"]
+PARAM_RANGES = {
+    "r0": (0.1, 1.0),   # Kurbel, bezogen auf das Gestell p0-p3 der Länge 1
+    "r1": (0.2, 3.0),   # Koppel
+    "r2": (0.2, 3.0),   # Schwinge
+    "s": (-1.0, 2.0),   # Koppelpunkt entlang p1 -> p2 (Vielfache der Koppellänge)
+    "t": (-1.5, 1.5),   # Koppelpunkt senkrecht dazu
+}
+
+
+def design_curves(params: np.ndarray, num_angles=NUM_ANGLES) -> np.ndarray:
+    """
+    Koppelkurven normierter Entwürfe (Gestell von (0, 0) nach (1, 0)) über einen vollen Kurbelumlauf.
+
+    :param params: (Entwürfe, 6) in der Reihenfolge PARAM_NAMES
+    :return: komplexe Kurven (Entwürfe, Winkel), NaN bei Winkeln ohne Lage
+    """
+    r0, r1, r2, s, t, branch = (params[:, i, None] for i in range(6))
+    alpha = 2 * np.pi * np.arange(num_angles) / num_angles
+    p1 = r0[..., None] * np.stack(np.broadcast_arrays(np.cos(alpha), np.sin(alpha)), axis=-1)
+    p2, _ = circle_intersections_vec(p1, r1, np.array([1.0, 0.0]), r2, branch)
+    u, v = coupler_frame(p1, p2)
+    tracer = p1 + r1[..., None] * (s[..., None] * u + t[..., None] * v)
+    return tracer[..., 0] + 1j * tracer[..., 1]
+
+
+def resample_closed(z: np.ndarray, num_samples=NUM_SAMPLES) -> np.ndarray:
+    """
+    Verteilt geschlossene Kurven (..., Punkte) komplex gleichmäßig nach Bogenlänge um,
+    damit die Deskriptoren nicht von der Parametrisierung (Kurbelwinkel, Zeichengeschwindigkeit) abhängen.
+    Alle Kurven werden mit einer einzigen Interpolation umgerechnet.
+    """
+    z = np.asarray(z, dtype=complex)
+    batch, n = z.shape[:-1], z.shape[-1]
+    z = z.reshape(-1, n)
+    closed = np.concatenate([z, z[:, :1]], axis=1)
+    arc = np.concatenate([np.zeros((len(z), 1)), np.cumsum(np.abs(np.diff(closed, axis=1)), axis=1)], axis=1)
+    total = np.where(arc[:, -1:] > 0, arc[:, -1:], 1.0)
+    # Jede Zeile auf [i, i + 0.5] abbilden, dann genügt ein globales np.interp für alle Kurven
+    offset = np.arange(len(z))[:, None]
+    xp = (arc / total * 0.5 + offset).ravel()
+    x = (np.arange(num_samples) / num_samples * 0.5 + offset).ravel()
+    real = np.interp(x, xp, closed.real.ravel())
+    imag = np.interp(x, xp, closed.imag.ravel())
+    return (real + 1j * imag).reshape(batch + (num_samples,))
+
+
+def fourier_descriptors(z: np.ndarray, num_harmonics=NUM_HARMONICS) -> np.ndarray:
+    """
+    Normierte Fourier-Deskriptoren umparametrisierter Kurven (..., Stützstellen).
+
+    Der Mittelwert (Lage) entfällt, die Beträge werden auf die größere der beiden Grundschwingungen
+    bezogen (Größe), nur Beträge werden verwendet (Drehung, Startpunkt). Liegt die Grundschwingung
+    bei -1, wird die Kurve umgekehrt, damit Drehsinn und Spiegelung keine Rolle spielen.
+
+    :return: (..., 2 * num_harmonics - 1) mit |c_k| / |c_1| für k = 2..K und k = -1..-K
+    """
+    c = np.abs(np.fft.fft(z, axis=-1))
+    positive = c[..., 1:num_harmonics + 1]
+    negative = c[..., -1:-num_harmonics - 1:-1]
+    flip = (negative[..., :1] > positive[..., :1])
+    positive, negative = np.where(flip, negative, positive), np.where(flip, positive, negative)
+    scale = np.where(positive[..., :1] > 0, positive[..., :1], 1.0)
+    return np.concatenate([positive[..., 1:], negative], axis=-1) / scale
+
+
+def sample_designs(n_designs, seed=None) -> np.ndarray:
+    """Zufällige umlauffähige Entwürfe (Kurbel dreht voll durch), Form (n_designs, 6)."""
+    rng = np.random.default_rng(seed)
+    designs = []
+    count = 0
+    while count < n_designs:
+        n = max(2 * (n_designs - count), 1000)
+        params = np.column_stack(
+            [rng.uniform(*PARAM_RANGES[name], n) for name in PARAM_NAMES[:5]] + [rng.choice([-1.0, 1.0], n)]
+        )
+        params = params[evaluate_ratios(params[:, 0], params[:, 1], params[:, 2])["rotatable"]]
+        designs.append(params)
+        count += len(params)
+    return np.concatenate(designs)[:n_designs]
+
+
+def build_library(path=LIBRARY_FILE, n_designs=200000, num_harmonics=NUM_HARMONICS, seed=0) -> "PathLibrary":
+    """
+    Offline-Aufbau: Entwürfe ziehen, Koppelkurven und Deskriptoren blockweise vektorisiert berechnen
+    und als kompaktes float32-Archiv speichern.
+    """
+    params = sample_designs(n_designs, seed)
+    descriptors = np.empty((len(params), 2 * num_harmonics - 1), dtype=np.float32)
+    for start in range(0, len(params), CHUNK_SIZE):
+        chunk = params[start:start + CHUNK_SIZE]
+        descriptors[start:start + CHUNK_SIZE] = fourier_descriptors(resample_closed(design_curves(chunk)), num_harmonics)
+    np.savez_compressed(path, params=params.astype(np.float32), descriptors=descriptors,
+                        num_harmonics=num_harmonics)
+    return PathLibrary(params, descriptors, num_harmonics)
+
+
+def align_curve(reference: np.ndarray, curve: np.ndarray):
+    """
+    Beste Ähnlichkeitsabbildung w = a * z + b (ggf. gespiegelt) von curve auf reference, beide
+    umparametrisiert mit gleicher Stützstellenzahl. Startpunkt und Drehsinn werden über eine
+    FFT-Kreuzkorrelation für alle Verschiebungen gleichzeitig bestimmt.
+
+    :return: (a, b, mirror, relativer RMS-Fehler)
+    """
+    ref_mean = reference.mean()
+    ref = reference - ref_mean
+    best = None
+    for mirror in (False, True):
+        z = np.conj(curve) if mirror else curve
+        for direction in (1, -1):
+            zz = z[::direction]
+            zc = zz - zz.mean()
+            # corr[m] = sum_n conj(zc[n - m]) * ref[n], bestes a für Verschiebung m ist corr[m] / |zc|^2
+            corr = np.fft.ifft(np.fft.fft(ref) * np.conj(np.fft.fft(zc)))
+            m = int(np.argmax(np.abs(corr)))
+            norm = (np.abs(zc)**2).sum()
+            a = corr[m] / norm
+            error = max((np.abs(ref)**2).sum() - np.abs(corr[m])**2 / norm, 0.0)
+            if best is None or error < best[3]:
+                best = (a, ref_mean - a * zz.mean(), mirror, error)
+    a, b, mirror, error = best
+    return a, b, mirror, float(np.sqrt(error / max((np.abs(ref)**2).sum(), 1e-300)))
+
+
+def design_points(params, a=1.0, b=0.0, mirror=False) -> dict:
+    """
+    Gelenkpunkte p0..p3 und Koppelpunkt "tracer" eines normierten Entwurfs, abgebildet mit w = a * z + b
+    (Kurbel in der Ausgangslage bei 90°). Das Ergebnis kann direkt an animate_crank_kinematics gehen.
+    """
+    r0, r1, r2, s, t, branch = (float(v) for v in params)
+    p1 = np.array([0.0, r0])
+    p3 = np.array([1.0, 0.0])
+    p2, _ = circle_intersections_vec(p1, r1, p3, r2, branch)
+    u, v = coupler_frame(p1, p2)
+    tracer = p1 + r1 * (s * u + t * v)
+    points = {"p0": np.zeros(2), "p1": p1, "p2": p2, "p3": p3, "tracer": tracer}
+    result = {}
+    for key, p in points.items():
+        z = complex(p[0], p[1])
+        w = a * (np.conj(z) if mirror else z) + b
+        result[key] = np.array([w.real, w.imag])
+    return result
+
+
+class PathLibrary:
+    """
+    Bibliothek normierter Koppelkurven mit KD-Baum über die Fourier-Deskriptoren
+    (sklearn NearestNeighbors). Eine Abfrage liefert die ähnlichsten Entwürfe, in Lage und Größe
+    an die gesuchte Bahnkurve angepasst.
+    """
+    def __init__(self, params, descriptors, num_harmonics=NUM_HARMONICS):
+        self.params = np.asarray(params, dtype=float)
+        self.descriptors = np.asarray(descriptors, dtype=np.float32)
+        self.num_harmonics = int(num_harmonics)
+        self.index = NearestNeighbors(algorithm="kd_tree").fit(self.descriptors)
+
+    @classmethod
+    def load(cls, path=LIBRARY_FILE) -> "PathLibrary":
+        with np.load(path) as data:
+            return cls(data["params"], data["descriptors"], data["num_harmonics"])
+
+    def __len__(self):
+        return len(self.params)
+
+    def query(self, trajectory, k=5) -> list:
+        """
+        Sucht die k Entwürfe, deren Koppelkurve der Bahnkurve (Liste oder Array von (x, y),
+        z. B. aus load_trajectory) am ähnlichsten ist.
+
+        :return: Liste von Dictionaries mit distance (Deskriptorabstand), fit_error (relativer RMS-Fehler
+                 nach Ausrichtung), params, points (abgebildete Gelenkpunkte mit tracer) und curve
+        """
+        trajectory = np.asarray(trajectory, dtype=float)
+        target = resample_closed(trajectory[:, 0] + 1j * trajectory[:, 1])
+        descriptor = fourier_descriptors(target, self.num_harmonics).astype(np.float32)
+        distances, indices = self.index.kneighbors(descriptor[None], n_neighbors=min(k, len(self)))
+        curves = resample_closed(design_curves(self.params[indices[0]]))
+        matches = []
+        for distance, i, curve in zip(distances[0], indices[0], curves):
+            a, b, mirror, error = align_curve(target, curve)
+            w = a * (np.conj(curve) if mirror else curve) + b
+            matches.append({
+                "distance": float(distance),
+                "fit_error": error,
+                "params": dict(zip(PARAM_NAMES, self.params[i].tolist())),
+                "points": design_points(self.params[i], a, b, mirror),
+                "curve": np.column_stack([w.real, w.imag]),
+            })
+        return sorted(matches, key=lambda m: m["fit_error"])
@@ -0,0 +1,138 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.optimize import minimize
+from crank_rod import solve_crank_rod
+from kinematics import tracer_local, tracer_global
+
+POINT_KEYS = ["p0", "p1", "p2", "p3", "tracer"]
+NUM_ANGLES = 90
+INVALID_PENALTY = 1e3
+STAGES = (40, 80, 400)      # Iterationen je Runde, nach jeder Runde scheiden schlechte Starts aus
+KEEP_FRACTION = 0.25
+
+
+def vector_to_points(x) -> dict:
+    """Parametervektor (10,) -> Gelenkpunkte p0..p3 und Koppelpunkt tracer in der Ausgangslage."""
+    x = np.asarray(x, dtype=float).reshape(-1, 2)
+    return dict(zip(POINT_KEYS, x))
+
+
+def points_to_vector(points: dict) -> np.ndarray:
+    return np.concatenate([np.asarray(points[k], dtype=float) for k in POINT_KEYS])
+
+
+def coupler_curve(points: dict, num_angles=NUM_ANGLES):
+    """Bahn des Koppelpunkts über einen vollen Kurbelumlauf, (Winkel, 2) und Gültigkeitsmaske."""
+    theta = np.linspace(0, 360, num_angles, endpoint=False)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p1, p2, valid = solve_crank_rod(points, theta)
+        curve = tracer_global(p1, p2, tracer_local(points, points["tracer"])[None])[:, 0]
+    return curve, valid & np.isfinite(curve).all(axis=-1)
+
+
+def path_error_terms(x, target, num_angles=NUM_ANGLES):
+    """
+    Beide Richtungen der Abweichung zwischen Koppelkurve und Zielpunkten, unabhängig von der Zeitzuordnung:
+    mittlerer quadratischer Abstand jedes Zielpunkts zur nächsten Kurvenstelle und jeder Kurvenstelle
+    zum nächsten Zielpunkt.
+
+    :return: (Ziel -> Kurve, Kurve -> Ziel) oder None, wenn die Kurbel nicht voll umläuft,
+             sowie die Gültigkeitsmaske der Kurve
+    """
+    curve, valid = coupler_curve(vector_to_points(x), num_angles)
+    if not valid.all():
+        return None, valid
+    d2 = ((target[:, None, :] - curve[None, :, :])**2).sum(axis=-1)   # (Ziel, Winkel)
+    return (float(d2.min(axis=1).mean()), float(d2.min(axis=0).mean())), valid
+
+
+def path_error(x, target, closed=True, num_angles=NUM_ANGLES) -> float:
+    """
+    Zielfunktion der Synthese aus path_error_terms: der Abstand der Zielpunkte zur Kurve, bei einer
+    geschlossenen Zielkurve (closed) zusätzlich der Abstand der Kurve zu den Zielpunkten, damit keine
+    viel größere Kurve die Zielpunkte nur streift. Entwürfe, deren Kurbel nicht voll umläuft,
+    erhalten eine Strafe.
+    """
+    terms, valid = path_error_terms(x, target, num_angles)
+    if terms is None:
+        return INVALID_PENALTY * (1.0 + (~valid).mean())
+    return terms[0] + terms[1] if closed else terms[0]
+
+
+def _run_start(x0, target, closed, maxiter):
+    """Eine Runde Nelder-Mead für einen Start (auf Modulebene, damit sie an Worker-Prozesse geht)."""
+    result = minimize(path_error, x0, args=(target, closed), method="Nelder-Mead",
+                      options={"maxiter": maxiter, "xatol": 1e-6, "fatol": 1e-10, "adaptive": True})
+    return result.x, float(result.fun)
+
+
+def random_starts(target, n_starts, rng) -> np.ndarray:
+    """Zufällige Startentwürfe um die (normierte) Zielkurve, Koppelpunkt auf einem Zielpunkt."""
+    p0 = rng.uniform(-2.0, 2.0, (n_starts, 2))
+    p3 = rng.uniform(-2.0, 2.0, (n_starts, 2))
+    crank = rng.uniform(0.1, 0.8, n_starts)[:, None]
+    angle = rng.uniform(0, 2 * np.pi, n_starts)
+    p1 = p0 + crank * np.column_stack([np.cos(angle), np.sin(angle)])
+    p2 = rng.uniform(-2.0, 2.0, (n_starts, 2))
+    tracer = target[rng.integers(len(target), size=n_starts)]
+    return np.hstack([p0, p1, p2, p3, tracer])
+
+
+def synthesize_four_bar(target, n_starts=64, stages=STAGES, keep=KEEP_FRACTION, closed=True, top_k=3,
+                        max_workers=None, seed=None, initial_points=()) -> list:
+    """
+    Maßsynthese eines Viergelenks mit Koppelpunkt für Zielpunkte oder eine Zielkurve
+    (z. B. eine gespeicherte bahnkurve.csv).
+
+    Viele zufällige Starts werden rundenweise in einem Prozesspool optimiert. Nach jeder Runde
+    wird nur der beste Anteil keep weitergeführt (frühes Verwerfen schlechter Starts), sodass die
+    meiste Rechenzeit in die aussichtsreichen Entwürfe fließt. Die Zielpunkte werden vorab auf
+    Mittelwert 0 und mittleren Radius 1 normiert.
+
+    :param target: Zielpunkte (N, 2) bzw. Liste [[x, y], ...]
+    :param closed: True für eine geschlossene Zielkurve, False für einzelne Genauigkeitslagen
+    :param initial_points: zusätzliche Startentwürfe als Punkte-Dictionaries (z. B. aus PathLibrary.query)
+    :return: die top_k besten Entwürfe mit points (direkt für animate_crank_kinematics), error (Zielfunktion,
+             normiert), rms_target_to_curve, rms_curve_to_target (None bei closed=False) und curve
+    """
+    target = np.asarray(target, dtype=float)
+    center = target.mean(axis=0)
+    scale = np.sqrt(((target - center)**2).sum(axis=1).mean())
+    normalized = (target - center) / scale
+    rng = np.random.default_rng(seed)
+
+    starts = list(random_starts(normalized, n_starts, rng))
+    for points in initial_points:
+        starts.append((points_to_vector(points).reshape(-1, 2) - center).ravel() / scale)
+    active = [(x, np.inf) for x in starts]
+
+    pool = ProcessPoolExecutor(max_workers=max_workers) if max_workers != 1 else None
+    try:
+        for round_index, maxiter in enumerate(stages):
+            args = [(x, normalized, closed, maxiter) for x, _ in active]
+            if pool is None:
+                active = [_run_start(*a) for a in args]
+            else:
+                active = list(pool.map(_run_start, *zip(*args)))
+            active.sort(key=lambda item: item[1])
+            if round_index < len(stages) - 1:
+                active = active[:max(top_k, int(np.ceil(keep * len(active))))]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    designs = []
+    for x, error in active[:top_k]:
+        points = {k: p * scale + center for k, p in vector_to_points(x).items()}
+        curve, valid = coupler_curve(points, 360)
+        terms, _ = path_error_terms(x, normalized)
+        rms = [None, None] if terms is None else [float(np.sqrt(term)) * scale for term in terms]
+        designs.append({
+            "points": points,
+            "error": error,
+            "rms_target_to_curve": rms[0],
+            "rms_curve_to_target": rms[1] if closed else None,
+            "valid": bool(valid.all()),
+            "curve": curve,
+        })
+    return designs
@@ -0,0 +1,191 @@
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+MANIFEST_NAME = "manifest.json"
+
+
+class ChunkedResultStore:
+    """
+    Chunk-basierter Ergebnisspeicher für große Parameterstudien.
+
+    Die Daten haben die Form (Konfigurationen x Frames x Gelenke x 2). Jeder Chunk
+    umfasst einen festen Block von Konfigurationen und liegt als eigene .npy-Datei
+    auf der Platte, die per np.memmap gelesen wird. Eine JSON-Manifestdatei beschreibt
+    die Achsen (Parameterwerte, Kurbelwinkel, Gelenkbezeichnungen).
+
+    Da jeder Chunk eine eigene Datei ist, können Worker-Prozesse parallel schreiben,
+    ohne eine gemeinsame Datei zu sperren. Ein Chunk gilt erst als vorhanden, wenn
+    er vollständig geschrieben und atomar umbenannt wurde.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_NAME)) as f:
+            self.manifest = json.load(f)
+        self.parameter_names = self.manifest["parameter_names"]
+        self.parameter_values = np.array(self.manifest["parameter_values"], dtype=float)
+        self.angles = np.array(self.manifest["angles"], dtype=float)
+        self.joint_labels = self.manifest["joint_labels"]
+        self.chunk_size = self.manifest["chunk_size"]
+        self.dtype = np.dtype(self.manifest["dtype"])
+
+    @classmethod
+    def create(cls, path: str, parameter_values, angles, joint_labels,
+               parameter_names=None, chunk_size: int = 64, dtype="float32"):
+        """
+        Legt einen neuen, leeren Speicher an und schreibt das Manifest.
+
+        :param parameter_values: Array (Konfigurationen x Parameter) der Parameterwerte
+        :param angles: Kurbelwinkel in Grad
+        :param joint_labels: Bezeichnungen der Gelenke, z. B. ["X", "W", "V", "T", "U", "S"]
+        """
+        parameter_values = np.asarray(parameter_values, dtype=float)
+        if parameter_values.ndim == 1:
+            parameter_values = parameter_values[:, None]
+        if parameter_names is None:
+            parameter_names = [f"p{i}" for i in range(parameter_values.shape[1])]
+        if len(parameter_names) != parameter_values.shape[1]:
+            raise ValueError("Anzahl der Parameternamen passt nicht zu den Parameterwerten.")
+
+        os.makedirs(path, exist_ok=True)
+        manifest = {
+            "shape": [len(parameter_values), len(angles), len(joint_labels), 2],
+            "dtype": np.dtype(dtype).str,
+            "chunk_size": int(chunk_size),
+            "parameter_names": list(parameter_names),
+            "parameter_values": parameter_values.tolist(),
+            "angles": np.asarray(angles, dtype=float).tolist(),
+            "joint_labels": list(joint_labels),
+        }
+        with open(os.path.join(path, MANIFEST_NAME), "w") as f:
+            json.dump(manifest, f, indent=2)
+        return cls(path)
+
+    @property
+    def shape(self) -> tuple:
+        return tuple(self.manifest["shape"])
+
+    @property
+    def num_chunks(self) -> int:
+        return -(-self.shape[0] // self.chunk_size)
+
+    def chunk_range(self, chunk_index: int) -> tuple:
+        """Gibt den Konfigurationsbereich [start, stop) eines Chunks zurück."""
+        start = chunk_index * self.chunk_size
+        return start, min(start + self.chunk_size, self.shape[0])
+
+    def _chunk_file(self, chunk_index: int) -> str:
+        return os.path.join(self.path, f"chunk_{chunk_index:05d}.npy")
+
+    def has_chunk(self, chunk_index: int) -> bool:
+        return os.path.exists(self._chunk_file(chunk_index))
+
+    def missing_chunks(self) -> list:
+        return [k for k in range(self.num_chunks) if not self.has_chunk(k)]
+
+    def write_chunk(self, chunk_index: int, data) -> None:
+        """
+        Schreibt einen vollständigen Chunk. Die Datei wird zuerst unter einem
+        temporären Namen angelegt und danach atomar umbenannt, damit Leser nie
+        einen halb geschriebenen Chunk sehen.
+        """
+        start, stop = self.chunk_range(chunk_index)
+        expected = (stop - start,) + self.shape[1:]
+        data = np.asarray(data)
+        if data.shape != expected:
+            raise ValueError(f"Chunk {chunk_index} hat die Form {data.shape}, erwartet {expected}.")
+
+        fd, tmp_filename = tempfile.mkstemp(suffix=".npy.tmp", dir=self.path)
+        os.close(fd)
+        try:
+            mm = np.lib.format.open_memmap(tmp_filename, mode="w+", dtype=self.dtype, shape=expected)
+            mm[...] = data
+            mm.flush()
+            del mm
+            os.replace(tmp_filename, self._chunk_file(chunk_index))
+        except Exception:
+            if os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+            raise
+
+    def open_chunk(self, chunk_index: int) -> np.memmap:
+        """Öffnet einen Chunk lesend als memmap (es werden keine Daten geladen)."""
+        return np.load(self._chunk_file(chunk_index), mmap_mode="r")
+
+    def angle_indices(self, start_deg: float, stop_deg: float) -> slice:
+        """Wandelt einen Winkelbereich in Grad in einen Index-Slice der Winkelachse um."""
+        lo = int(np.searchsorted(self.angles, start_deg, side="left"))
+        hi = int(np.searchsorted(self.angles, stop_deg, side="right"))
+        return slice(lo, hi)
+
+    def joint_index(self, joints):
+        if joints is None:
+            return slice(None)
+        if isinstance(joints, str):
+            return self.joint_labels.index(joints)
+        return [self.joint_labels.index(j) for j in joints]
+
+    def read(self, configs=slice(None), angles=slice(None), joints=None) -> np.ndarray:
+        """
+        Liest einen Ausschnitt des Speichers. Es werden nur die Chunks geöffnet,
+        die den gewünschten Konfigurationsbereich berühren, und nur der
+        angeforderte Ausschnitt wird in den Arbeitsspeicher kopiert.
+        Fehlende Chunks werden mit NaN aufgefüllt.
+
+        :param configs: int, Slice oder Index-Array der Konfigurationen
+        :param angles: int, Slice oder Index-Array der Winkel
+        :param joints: Gelenkbezeichnung, Liste von Bezeichnungen oder None für alle
+        """
+        config_idx = np.arange(self.shape[0])[configs]
+        angle_idx = np.arange(self.shape[1])[angles]
+        joint_idx = np.arange(self.shape[2])[self.joint_index(joints)]
+
+        out = np.full((np.size(config_idx), np.size(angle_idx), np.size(joint_idx), 2), np.nan, dtype=self.dtype)
+        flat_configs = np.atleast_1d(config_idx)
+        chunk_of = flat_configs // self.chunk_size
+        for chunk_index in np.unique(chunk_of):
+            if not self.has_chunk(chunk_index):
+                continue
+            mask = chunk_of == chunk_index
+            local = flat_configs[mask] - chunk_index * self.chunk_size
+            mm = self.open_chunk(chunk_index)
+            # Zusammenhängende Bereiche als Slice lesen, damit nur die betroffenen Seiten geladen werden
+            if np.all(np.diff(local) == 1):
+                block = mm[local[0]:local[-1] + 1]
+            else:
+                block = mm[local]
+            out[mask] = block[:, np.atleast_1d(angle_idx)][:, :, np.atleast_1d(joint_idx)]
+
+        # Skalare Indizes entfernen die jeweilige Achse wie bei NumPy üblich
+        squeeze = tuple(axis for axis, idx in enumerate((config_idx, angle_idx, joint_idx)) if np.ndim(idx) == 0)
+        return out.squeeze(axis=squeeze) if squeeze else out
+
+    def trajectory(self, config: int, joint: str) -> list:
+        """Bahnkurve eines Gelenks einer Konfiguration als Liste [[x, y], ...] (Format der App)."""
+        return self.read(config, joints=joint).tolist()
+
+
+def _solve_and_write_chunk(path, chunk_index, solve_func):
+    store = ChunkedResultStore(path)
+    start, stop = store.chunk_range(chunk_index)
+    data = solve_func(store.parameter_values[start:stop], store.angles)
+    store.write_chunk(chunk_index, data)
+    return chunk_index
+
+
+def run_sweep(store: ChunkedResultStore, solve_func, max_workers=None, skip_existing=True) -> list:
+    """
+    Füllt den Speicher parallel. solve_func(parameter_rows, angles) muss ein Array der Form
+    (len(parameter_rows), Frames, Gelenke, 2) liefern und auf Modulebene definiert sein,
+    damit es an die Worker-Prozesse übergeben werden kann.
+    """
+    chunks = store.missing_chunks() if skip_existing else list(range(store.num_chunks))
+    if not chunks:
+        return []
+    if max_workers == 1:
+        return [_solve_and_write_chunk(store.path, k, solve_func) for k in chunks]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_solve_and_write_chunk, store.path, k, solve_func) for k in chunks]
+        return [f.result() for f in futures]
@@ -0,0 +1,104 @@
+import numpy as np
+from linkage_graph import LinkageGraph
+
+RANK_TOL = 1e-9
+ZERO_LENGTH_TOL = 1e-12
+
+
+def gruebler_count(num_joints: int, num_bars: int, num_fixed: int) -> int:
+    """
+    Freiheitsgrad eines ebenen Stab-Gelenk-Systems nach Grübler:
+    jedes nicht feste Gelenk hat zwei Freiheitsgrade, jeder Stab nimmt einen weg.
+    Stäbe zwischen zwei festen Gelenken sind dabei nicht mitzuzählen.
+    """
+    return 2 * (num_joints - num_fixed) - num_bars
+
+
+def check_mechanism(edges: list, positions: dict, fixed: list, driven: list = ()) -> dict:
+    """
+    Schnelle Prüfung vor dem Lösen: Grübler-Zahl, Rang der Steifigkeitsmatrix,
+    redundante Stäbe und unterbestimmte Gelenke.
+
+    Die Steifigkeitsmatrix ist die Jacobi-Matrix der Stablängen nach den Koordinaten
+    der freien Gelenke (aus LinkageGraph). Angetriebene Gelenke (z. B. der Kurbelpunkt X)
+    werden wie feste behandelt, d. h. bei gegebenem Kurbelwinkel muss das übrige System
+    starr sein (Freiheitsgrad 0).
+
+    :param positions: Lage aller Gelenke in der Ausgangskonfiguration
+    :param fixed: feste Gelenke (Gestell)
+    :param driven: angetriebene Gelenke, deren Lage vorgegeben wird
+    :return: Dictionary mit den Kennzahlen, einer Liste von Meldungen und ok
+    """
+    messages = []
+    graph = LinkageGraph(edges)
+    missing = [label for label in graph.joints if label not in positions]
+    if missing:
+        return {"ok": False, "messages": [f"Fehler: Keine Position für Gelenk(e) {', '.join(missing)}."]}
+
+    prescribed = set(fixed) | set(driven)
+    free = [label for label in graph.joints if label not in prescribed]
+    ground_only = np.array([a in prescribed and b in prescribed for a, b in graph.edges])
+    num_bars = int((~ground_only).sum())
+
+    lengths = graph.bar_lengths(positions)
+    zero_length = [graph.edges[i] for i in np.nonzero(lengths < ZERO_LENGTH_TOL)[0]]
+    for a, b in zero_length:
+        messages.append(f"Fehler: Stab {a}-{b} hat die Länge Null. Punkte überlappen oder sind identisch!")
+    if zero_length:
+        return {"ok": False, "messages": messages, "zero_length_edges": zero_length}
+
+    # Laufgrad des ganzen Mechanismus (ohne vorgegebenen Antrieb)
+    frame_bars = sum(a in fixed and b in fixed for a, b in graph.edges)
+    mobility = gruebler_count(graph.num_joints, graph.num_edges - frame_bars, len(set(fixed)))
+
+    # Steifigkeitsmatrix der beweglichen Stäbe nach den freien Koordinaten
+    R = graph.jacobian(positions, free).toarray()[~ground_only]
+    if R.size:
+        U, sigma, Vt = np.linalg.svd(R)
+        tol = RANK_TOL * max(1.0, sigma.max()) * max(R.shape)
+        rank = int((sigma > tol).sum())
+    else:
+        U, Vt, rank = np.eye(len(R)), np.eye(2 * len(free)), 0
+    dof = 2 * len(free) - rank
+    num_redundant = num_bars - rank
+
+    # Redundante Stäbe: Anteil an einer Eigenspannung (linker Nullraum von R)
+    moving_edges = [e for e, g in zip(graph.edges, ground_only) if not g]
+    redundant = []
+    if num_redundant > 0:
+        self_stress = U[:, rank:]
+        redundant = [moving_edges[i] for i in np.nonzero(np.abs(self_stress).max(axis=1) > 1e-6)[0]]
+
+    # Unterbestimmte Gelenke: Anteil an einer Bewegung bei festgehaltenem Antrieb (rechter Nullraum)
+    underconstrained = []
+    if dof > 0:
+        motion = Vt[rank:].T.reshape(len(free), 2, -1)
+        amplitude = np.linalg.norm(motion, axis=(1, 2))
+        underconstrained = [free[i] for i in np.nonzero(amplitude > 1e-6)[0]]
+
+    degree = np.bincount(np.concatenate([graph.start, graph.end]), minlength=graph.num_joints)
+    dangling = [label for label, d in zip(graph.joints, degree) if label in free and d < 2]
+
+    if dof > 0:
+        messages.append(f"Fehler: Mechanismus ist bei vorgegebenem Antrieb unterbestimmt ({dof} Freiheitsgrad(e)), "
+                        f"betroffene Gelenke: {', '.join(underconstrained)}.")
+    if num_redundant > 0:
+        messages.append(f"Warnung: {num_redundant} redundante Bindung(en), beteiligte Stäbe: "
+                        f"{', '.join(a + '-' + b for a, b in redundant)}.")
+    if mobility < 1:
+        messages.append(f"Warnung: Grübler-Zahl {mobility} - der Mechanismus ist ohne Redundanzen nicht beweglich.")
+    if dangling:
+        messages.append(f"Fehler: Gelenk(e) {', '.join(dangling)} hängen an weniger als zwei Stäben.")
+
+    return {
+        "ok": dof == 0 and not dangling,
+        "gruebler_dof": mobility,
+        "rank": rank,
+        "dof": dof,
+        "redundant_constraints": num_redundant,
+        "redundant_edges": redundant,
+        "underconstrained_joints": underconstrained,
+        "dangling_joints": dangling,
+        "zero_length_edges": zero_length,
+        "messages": messages,
+    }
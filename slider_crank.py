@@ -6,11 +6,45 @@ import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation, PillowWriter
 import streamlit as st
 
+# Mechanismus-Parameter (Längen der Stäbe)
+L_CRANK = 5.0   # Kurbel
+L_ROD = 10.0    # Koppelstange
+
+SLIDER_MOTION_DTYPE = np.dtype([
+    ("theta", float), ("x", float), ("v", float), ("a", float)
+])
+
+
+def slider_crank_motion(theta_deg, omega=1.0, alpha=0.0, L_crank=L_CRANK, L_rod=L_ROD) -> np.ndarray:
+    """
+    Lage, Geschwindigkeit und Beschleunigung des Kolbens (Schieber auf der x-Achse) für ein
+    ganzes Array von Kurbelwinkeln, geschlossen aus der abgeleiteten Schleifengleichung
+    |s - p1| = L_rod mit s = (x, 0):
+        (x - x1) * v = (s - p1) . v1
+        (x - x1) * a = (s - p1) . a1 - |vs - v1|^2
+
+    :param omega: Winkelgeschwindigkeit der Kurbel in rad/s
+    :return: strukturiertes Array mit den Feldern theta, x, v, a (relativ zur Basis)
+    """
+    theta = np.asarray(theta_deg, dtype=float)
+    phi = np.radians(theta)
+    x1, y1 = L_crank * np.cos(phi), L_crank * np.sin(phi)
+    x = x1 + np.sqrt(L_rod**2 - y1**2)
+    vx1, vy1 = -omega * y1, omega * x1
+    ax1 = -alpha * y1 - omega**2 * x1
+    ay1 = alpha * x1 - omega**2 * y1
+    v = ((x - x1) * vx1 - y1 * vy1) / (x - x1)
+    a = ((x - x1) * ax1 - y1 * ay1 - ((v - vx1)**2 + vy1**2)) / (x - x1)
+
+    motion = np.empty(theta.shape, dtype=SLIDER_MOTION_DTYPE)
+    motion["theta"], motion["x"], motion["v"], motion["a"] = theta, x, v, a
+    return motion
+
+
 def animate_slider_crank(show_path=False):
     
-    # Mechanismus-Parameter (Längen der Stäbe)
-    L_crank = 5.0   # Kurbel
-    L_rod = 10.0    # Koppelstange
+    L_crank = L_CRANK
+    L_rod = L_ROD
     base_x = 0.0    # Position der festen Basis
     base_y = 0.0
     
@@ -0,0 +1,100 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from advanced_strandbeest import default_simulator, MechanismSimulator
+
+TORQUE_DTYPE = np.dtype([
+    ("theta", float), ("torque", float), ("torque_check", float), ("max_bar_force", float)
+])
+
+
+def joint_loads(simulator: MechanismSimulator, n_angles: int, loads: dict) -> np.ndarray:
+    """Baut aus {Gelenk: (Fx, Fy)} ein Lastarray (Winkel, Gelenke, 2) in der Reihenfolge des Graphen."""
+    f = np.zeros((n_angles, simulator.graph.num_joints, 2))
+    for label, force in loads.items():
+        f[:, simulator.graph.index[label]] = force
+    return f
+
+
+def crank_torque(angles=None, load=100.0, joint="S", loads=None, simulator=None, solutions=None):
+    """
+    Erforderliches Antriebsmoment an der Kurbel X (um Z) über den Zyklus für eine statische Last,
+    standardmäßig eine senkrechte Last am Fußpunkt S (Reibung und Massen vernachlässigt).
+
+    Das Moment folgt aus dem Prinzip der virtuellen Arbeit, M * w + Summe F . v = 0, mit den
+    Geschwindigkeiten aus MechanismSimulator.motion_analysis. Zur Kontrolle werden die Stabkräfte
+    aus dem Gleichgewicht der freien Gelenke (gebündelt gelöst) berechnet und das Moment der
+    Stabkräfte an X um Z gebildet.
+
+    :param load: Gewichtskraft am Gelenk joint (nach unten), wird durch loads ersetzt, falls angegeben
+    :return: (strukturiertes Array TORQUE_DTYPE, Stabkräfte (Winkel, Stäbe))
+    """
+    if simulator is None:
+        simulator = default_simulator()
+    if angles is None:
+        angles = np.arange(0, 360, 2.0)
+    if loads is None:
+        loads = {joint: (0.0, -load)}
+    angles = np.asarray(angles, dtype=float)
+    motion = simulator.motion_analysis(angles, omega=1.0, solutions=solutions)
+    positions = motion["positions"]
+    f = joint_loads(simulator, len(angles), loads)
+
+    # Virtuelle Arbeit: M = -Summe F . dp/dtheta
+    torque = -(f * motion["velocities"]).sum(axis=(-1, -2))
+
+    # Gleichgewicht der freien Gelenke -> Stabkräfte -> Moment der Stabkräfte an X um Z
+    graph = simulator.graph
+    forces = graph.equilibrium_forces(positions, f, simulator.free_labels)
+    units = graph.unit_vectors(positions)
+    x = graph.index["X"]
+    on_start = np.where(graph.start == x, -1.0, 0.0) + np.where(graph.end == x, 1.0, 0.0)
+    force_on_X = (on_start[:, None] * forces[..., None] * units).sum(axis=-2)
+    lever = positions[:, x] - np.asarray(simulator.fixed_points["Z"], dtype=float)
+    torque_check = -(lever[:, 0] * force_on_X[:, 1] - lever[:, 1] * force_on_X[:, 0])
+
+    result = np.empty(len(angles), dtype=TORQUE_DTYPE)
+    result["theta"] = angles
+    result["torque"] = torque
+    result["torque_check"] = torque_check
+    result["max_bar_force"] = np.abs(forces).max(axis=-1)
+    return result, forces
+
+
+def torque_summary(result: np.ndarray) -> dict:
+    """Spitzenmoment mit Lage, Effektivwert (RMS) und Mittelwert des Antriebsmoments."""
+    torque = result["torque"]
+    i_peak = int(np.argmax(np.abs(torque)))
+    return {
+        "peak_torque": float(torque[i_peak]),
+        "theta_peak": float(result["theta"][i_peak]),
+        "rms_torque": float(np.sqrt(np.mean(torque**2))),
+        "mean_torque": float(np.mean(torque)),
+        "max_bar_force": float(result["max_bar_force"].max()),
+        "max_check_deviation": float(np.abs(torque - result["torque_check"]).max()),
+    }
+
+
+def plot_crank_torque(result: np.ndarray, forces=None, edges=None):
+    """Antriebsmoment über Theta mit Spitze und RMS, optional die Stabkräfte."""
+    summary = torque_summary(result)
+    ncols = 1 if forces is None else 2
+    fig, axes = plt.subplots(1, ncols, figsize=(6 * ncols, 4), squeeze=False)
+    ax = axes[0, 0]
+    ax.plot(result["theta"], result["torque"], label="Antriebsmoment")
+    ax.axhline(summary["rms_torque"], color="g", ls="--", label=f"RMS {summary['rms_torque']:.1f}")
+    ax.axhline(-summary["rms_torque"], color="g", ls="--")
+    ax.plot(summary["theta_peak"], summary["peak_torque"], "ro", label=f"Spitze {summary['peak_torque']:.1f}")
+    ax.set_xlabel("Theta (Grad)")
+    ax.set_ylabel("Moment an der Kurbel")
+    ax.grid(True)
+    ax.legend()
+    if forces is not None:
+        ax = axes[0, 1]
+        for i in range(forces.shape[1]):
+            label = "-".join(edges[i]) if edges is not None else f"Stab {i + 1}"
+            ax.plot(result["theta"], forces[:, i], lw=1, label=label)
+        ax.set_xlabel("Theta (Grad)")
+        ax.set_ylabel("Stabkraft (Zug positiv)")
+        ax.grid(True)
+        ax.legend(fontsize=7, ncol=2)
+    return fig
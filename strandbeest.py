@@ -8,7 +8,85 @@ from matplotlib.animation import FuncAnimation, PillowWriter
 import streamlit as st
 
 
-def animate_strandbeest(start_pos):
+BRANCHES = ("cross", "open")
+# Parameter gemäß MATLAB (für einen einzelnen Beinzyklus)
+STRANDBEEST_LENGTHS = {
+    "L1": 6.0,  # Abstand A -> E (horizontale Grundlänge)
+    "L2": 1.0,  # Länge des Kurbelarms (A -> B)
+    "L3": 8.0,  # Länge des Couplers (B -> C)
+    "L4": 5.0,  # Länge des Rockers (E -> C)
+    "L5": 5.0,  # Länge für Zusatzglied (E -> D)
+    "L8": 0.5,  # Vertikaler Offset: E = (L1, -L8)
+}
+
+
+def four_bar_mechanism(E_complex, L2, L3, L4, A2):
+    """
+    Vier-Gelenk-Berechnung für alle Kurbelwinkel A2 und beide Zweige gleichzeitig:
+    gesucht sind A3 (Couplerwinkel) und A4 (Rockerwinkel), sodass gilt
+       L2·e^(iA2) + L3·e^(iA3) = E_complex + L4·e^(iA4)
+
+    :return: (A3, A4, valid) jeweils mit der Form (Zweige, Winkel) in der Reihenfolge BRANCHES
+    """
+    A2 = np.asarray(A2, dtype=float)
+    # Setze den Vektor von A nach E minus den Beitrag des Kurbelarms:
+    Z = E_complex - L2 * np.exp(1j * A2)
+    r = np.abs(Z)
+    phi = np.angle(Z)
+    # Berechne den Wert, der aus der Gleichung resultiert:
+    D_val = (L3**2 - r**2 - L4**2) / (2 * L4)
+    valid = (r > 0) & (np.abs(D_val) <= r)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        acos_val = np.arccos(np.clip(D_val / r, -1.0, 1.0))
+    # "cross"-Zweig: phi - acos, "open"-Zweig: phi + acos
+    sign = np.array([-1.0, 1.0]).reshape((2,) + (1,) * A2.ndim)
+    A4 = phi + sign * acos_val
+    # Bestimme A3 aus dem Schleifenabschluss:
+    vec = E_complex + L4 * np.exp(1j * A4) - L2 * np.exp(1j * A2)
+    A3 = np.angle(vec)
+    valid = np.broadcast_to(valid, A4.shape)
+    return np.where(valid, A3, np.nan), np.where(valid, A4, np.nan), valid
+
+
+def solve_strandbeest(A2, start_pos=(0.0, 0.0), lengths=None):
+    """
+    Geschlossene Lösung des vereinfachten Beins (A, B, C, D, E) für alle Kurbelwinkel
+    und beide Zweige in einem Aufruf. Animation, Bahnkurven und Auswertungen nutzen
+    dieselbe Vorberechnung.
+
+    :param A2: Kurbelwinkel in Radiant (Array)
+    :param lengths: optionale Längen, Standard STRANDBEEST_LENGTHS
+    :return: (positions, valid) mit positions[Gelenk] der Form (Zweige, Winkel, 2)
+             und valid der Form (Zweige, Winkel); ungültige Lagen sind NaN
+    """
+    L = {**STRANDBEEST_LENGTHS, **(lengths or {})}
+    A2 = np.asarray(A2, dtype=float)
+    offset = np.asarray(start_pos, dtype=float)
+    # Komplexe Darstellung des festen Punkts E
+    E_complex = L["L1"] - 1j * L["L8"]
+
+    A3, A4, valid = four_bar_mechanism(E_complex, L["L2"], L["L3"], L["L4"], A2)
+    B_complex = L["L2"] * np.exp(1j * A2)
+    C_complex = B_complex + L["L3"] * np.exp(1j * A3)
+    A5 = (np.pi - A4) + (np.pi / 2)
+    D_complex = E_complex + L["L5"] * np.exp(1j * (np.pi - A5))
+
+    shape = A4.shape
+    def as_points(z):
+        z = np.broadcast_to(z, shape)
+        return np.stack([z.real, z.imag], axis=-1) + offset
+
+    positions = {
+        "A": as_points(0j),
+        "B": as_points(B_complex),
+        "C": as_points(C_complex),
+        "D": as_points(D_complex),
+        "E": as_points(E_complex),
+    }
+    return positions, valid
+
+
+def animate_strandbeest(start_pos, branch="cross"):
     """
     
     start_pos: Basisposition (x,y) des gesamten Mechanismus (z. B. die Hüfte).
@@ -19,8 +97,8 @@ def animate_strandbeest(start_pos):
     Der Mechanismus basiert auf dem Vier-Gelenk-Ansatz:
       - A = Basis (0,0)
       - B = Endpunkt des rotierenden Kurbelarms (L2, Winkel A2)
-      - Mit der Funktion four_bar_mechanism wird für ein gegebenes A2 der
-        Coupler‑Winkel A3 und der Rocker‑Winkel A4 bestimmt, sodass gilt:
+      - Mit der Funktion four_bar_mechanism werden für alle A2 gemeinsam der
+        Coupler‑Winkel A3 und der Rocker‑Winkel A4 bestimmt (beide Zweige), sodass gilt:
           L2·e^(iA2) + L3·e^(iA3) = E_complex + L4·e^(iA4)
         wobei der feste Auflagepunkt E komplex durch E_complex = L1 - i·L8 definiert ist.
       - Anschließend wird ein Zusatzwinkel A5 definiert (A5 = (π - A4) + (π/2)),
@@ -28,48 +106,20 @@ def animate_strandbeest(start_pos):
       
     Es werden A, B, C, D und E berechnet und miteinander verbunden.
     """
-    # Parameter gemäß MATLAB (für einen einzelnen Beinzyklus)
-    L1 = 6.0    # Abstand A -> E (horizontale Grundlänge)
-    L2 = 1.0    # Länge des Kurbelarms (A -> B)
-    L3 = 8.0    # Länge des Couplers (B -> C)
-    L4 = 5.0    # Länge des Rockers (E -> C)
-    L5 = 5.0    # Länge für Zusatzglied (E -> D)
-    L8 = 0.5    # Vertikaler Offset: E = (L1, -L8)
-    
-    # Basis A und fixer Punkt E (ohne Offset)
-    A0 = np.array([0.0, 0.0])
-    E0 = np.array([L1, -L8])
-    # Komplexe Darstellung des festen Punkts (E0)
-    E_complex = L1 - 1j * L8
-
-    # Vier-Gelenk-Berechnung: Gegeben A2 (Kurbelwinkel) und den festen Vektor E_complex,
-    # soll A3 (Couplerwinkel) und A4 (Rockerwinkel) gefunden werden,
-    # sodass gilt:
-    #    L2·e^(iA2) + L3·e^(iA3) = E_complex + L4·e^(iA4)
-    def four_bar_mechanism(E_complex, L2, L3, L4, A2, branch='cross'):
-        # Setze den Vektor von A nach E minus den Beitrag des Kurbelarms:
-        Z = E_complex - L2 * np.exp(1j * A2)
-        r = np.abs(Z)
-        phi = np.angle(Z)
-        # Berechne den Wert, der aus der Gleichung resultiert:
-        D_val = (L3**2 - r**2 - L4**2) / (2 * L4)
-        if r == 0 or np.abs(D_val) > r:
-            return None, None
-        acos_val = np.arccos(D_val / r)
-        # Wähle den "cross"-Zweig (andernfalls branch='open' möglich)
-        if branch == 'cross':
-            A4 = phi - acos_val
-        else:
-            A4 = phi + acos_val
-        # Bestimme A3 aus dem Schleifenabschluss:
-        vec = E_complex + L4 * np.exp(1j * A4) - L2 * np.exp(1j * A2)
-        A3 = np.angle(vec)
-        return A3, A4
 
     # Animationsparameter
     NUM_FRAMES = 120
     FPS = 20
 
+    A2 = 2 * np.pi * np.arange(NUM_FRAMES) / NUM_FRAMES
+    positions, valid = solve_strandbeest(A2, start_pos)
+    branch = BRANCHES.index(branch)
+    frames = np.stack([positions[label][branch] for label in ("A", "B", "C", "D", "E")], axis=1)  # (Frames, 5, 2)
+    valid = valid[branch]
+    for A2_invalid in A2[~valid]:
+        st.write(f"Keine Lösung bei A2 = {A2_invalid:.2f}")
+    trajectory = positions["D"][branch][valid].tolist()
+
     fig, ax = plt.subplots()
     ax.set_title("Jansen-Mechanismus (vereinfachte Simulation)")
     ax.set_aspect("equal", adjustable="box")
@@ -84,61 +134,23 @@ def animate_strandbeest(start_pos):
     marker_C, = ax.plot([], [], 'go', ms=8, label='C')
     marker_D, = ax.plot([], [], 'mo', ms=8, label='D')
     marker_E, = ax.plot([], [], 'co', ms=8, label='E')
+    markers = (marker_A, marker_B, marker_C, marker_D, marker_E)
 
     def init():
         
         line.set_data([], [])
-        marker_A.set_data([], [])
-        marker_B.set_data([], [])
-        marker_C.set_data([], [])
-        marker_D.set_data([], [])
-        marker_E.set_data([], [])
-        return line, marker_A, marker_B, marker_C, marker_D, marker_E
-    
-    trajectory=[]
+        for marker in markers:
+            marker.set_data([], [])
+        return (line,) + markers
 
     def update(frame):
-        A2 = 2 * np.pi * frame / NUM_FRAMES
-        B_complex = L2 * np.exp(1j * A2)
-        B = np.array([B_complex.real, B_complex.imag])
-        
-        result = four_bar_mechanism(E_complex, L2, L3, L4, A2, branch='cross')
-        if result[0] is None:
-            print(f"Kein Lösung bei A2 = {A2:.2f}")
-            if last_valid_artists is not None:
-                return last_valid_artists
-            return line, marker_A, marker_B, marker_C, marker_D, marker_E
-
-        A3, A4 = result
-
-        C_complex = B_complex + L3 * np.exp(1j * A3)
-        C = np.array([C_complex.real, C_complex.imag])
-        
-        A5 = (np.pi - A4) + (np.pi / 2)
-        D = np.array([E0[0] + L5 * np.cos(np.pi - A5),
-                    E0[1] + L5 * np.sin(np.pi - A5)])
-        
-        A_pt = A0 + np.array(start_pos)
-        B = B + np.array(start_pos)
-        C = C + np.array(start_pos)
-        D = D + np.array(start_pos)
-        E_pt = E0 + np.array(start_pos)
-        
-        x_vals = [A_pt[0], B[0], C[0], D[0], E_pt[0]]
-        y_vals = [A_pt[1], B[1], C[1], D[1], E_pt[1]]
-        line.set_data(x_vals, y_vals)
-        
-        # Ändern Sie hier die set_data-Aufrufe, damit sie Sequenzen erhalten:
-        marker_A.set_data([A_pt[0]], [A_pt[1]])
-        marker_B.set_data([B[0]], [B[1]])
-        marker_C.set_data([C[0]], [C[1]])
-        marker_D.set_data([D[0]], [D[1]])
-        marker_E.set_data([E_pt[0]], [E_pt[1]])
-
-        trajectory.append([D[0], D[1]])
-        
-        last_valid_artists = (line, marker_A, marker_B, marker_C, marker_D, marker_E)
-        return last_valid_artists
+        # Ohne Lösung bleibt die letzte gültige Lage stehen
+        if valid[frame]:
+            points = frames[frame]
+            line.set_data(points[:, 0], points[:, 1])
+            for marker, (x, y) in zip(markers, points):
+                marker.set_data([x], [y])
+        return (line,) + markers
 
 
     ani = FuncAnimation(
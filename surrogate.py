@@ -0,0 +1,196 @@
+import warnings
+import numpy as np
+from scipy.stats import qmc
+from sklearn.gaussian_process import GaussianProcessRegressor
+from sklearn.gaussian_process.kernels import Matern, WhiteKernel, ConstantKernel
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.exceptions import ConvergenceWarning
+from jansen_optimization import (
+    JansenObjective, SimulatorObjective, DESIGN_KEYS, INVALID_PENALTY, lengths_to_vector, jansen_link_lengths,
+    foot_path_metrics, design_score, design_result
+)
+
+METRIC_KEYS = ["stride", "flatness", "step_height", "duty"]
+
+
+def design_bounds(rel_bounds=0.15):
+    """Untere und obere Grenzen der Designparameter relativ zur Standardgeometrie."""
+    x0 = lengths_to_vector(jansen_link_lengths())
+    return x0 * (1 - rel_bounds), x0 * (1 + rel_bounds)
+
+
+def sample_designs(n, rel_bounds=0.15, seed=None) -> np.ndarray:
+    """Latin-Hypercube-Stichprobe von n Designs (n x P)."""
+    lower, upper = design_bounds(rel_bounds)
+    sampler = qmc.LatinHypercube(d=len(DESIGN_KEYS), seed=seed)
+    return qmc.scale(sampler.random(n), lower, upper)
+
+
+def evaluate_exact(X, objective=None) -> dict:
+    """Exakte Bewertung vieler Designs auf einmal (Zeilen von X)."""
+    if objective is None:
+        objective = JansenObjective()
+    score, metrics, _, valid = objective.evaluate(np.asarray(X, dtype=float).T)
+    result = {k: np.asarray(metrics[k], dtype=float) for k in METRIC_KEYS}
+    result["score"] = np.asarray(score, dtype=float)
+    result["valid"] = valid.all(axis=-1)
+    return result
+
+
+def training_data_from_store(store, joint="S", objective=None):
+    """
+    Erzeugt Trainingsdaten aus einem ChunkedResultStore einer Parameterstudie.
+    Die Parameterwerte des Speichers müssen in der Reihenfolge DESIGN_KEYS vorliegen.
+    """
+    if objective is None:
+        objective = JansenObjective()
+    S = store.read(joints=joint).astype(float)
+    valid = np.isfinite(S).all(axis=(-1, -2))
+    with np.errstate(invalid="ignore"):
+        metrics = foot_path_metrics(np.nan_to_num(S), objective.contact_band)
+        score = design_score(metrics, objective.weights, objective.targets)
+    result = {k: np.asarray(metrics[k], dtype=float) for k in METRIC_KEYS}
+    result["score"] = np.where(valid, score, INVALID_PENALTY)
+    result["valid"] = valid
+    return store.parameter_values, result
+
+
+class JansenSurrogate:
+    """
+    Ersatzmodell, das Stablängen auf Kennwerte der Fußbahn abbildet.
+
+    Für die Bewertung und jeden Kennwert wird ein Gauß-Prozess auf den gültigen Designs
+    trainiert, ein Klassifikator schätzt zusätzlich, ob sich ein Design vollständig drehen lässt.
+    """
+    def __init__(self, rel_bounds=0.15, targets=("score",) + tuple(METRIC_KEYS)):
+        self.rel_bounds = rel_bounds
+        self.lower, self.upper = design_bounds(rel_bounds)
+        self.targets = list(targets)
+        self.models = {}
+        self.classifier = None
+        self.X = np.empty((0, len(DESIGN_KEYS)))
+        self.data = {k: np.empty(0) for k in self.targets + ["valid"]}
+
+    def _normalize(self, X):
+        return (np.asarray(X, dtype=float) - self.lower) / (self.upper - self.lower)
+
+    def add(self, X, data: dict):
+        """Fügt exakt bewertete Designs zu den Trainingsdaten hinzu."""
+        self.X = np.vstack([self.X, X])
+        for k in self.data:
+            self.data[k] = np.concatenate([self.data[k], data[k]])
+        return self
+
+    def fit(self):
+        valid = self.data["valid"].astype(bool)
+        Xn = self._normalize(self.X)
+        for k in self.targets:
+            kernel = (ConstantKernel()
+                      * Matern(length_scale=np.full(Xn.shape[1], 0.5), length_scale_bounds=(1e-2, 1e2), nu=2.5)
+                      + WhiteKernel(1e-4, noise_level_bounds=(1e-8, 1e0)))
+            model = GaussianProcessRegressor(kernel=kernel, normalize_y=True, n_restarts_optimizer=1)
+            # Parameter ohne Einfluss laufen an die Grenze der Längenskala, das ist hier erwünscht
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", ConvergenceWarning)
+                self.models[k] = model.fit(Xn[valid], self.data[k][valid])
+        if valid.all() or not valid.any():
+            self.classifier = None
+        else:
+            self.classifier = GradientBoostingClassifier().fit(Xn, valid)
+        return self
+
+    def predict(self, X) -> dict:
+        """Gibt je Zielgröße Mittelwert und Standardabweichung sowie die Gültigkeitswahrscheinlichkeit zurück."""
+        Xn = self._normalize(X)
+        prediction = {}
+        for k, model in self.models.items():
+            mean, std = model.predict(Xn, return_std=True)
+            prediction[k] = mean
+            prediction[k + "_std"] = std
+        if self.classifier is None:
+            prediction["p_valid"] = np.full(len(Xn), float(self.data["valid"].all()))
+        else:
+            prediction["p_valid"] = self.classifier.predict_proba(Xn)[:, 1]
+        return prediction
+
+    def acquisition(self, X, kappa=2.0, prediction=None):
+        """
+        Untere Konfidenzschranke der Bewertung (kleiner ist vielversprechender).
+        Unsichere Designs werden dadurch bevorzugt untersucht, wahrscheinlich ungültige bestraft.
+        Eine bereits vorliegende Vorhersage (predict) kann übergeben werden.
+        """
+        p = self.predict(X) if prediction is None else prediction
+        lcb = p["score"] - kappa * p["score_std"]
+        return np.where(p["p_valid"] >= 0.5, lcb, INVALID_PENALTY * (1.0 - p["p_valid"]))
+
+    def prescreen(self, X, keep=0.2, kappa=2.0, prediction=None):
+        """Gibt die Indizes der vielversprechendsten Kandidaten zurück (Anteil keep)."""
+        X = np.asarray(X, dtype=float)
+        n_keep = max(1, int(np.ceil(keep * len(X))))
+        return np.argsort(self.acquisition(X, kappa, prediction))[:n_keep]
+
+
+def active_learning(n_initial=64, n_iter=10, batch_size=8, n_candidates=2000, rel_bounds=0.15,
+                    kappa=2.0, seed=None, objective=None) -> JansenSurrogate:
+    """
+    Trainiert ein Ersatzmodell mit unsicherheitsgesteuerter Stichprobenwahl: in jeder Runde
+    werden aus vielen Zufallskandidaten die batch_size Designs mit der kleinsten unteren
+    Konfidenzschranke exakt bewertet und zum Training hinzugefügt.
+    """
+    rng = np.random.default_rng(seed)
+    X = sample_designs(n_initial, rel_bounds, seed=rng)
+    surrogate = JansenSurrogate(rel_bounds).add(X, evaluate_exact(X, objective)).fit()
+    for _ in range(n_iter):
+        candidates = sample_designs(n_candidates, rel_bounds, seed=rng)
+        chosen = candidates[surrogate.prescreen(candidates, keep=batch_size / n_candidates, kappa=kappa)]
+        surrogate.add(chosen, evaluate_exact(chosen, objective)).fit()
+    return surrogate
+
+
+class ScreenedObjective:
+    """
+    Zielfunktion für optimize_jansen (vektorisiert), die eine Population zuerst mit dem
+    Ersatzmodell bewertet und nur den vielversprechendsten Anteil mit der teuren exakten
+    Bewertung löst. Die übrigen Kandidaten erhalten den vorhergesagten Mittelwert.
+
+    Das lohnt sich nur, wenn die exakte Bewertung deutlich teurer ist als eine Vorhersage des
+    Gauß-Prozesses, daher ist der MechanismSimulator (SimulatorObjective) voreingestellt. Die
+    geschlossene Lösung (JansenObjective) ist schneller als jede Vorhersage.
+    """
+    def __init__(self, surrogate: JansenSurrogate, objective=None, keep=0.25, kappa=2.0):
+        self.surrogate = surrogate
+        self.objective = SimulatorObjective() if objective is None else objective
+        self.keep = keep
+        self.kappa = kappa
+        self.exact_evaluations = 0
+
+    def evaluate(self, x):
+        """Exakte Bewertung wie JansenObjective.evaluate (für design_result)."""
+        return self.objective.evaluate(x)
+
+    def __call__(self, x):
+        x = np.asarray(x, dtype=float)
+        if x.ndim == 1:
+            self.exact_evaluations += 1
+            return self.objective(x)
+        X = x.T
+        # Eine Vorhersage je Population, daraus Mittelwert und Vorauswahl
+        prediction = self.surrogate.predict(X)
+        score = np.where(prediction["p_valid"] >= 0.5, prediction["score"], INVALID_PENALTY)
+        chosen = self.surrogate.prescreen(X, self.keep, self.kappa, prediction)
+        score[chosen] = self.objective(X[chosen].T)
+        self.exact_evaluations += len(chosen)
+        return score
+
+
+def surrogate_assisted_search(surrogate: JansenSurrogate, n_candidates=20000, n_exact=50, top_k=5, seed=None) -> list:
+    """
+    Durchsucht den Entwurfsraum mit dem Ersatzmodell und löst nur die n_exact
+    vielversprechendsten Kandidaten exakt. Gibt die besten Designs wie optimize_jansen zurück.
+    """
+    candidates = sample_designs(n_candidates, surrogate.rel_bounds, seed=seed)
+    chosen = candidates[surrogate.prescreen(candidates, keep=n_exact / n_candidates)]
+    objective = JansenObjective()
+    scores = objective(chosen.T)
+    best = chosen[np.argsort(scores)[:top_k]]
+    return [design_result(x, objective) for x in best]
@@ -0,0 +1,45 @@
+import numpy as np
+import scipy.sparse as sp
+from advanced_strandbeest import (
+    JANSEN_FIXED_POINTS, JANSEN_INIT_POSITIONS, MechanismSimulator, default_simulator, jansen_link_lengths,
+    solve_jansen_closed_form
+)
+from kinematics import branch_sign, circle_intersections_vec
+
+
+def test_closed_form_matches_simulator():
+    Z, X = np.array(JANSEN_FIXED_POINTS["Z"]), np.array(JANSEN_INIT_POSITIONS["X"])
+    angles = np.degrees(np.arctan2(X[1] - Z[1], X[0] - Z[0])) + np.arange(0, 360, 15)
+    simulator = default_simulator()
+    analysis, solutions = simulator.analyze_cycle(angles)
+    positions, valid = solve_jansen_closed_form(jansen_link_lengths(), angles)
+
+    assert valid.all()
+    assert analysis["success"].all()
+    free = solutions.reshape(len(angles), -1, 2)
+    for i, label in enumerate(simulator.free_labels):
+        np.testing.assert_allclose(free[:, i], positions[label], atol=1e-5)
+
+
+def test_sparse_path_on_large_linkage():
+    # 100 Zweischläge zwischen der Kurbel X und je einem festen Punkt G_k: 200 freie Koordinaten
+    n = 100
+    phi = 2 * np.pi * np.arange(n) / n
+    G = 6 * np.column_stack([np.cos(phi), np.sin(phi)])
+    X0 = np.array([1.0, 0.0])
+    d = G - X0
+    P = (G + X0) / 2 + 2 * np.column_stack([-d[:, 1], d[:, 0]]) / np.linalg.norm(d, axis=1)[:, None]
+    fixed_points = {"Z": np.zeros(2), **{f"G{k}": G[k] for k in range(n)}}
+    init_positions = {"X": X0, **{f"P{k}": P[k] for k in range(n)}}
+    edges = [edge for k in range(n) for edge in (("X", f"P{k}"), (f"G{k}", f"P{k}"))]
+    simulator = MechanismSimulator(fixed_points, init_positions, edges)
+
+    assert simulator.free_labels == [f"P{k}" for k in range(n)]
+    assert simulator.use_sparse
+    X, sol = simulator.solve_frame(10.0)
+    assert sp.issparse(simulator.constraint_jacobian(sol.x, X))
+    expected, valid = circle_intersections_vec(
+        X, np.linalg.norm(P - X0, axis=1), G, np.linalg.norm(P - G, axis=1), branch_sign(X0, G, P)
+    )
+    assert valid.all()
+    np.testing.assert_allclose(sol.x.reshape(-1, 2), expected, atol=1e-6)
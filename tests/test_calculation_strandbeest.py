@@ -0,0 +1,10 @@
+import numpy as np
+from files.calculation_strandbeest import calculate_strandbeest
+
+
+def test_second_loop_keeps_L44_for_custom_L33():
+    L1, L44 = 6.0, 5.0
+    leg = calculate_strandbeest(L1=L1, L3=8.0, L33=7.0, L44=L44)
+    for joint in ("F", "F2"):
+        distance = np.linalg.norm(leg[joint] - [L1, 0.0], axis=1)
+        np.testing.assert_allclose(distance, L44, atol=1e-12)
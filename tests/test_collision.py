@@ -0,0 +1,32 @@
+import numpy as np
+from advanced_strandbeest import JANSEN_EDGES
+from collision import collision_check, segment_distance
+from walker import walker_collisions
+
+
+def test_segment_distance():
+    distance, intersects = segment_distance(
+        np.array([[0.0, 0.0], [0.0, 0.0]]), np.array([[2.0, 2.0], [1.0, 0.0]]),
+        np.array([[0.0, 2.0], [0.0, 1.0]]), np.array([[2.0, 0.0], [1.0, 1.0]]),
+    )
+    np.testing.assert_allclose(distance, [0.0, 1.0])
+    np.testing.assert_array_equal(intersects, [True, False])
+
+
+def test_bars_in_different_planes_are_skipped():
+    positions = np.array([[[0.0, 0.0], [2.0, 2.0], [0.0, 2.0], [2.0, 0.0]]])
+    edges = [("A", "B"), ("C", "D")]
+    joints = ["A", "B", "C", "D"]
+    assert collision_check(positions, edges, joints)["pairs"]["collides"].all()
+    result = collision_check(positions, edges, joints, planes=[0, 1])
+    assert len(result["pairs"]) == 0
+    assert result["num_pairs"] == 0
+
+
+def test_default_walker_has_no_collisions_between_pairs():
+    result = walker_collisions()
+    pair_of_bar = np.arange(len(result["bars"])) // len(JANSEN_EDGES) // 2
+    pairs = result["pairs"]
+    assert len(pairs) > 0
+    assert np.all(pair_of_bar[pairs["bar_a"]] == pair_of_bar[pairs["bar_b"]])
+    assert not pairs["collides"].any()
@@ -0,0 +1,21 @@
+import numpy as np
+from four_bar import check_four_bar
+
+
+def _points(**coords):
+    return {key: np.array(value, dtype=float) for key, value in coords.items()}
+
+
+def test_double_rocker_at_dead_point_is_accepted():
+    points = _points(p0=(0, 0), p1=(0, 10), p2=(20, 0), p3=(40, -10))
+    check, motion = check_four_bar(points)
+    assert check["ok"]
+    assert motion["current_interval"] is not None
+    assert check["messages"][0].startswith("Warnung")
+
+
+def test_regular_pose_is_checked_directly():
+    points = _points(p0=(0, 0), p1=(10, 10), p2=(40, 30), p3=(50, 0))
+    check, _ = check_four_bar(points)
+    assert check["ok"]
+    assert check["messages"] == []
@@ -0,0 +1,28 @@
+import numpy as np
+from advanced_strandbeest import jansen_link_lengths, solve_jansen_closed_form
+from jansen_optimization import lengths_to_vector, vector_to_lengths
+from jansen_sensitivity import benchmark_sensitivities, path_fit_and_gradient, refine_designs
+
+
+def test_analytic_sensitivities_match_finite_differences():
+    result = benchmark_sensitivities(num_angles=36)
+    assert result["max_rel_error"] < 1e-6
+
+
+def test_path_fit_gradient_matches_finite_differences():
+    x = lengths_to_vector(jansen_link_lengths())
+    theta = np.linspace(0, 360, 36, endpoint=False)
+    target = solve_jansen_closed_form(vector_to_lengths(x * 1.02), theta)[0]["S"]
+    _, grad = path_fit_and_gradient(x, target)
+    fd = np.empty_like(x)
+    for k in range(len(x)):
+        step = np.zeros_like(x)
+        step[k] = 1e-6 * x[k]
+        fd[k] = (path_fit_and_gradient(x + step, target)[0] - path_fit_and_gradient(x - step, target)[0]) / (2 * step[k])
+    np.testing.assert_allclose(grad, fd, rtol=1e-4, atol=1e-6)
+
+
+def test_refine_designs_respects_rel_bounds():
+    ref = lengths_to_vector(jansen_link_lengths())
+    refined = refine_designs([{"vector": ref * 1.02}], rel_bounds=0.03, maxiter=5)
+    assert np.all(np.abs(refined[0]["vector"] / ref - 1) <= 0.03 + 1e-9)
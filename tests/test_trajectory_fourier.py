@@ -0,0 +1,31 @@
+import numpy as np
+from trajectory_fourier import FourierTrajectory, fit_fourier, load_fourier_trajectories, save_fourier_trajectories
+
+
+def _ellipse(num_points=120, closed=False):
+    phi = np.linspace(0, 2 * np.pi, num_points, endpoint=closed)
+    return np.column_stack([3 + 5 * np.cos(phi) + 0.5 * np.cos(3 * phi), -1 + 2 * np.sin(phi)])
+
+
+def test_fit_fourier_reproduces_samples():
+    points = _ellipse()
+    fitted = fit_fourier(points, tol=1e-9)
+    assert fitted.num_harmonics == 3
+    np.testing.assert_allclose(fitted.resample(len(points)), points, atol=1e-9)
+    assert fitted.max_sample_error <= fitted.error_bound + 1e-9
+
+
+def test_closing_point_is_dropped():
+    fitted = fit_fourier(_ellipse(121, closed=True))
+    assert fitted.num_samples == 120
+
+
+def test_dict_and_file_round_trip(tmp_path):
+    fitted = fit_fourier(_ellipse())
+    restored = FourierTrajectory.from_dict(fitted.to_dict())
+    np.testing.assert_array_equal(restored.coefficients, fitted.coefficients)
+    filename = tmp_path / "bahnkurve_fourier.json"
+    save_fourier_trajectories({"p2": fitted}, filename)
+    loaded = load_fourier_trajectories(filename)["p2"]
+    np.testing.assert_allclose(loaded.resample(360), fitted.resample(360))
+    assert loaded.error_bound == fitted.error_bound
@@ -0,0 +1,9 @@
+import numpy as np
+from walker import JOINT_ORDER, leg_cycle, leg_layout, walker_frames
+
+
+def test_mirrored_pairs_share_the_crank_pin():
+    frames = walker_frames(leg_cycle(), leg_layout(4))
+    X = frames[:, :, JOINT_ORDER.index("X")]
+    np.testing.assert_allclose(X[0], X[1], atol=1e-9)
+    np.testing.assert_allclose(X[2], X[3], atol=1e-9)
@@ -0,0 +1,112 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from crank_rod import crank_rod_lengths, solve_crank_rod
+from advanced_strandbeest import jansen_link_lengths, solve_jansen_closed_form
+
+PERCENTILES = (50, 95, 99)
+
+
+def sample_lengths(nominal: dict, tolerance, n_samples=2000, distribution="normal", seed=None) -> dict:
+    """
+    Zieht n_samples gestörte Längensätze um die Nennlängen.
+
+    :param tolerance: Fertigungstoleranz ±t (gleich für alle Stäbe oder Dictionary je Stab).
+                      Bei distribution="normal" entspricht t der 3-Sigma-Grenze,
+                      bei "uniform" wird gleichverteilt in [-t, t] gezogen.
+    :return: Dictionary der Längen mit der Form (n_samples, 1), passend zum Broadcasting gegen die Winkel
+    """
+    rng = np.random.default_rng(seed)
+    samples = {}
+    for key, value in nominal.items():
+        t = tolerance[key] if isinstance(tolerance, dict) else tolerance
+        if distribution == "normal":
+            delta = rng.normal(0.0, t / 3.0, n_samples)
+        elif distribution == "uniform":
+            delta = rng.uniform(-t, t, n_samples)
+        else:
+            raise ValueError(f"Unbekannte Verteilung: {distribution}")
+        samples[key] = (value + delta)[:, None]
+    return samples
+
+
+def summarize_deviation(theta_deg, nominal_path, sample_paths, valid) -> dict:
+    """
+    Wertet die Abweichung der gestörten Bahnen von der Nennbahn aus.
+    Stichproben, die sich nicht vollständig drehen lassen, werden getrennt gezählt.
+    """
+    rotatable = valid.all(axis=-1)
+    paths = sample_paths[rotatable]
+    deviation = np.linalg.norm(paths - nominal_path, axis=-1)  # (Stichproben, Winkel)
+    if len(paths) == 0:
+        empty = np.full(len(theta_deg), np.nan)
+        return {"theta": theta_deg, "nominal": nominal_path, "paths": paths, "deviation": deviation,
+                "percentiles": {p: empty for p in PERCENTILES}, "max_deviation": empty,
+                "worst_case": np.nan, "worst_sample": None, "worst_theta": np.nan,
+                "envelope_min": empty, "envelope_max": empty, "failure_rate": 1.0}
+
+    per_sample_max = deviation.max(axis=1)
+    worst = int(np.argmax(per_sample_max))
+    return {
+        "theta": theta_deg,
+        "nominal": nominal_path,
+        "paths": paths,
+        "deviation": deviation,
+        "percentiles": dict(zip(PERCENTILES, np.percentile(deviation, PERCENTILES, axis=0))),
+        "max_deviation": deviation.max(axis=0),
+        "worst_case": float(per_sample_max[worst]),
+        "worst_sample": worst,
+        "worst_theta": float(theta_deg[np.argmax(deviation[worst])]),
+        "envelope_min": paths.min(axis=0),
+        "envelope_max": paths.max(axis=0),
+        "failure_rate": float(1.0 - rotatable.mean()),
+    }
+
+
+def crank_rod_tolerance(points, tolerance, n_samples=2000, num_angles=180, distribution="normal", seed=None) -> dict:
+    """
+    Monte-Carlo-Toleranzanalyse des ebenen Mechanismus: alle Stichproben und Winkel
+    werden in einem Aufruf von solve_crank_rod gelöst. Ausgewertet wird die Koppelbahn von p2.
+    """
+    theta = np.linspace(0, 360, num_angles)
+    nominal = crank_rod_lengths(points)
+    _, nominal_p2, _ = solve_crank_rod(points, theta)
+    lengths = sample_lengths(nominal, tolerance, n_samples, distribution, seed)
+    _, p2, valid = solve_crank_rod(points, theta, lengths)
+    return summarize_deviation(theta, nominal_p2, p2, valid)
+
+
+def jansen_tolerance(tolerance, n_samples=2000, num_angles=180, joint="S", distribution="normal", seed=None) -> dict:
+    """Monte-Carlo-Toleranzanalyse des Jansen-Beins, ausgewertet wird die Bahn des Fußpunkts."""
+    theta = np.linspace(0, 360, num_angles)
+    nominal = jansen_link_lengths()
+    nominal_pos, _ = solve_jansen_closed_form(nominal, theta)
+    lengths = sample_lengths(nominal, tolerance, n_samples, distribution, seed)
+    positions, valid = solve_jansen_closed_form(lengths, theta)
+    return summarize_deviation(theta, nominal_pos[joint], positions[joint], valid)
+
+
+def plot_tolerance_analysis(result: dict, max_paths=200, title="Toleranzanalyse"):
+    """Streuung der Bahnkurven (links) und Abweichung von der Nennbahn über Theta (rechts)."""
+    fig, (ax_path, ax_dev) = plt.subplots(1, 2, figsize=(12, 5))
+    for path in result["paths"][:max_paths]:
+        ax_path.plot(path[:, 0], path[:, 1], color="gray", lw=0.5, alpha=0.3)
+    if result["worst_sample"] is not None:
+        worst = result["paths"][result["worst_sample"]]
+        ax_path.plot(worst[:, 0], worst[:, 1], "r-", lw=1, label="ungünstigste Stichprobe")
+    ax_path.plot(result["nominal"][:, 0], result["nominal"][:, 1], "b-", lw=2, label="Nennbahn")
+    ax_path.set_aspect("equal", adjustable="datalim")
+    ax_path.set_title("Bahnkurven")
+    ax_path.grid(True)
+    ax_path.legend()
+
+    theta = result["theta"]
+    for p, values in result["percentiles"].items():
+        ax_dev.plot(theta, values, label=f"{p}%-Perzentil")
+    ax_dev.plot(theta, result["max_deviation"], "k--", label="Maximum")
+    ax_dev.set_xlabel("Theta (Grad)")
+    ax_dev.set_ylabel("Abweichung von der Nennbahn")
+    ax_dev.set_title(f"Ausfallrate: {100 * result['failure_rate']:.1f} %")
+    ax_dev.grid(True)
+    ax_dev.legend()
+    fig.suptitle(title)
+    return fig
@@ -0,0 +1,100 @@
+import json
+import numpy as np
+
+DEFAULT_TOL = 1e-3
+CLOSURE_TOL = 1e-9
+
+
+class FourierTrajectory:
+    """
+    Periodische Bahnkurve als abgebrochene Fourier-Reihe z(phi) = sum_k c_k e^(i k phi), z = x + i y.
+
+    Gespeichert werden nur die Koeffizienten c_-K .. c_K. Die Auswertung ist für beliebig viele
+    Winkel eine einzige Matrix-Vektor-Multiplikation, unabhängig von der ursprünglichen Auflösung.
+    error_bound ist eine obere Schranke für die Abweichung von der trigonometrischen Interpolation
+    der Messpunkte bei jedem Winkel (Summe der Beträge der weggelassenen Koeffizienten).
+    """
+    def __init__(self, coefficients, error_bound=0.0, max_sample_error=0.0, num_samples=0):
+        self.coefficients = np.asarray(coefficients, dtype=complex)
+        self.num_harmonics = (len(self.coefficients) - 1) // 2
+        self.error_bound = float(error_bound)
+        self.max_sample_error = float(max_sample_error)
+        self.num_samples = int(num_samples)
+
+    @property
+    def orders(self) -> np.ndarray:
+        return np.arange(-self.num_harmonics, self.num_harmonics + 1)
+
+    def __call__(self, phi_deg) -> np.ndarray:
+        """Lage für beliebige Winkel (Grad, Array), Ergebnis (..., 2)."""
+        phi = np.radians(np.asarray(phi_deg, dtype=float))
+        z = np.exp(1j * phi[..., None] * self.orders) @ self.coefficients
+        return np.stack([z.real, z.imag], axis=-1)
+
+    def resample(self, num_points) -> np.ndarray:
+        """Bahnkurve mit num_points gleichmäßig verteilten Punkten über eine Periode."""
+        return self(360.0 * np.arange(num_points) / num_points)
+
+    def to_dict(self) -> dict:
+        return {
+            "num_harmonics": self.num_harmonics,
+            "real": self.coefficients.real.tolist(),
+            "imag": self.coefficients.imag.tolist(),
+            "error_bound": self.error_bound,
+            "max_sample_error": self.max_sample_error,
+            "num_samples": self.num_samples,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FourierTrajectory":
+        coefficients = np.asarray(data["real"]) + 1j * np.asarray(data["imag"])
+        return cls(coefficients, data.get("error_bound", 0.0), data.get("max_sample_error", 0.0),
+                   data.get("num_samples", 0))
+
+
+def fit_fourier(trajectory, tol=DEFAULT_TOL, max_harmonics=None) -> FourierTrajectory:
+    """
+    Passt eine periodische Bahnkurve (N, 2), gleichmäßig über eine Periode abgetastet
+    (z. B. trajectory aus den Animationen), mit der kleinsten Ordnung K an, deren Fehlerschranke
+    unter tol liegt. Ein doppelter Endpunkt (erster = letzter Punkt) wird entfernt.
+
+    :param tol: zulässige Abweichung in Längeneinheiten
+    :param max_harmonics: obere Grenze für K (Standard: alle, die die Abtastung hergibt)
+    """
+    points = np.asarray(trajectory, dtype=float)
+    if len(points) > 1 and np.linalg.norm(points[0] - points[-1]) <= CLOSURE_TOL * max(1.0, np.abs(points).max()):
+        points = points[:-1]
+    n = len(points)
+    z = points[:, 0] + 1j * points[:, 1]
+    c = np.fft.fft(z) / n
+    k_max = (n - 1) // 2
+    if max_harmonics is not None:
+        k_max = min(k_max, int(max_harmonics))
+
+    # Betrag je Ordnung |c_k| + |c_-k|; bei geradem n wird die Nyquist-Frequenz |c_n/2| nie übernommen
+    # und bleibt immer in der Fehlerschranke tail (konservativ)
+    pair = np.abs(c[1:k_max + 1]) + np.abs(c[-1:-k_max - 1:-1])
+    total = np.abs(c).sum() - np.abs(c[0])
+    tail = total - np.concatenate([[0.0], np.cumsum(pair)])      # Schranke für K = 0 .. k_max
+    K = int(np.argmax(tail <= tol)) if (tail <= tol).any() else k_max
+
+    orders = np.arange(-K, K + 1)
+    coefficients = c[orders % n]
+    fitted = FourierTrajectory(coefficients, tail[K], num_samples=n)
+    fitted.max_sample_error = float(np.linalg.norm(fitted.resample(n) - points, axis=-1).max())
+    return fitted
+
+
+def fit_trajectories(trajectories: dict, tol=DEFAULT_TOL, max_harmonics=None) -> dict:
+    """Fourier-Darstellung mehrerer Gelenkbahnen {Name: (N, 2)}, leere Bahnen werden übersprungen."""
+    return {name: fit_fourier(path, tol, max_harmonics) for name, path in trajectories.items() if len(path) > 2}
+
+
+def save_fourier_trajectories(fitted: dict, filename: str) -> None:
+    with open(filename, "w") as f:
+        json.dump({name: series.to_dict() for name, series in fitted.items()}, f, indent=2)
+
+
+def load_fourier_trajectories(filename: str) -> dict:
+    with open(filename) as f:
+        return {name: FourierTrajectory.from_dict(data) for name, data in json.load(f).items()}
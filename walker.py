@@ -0,0 +1,151 @@
+import os
+import tempfile
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.animation as animation
+from matplotlib.collections import LineCollection
+from advanced_strandbeest import (
+    JANSEN_EDGES, JANSEN_FIXED_POINTS, jansen_link_lengths, jansen_branches, solve_jansen_closed_form
+)
+from collision import collision_check
+
+JOINT_ORDER = ["Y", "Z", "X", "W", "V", "T", "U", "S"]
+NUM_FRAMES = 120
+LEG_COLORS = ["k", "tab:blue", "tab:red", "tab:green", "tab:purple", "tab:orange"]
+
+
+def leg_cycle(num_frames=NUM_FRAMES, design=None) -> np.ndarray:
+    """
+    Löst einen vollständigen Kurbelumlauf eines Beins einmal geschlossen.
+
+    :return: Array (Frames, Gelenke, 2) in der Reihenfolge JOINT_ORDER
+    """
+    theta = 360.0 * np.arange(num_frames) / num_frames
+    positions, valid = solve_jansen_closed_form(jansen_link_lengths(design), theta, jansen_branches(design))
+    if not valid.all():
+        raise ValueError("Die Geometrie lässt sich nicht vollständig durchdrehen.")
+    return np.stack([np.broadcast_to(positions[label], theta.shape + (2,)) for label in JOINT_ORDER], axis=1)
+
+
+def leg_layout(n_legs=4, spacing=8.0, mirror=True, phase_offsets=None) -> list:
+    """
+    Anordnung der Beine als (Phasenversatz in Umläufen, affine Abbildung A, Verschiebung b).
+
+    Standardmäßig bilden je zwei Beine ein am Kurbelzentrum Z gespiegeltes Paar mit einer halben
+    Umdrehung Versatz, die Paare sind gleichmäßig über den Umlauf verteilt und entlang des Körpers
+    um spacing versetzt (in der Seitenansicht nebeneinander gezeichnet).
+    """
+    n_pairs = max(1, int(np.ceil(n_legs / 2))) if mirror else n_legs
+    Zx = float(JANSEN_FIXED_POINTS["Z"][0])
+    layout = []
+    for i in range(n_legs):
+        pair = i // 2 if mirror else i
+        mirrored = mirror and i % 2 == 1
+        if phase_offsets is not None:
+            phase = phase_offsets[i]
+        else:
+            phase = (pair / n_pairs + (0.5 if mirrored else 0.0)) % 1.0
+        A = np.diag([-1.0, 1.0]) if mirrored else np.eye(2)
+        # Spiegelung an der senkrechten Achse durch Z, danach Versatz entlang des Körpers
+        b = np.array([2 * Zx if mirrored else 0.0, 0.0]) + np.array([pair * spacing, 0.0])
+        layout.append((phase, A, b))
+    return layout
+
+
+def walker_frames(cycle: np.ndarray, layout: list) -> np.ndarray:
+    """
+    Erzeugt alle Beine aus einem Beinzyklus nur durch Indexverschiebung (np.roll) und affine Abbildung,
+    ohne erneut zu lösen.
+
+    Gespiegelte Beine durchlaufen ihren Zyklus rückwärts, d. h. alle Kurbeln drehen wie auf einer
+    gemeinsamen Welle im selben Sinn (ein gespiegeltes Paar teilt sich den Kurbelpunkt X) und alle
+    Füße schieben in dieselbe Richtung.
+
+    :param cycle: Array (Frames, Gelenke, 2) aus leg_cycle
+    :return: Array (Beine, Frames, Gelenke, 2)
+    """
+    n_frames = cycle.shape[0]
+    shifts = [int(round(phase * n_frames)) % n_frames for phase, _, _ in layout]
+    A = np.stack([a for _, a, _ in layout])
+    b = np.stack([t for _, _, t in layout])
+    frame_index = np.arange(n_frames)
+    reverse = [np.linalg.det(a) < 0 for _, a, _ in layout]
+    rolled = np.stack([cycle[(shift - frame_index) % n_frames] if rev else np.roll(cycle, -shift, axis=0)
+                       for shift, rev in zip(shifts, reverse)])
+    return np.einsum("lij,lfkj->lfki", A, rolled) + b[:, None, None, :]
+
+
+def walker_segments(frames: np.ndarray, edges=JANSEN_EDGES) -> np.ndarray:
+    """Stabsegmente aller Beine je Frame, Form (Frames, Beine * Stäbe, 2, 2) für eine LineCollection."""
+    index = {label: i for i, label in enumerate(JOINT_ORDER)}
+    start = np.array([index[a] for a, _ in edges])
+    end = np.array([index[b] for _, b in edges])
+    segments = np.stack([frames[:, :, start], frames[:, :, end]], axis=-2)  # (Beine, Frames, Stäbe, 2, 2)
+    segments = np.moveaxis(segments, 1, 0)
+    return segments.reshape(segments.shape[0], -1, 2, 2)
+
+
+def walker_collisions(n_legs=4, spacing=8.0, mirror=True, clearance=0.0, num_frames=NUM_FRAMES, design=None) -> dict:
+    """
+    Kollisions- und Abstandsprüfung aller Stäbe aller Beine über einen Umlauf (siehe collision_check).
+    Die Stäbe heißen wie im Bein mit angehängter Beinnummer, z. B. U1-S1.
+
+    Die Beinpaare sitzen entlang des Körpers hintereinander, nur die Stäbe eines Paares (bzw. eines
+    Beins ohne Spiegelung) liegen in einer Ebene und werden gegeneinander geprüft.
+    """
+    frames = walker_frames(leg_cycle(num_frames, design), leg_layout(n_legs, spacing, mirror))
+    joints = [f"{label}{leg + 1}" for leg in range(n_legs) for label in JOINT_ORDER]
+    edges = [(f"{a}{leg + 1}", f"{b}{leg + 1}") for leg in range(n_legs) for a, b in JANSEN_EDGES]
+    planes = np.repeat([leg // 2 if mirror else leg for leg in range(n_legs)], len(JANSEN_EDGES))
+    positions = np.moveaxis(frames, 0, 1).reshape(num_frames, -1, 2)
+    return collision_check(positions, edges, joints, clearance=clearance, planes=planes)
+
+
+def animate_walker(n_legs=4, spacing=8.0, mirror=True, show_path=False, num_frames=NUM_FRAMES, design=None):
+    """
+    Animation eines Strandbeests mit n_legs Beinen. Der Beinzyklus wird einmal gelöst,
+    alle weiteren Beine entstehen durch Verschieben und Spiegeln, der Aufwand je Frame
+    ist reines Zeichnen (eine LineCollection für alle Stäbe).
+
+    :return: (GIF-Bytes, Bahnkurve des Fußpunkts S des ersten Beins)
+    """
+    cycle = leg_cycle(num_frames, design)
+    layout = leg_layout(n_legs, spacing, mirror)
+    frames = walker_frames(cycle, layout)
+    segments = walker_segments(frames)
+    colors = np.repeat([LEG_COLORS[i % len(LEG_COLORS)] for i in range(n_legs)], len(JANSEN_EDGES))
+    feet = frames[:, :, JOINT_ORDER.index("S")]
+
+    fig, ax = plt.subplots(figsize=(8, 5))
+    all_points = frames.reshape(-1, 2)
+    margin = 5.0
+    ax.set_xlim(all_points[:, 0].min() - margin, all_points[:, 0].max() + margin)
+    ax.set_ylim(all_points[:, 1].min() - margin, all_points[:, 1].max() + margin)
+    ax.set_aspect("equal", adjustable="box")
+    ax.set_title(f"Strandbeest mit {n_legs} Beinen")
+    ax.grid(True)
+
+    bars = LineCollection(segments[0], colors=colors, linewidths=2)
+    ax.add_collection(bars)
+    foot_markers, = ax.plot([], [], "go", ms=5)
+    if show_path:
+        for leg in range(n_legs):
+            ax.plot(feet[leg, :, 0], feet[leg, :, 1], "g--", lw=0.8)
+
+    def update(frame):
+        bars.set_segments(segments[frame])
+        foot_markers.set_data(feet[:, frame, 0], feet[:, frame, 1])
+        return bars, foot_markers
+
+    ani = animation.FuncAnimation(fig, update, frames=num_frames, blit=True, interval=50)
+    with tempfile.NamedTemporaryFile(suffix=".gif", delete=False) as tmpfile:
+        tmp_filename = tmpfile.name
+    try:
+        ani.save(tmp_filename, writer="pillow", fps=20, dpi=80)
+        with open(tmp_filename, "rb") as f:
+            buf = f.read()
+    finally:
+        os.remove(tmp_filename)
+    plt.close(fig)
+    trajectory = [tuple(p) for p in feet[0]] if show_path else []
+    return buf, trajectory